@@ -2,4 +2,4 @@
 
 # Placeholder
 echo "Running post-install.sh"
-poetry install --no-root
\ No newline at end of file
+poetry install --no-root --extras agents
\ No newline at end of file
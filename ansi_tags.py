@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from ansimarkup import AnsiMarkup, parse
 
 user_tags = {
@@ -29,6 +31,51 @@ user_tags = {
 }
 am = AnsiMarkup(tags=user_tags, strict=True)
 
-ansiprint = am.ansiprint
-strip = am.strip
-parse = am.parse
+
+# Screens show the same lines over and over (the hand, the relics, every card in a reward), so parsing and
+# stripping are cached by the markup itself.
+@lru_cache(maxsize=4096)
+def parse(text: str) -> str:
+    return am.parse(text)
+
+@lru_cache(maxsize=4096)
+def strip(text: str) -> str:
+    return am.strip(text)
+
+def ansiprint(*args, **kwargs):
+    '''print() with ansimarkup tags.'''
+    if len(args) != 1:
+        am.ansiprint(*args, **kwargs)  # Tags can be opened in one argument and closed in another
+        return
+    text = args[0]
+    print(parse(text if isinstance(text, str) else str(text)), **kwargs)
+
+
+class Rendered():
+    '''An attribute that shows in its owner's pretty_print(). Setting it bumps the owner's render_version, which is
+    what render() keys its cache on. The value lives in the instance's __dict__ and reads don't come through here,
+    like zobrist.Tracked.'''
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __set__(self, obj, value):
+        attributes = obj.__dict__
+        attributes[self.name] = value
+        attributes["render_version"] = attributes.get("render_version", 0) + 1
+
+def _rendering(obj) -> tuple[int, str, str]:
+    attributes = obj.__dict__
+    version = attributes.get("render_version", 0)
+    cached = attributes.get("_rendering")
+    if cached is None or cached[0] != version:
+        markup = obj.pretty_print()
+        cached = attributes["_rendering"] = (version, parse(markup), strip(markup))
+    return cached
+
+def render(obj) -> str:
+    '''[obj].pretty_print() as ANSI. Only built and parsed again once one of its Rendered attributes has changed.'''
+    return _rendering(obj)[1]
+
+def render_plain(obj) -> str:
+    '''[obj].pretty_print() without the tags, cached like render().'''
+    return _rendering(obj)[2]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+'''Plays many seeded games at once without a terminal and writes one JSON line per run.
+
+    python batch.py --seeds 0:1000 --policy autoplayer --workers 8 --out results.jsonl
+
+Every run is played from scratch in a worker process, so a seed gives the same result no matter
+how many workers there are or which of them plays it. Results are written in seed order as they finish.
+'''
+from __future__ import annotations
+
+import json
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+
+from definitions import State
+from drivers import HeadlessDriver
+from game import Game
+from message_bus_tools import Message, Registerable
+from policies import PromptLimitReached, limit_prompts, load_policy
+
+
+class RunRecorder(Registerable):
+    '''Listens to a game's bus and keeps what the batch results need.'''
+    registers = [Message.END_OF_FLOOR, Message.ON_CARD_ADD]
+
+    def __init__(self):
+        self.uid = uuid4()
+        self.subscribed = False
+        self.hp_curve: list[int] = []  # Health at the end of each floor
+        self.cards_taken: list[str] = []
+
+    def callback(self, message, data):
+        if message == Message.END_OF_FLOOR:
+            _, player = data
+            self.hp_curve.append(player.health)
+        elif message == Message.ON_CARD_ADD:
+            _, card = data
+            self.cards_taken.append(card.name)
+
+
+def play_run(seed: int, policy_name: str, max_prompts: int) -> dict:
+    '''Plays one game and returns its results. Runs in a worker process, so everything it needs is passed in.'''
+    driver = HeadlessDriver(None)
+    with Game(seed=seed, driver=driver) as game:
+        responder = load_policy(policy_name)(game, seed)
+        driver.responder = limit_prompts(responder, max_prompts)
+        recorder = RunRecorder()
+        recorder.register(game.bus)
+        error = None
+        try:
+            game.start()
+            outcome = "died" if game.player.state == State.DEAD else "finished"
+        except PromptLimitReached:
+            outcome = "prompt limit"
+        except Exception as e:
+            outcome = "error"
+            error = f"{type(e).__name__}: {e}"
+    return {
+        "seed": seed,
+        "policy": policy_name,
+        "outcome": outcome,
+        "floors": game.player.floors,
+        "hp_curve": recorder.hp_curve,
+        "cards_taken": recorder.cards_taken,
+        "cause_of_death": game.player.killed_by,
+        "prompts": driver.prompts,
+        "error": error,
+        "policy_stats": responder.stats() if hasattr(responder, "stats") else None,
+    }
+
+
+def parse_seeds(seeds: str) -> range:
+    '''"100" is seeds 0-99, "100:200" is seeds 100-199.'''
+    start, _, stop = seeds.partition(':')
+    return range(int(start), int(stop)) if stop else range(int(start))
+
+
+def run_batch(seeds: range, policy_name: str, workers: int, max_prompts: int = 5000, chunksize: int = 4):
+    '''Yields the results of every run, in seed order.'''
+    args = ([policy_name] * len(seeds), [max_prompts] * len(seeds))
+    if workers == 1:
+        yield from map(play_run, seeds, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play_run, seeds, *args, chunksize=chunksize)
+
+
+def main():
+    parser = ArgumentParser(description="Play many headless games and record the results")
+    parser.add_argument('--seeds', default="100", help="Seeds to play: N for 0 to N-1, or START:STOP")
+    parser.add_argument('--policy', default="autoplayer", help="random, autoplayer, or module:function for your own agent")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes. Defaults to one per core")
+    parser.add_argument('-o', '--out', default="results.jsonl", help="File to write the results to, one JSON object per line")
+    parser.add_argument('--max-prompts', type=int, default=5000, help="Abandon a run after this many prompts")
+    args = parser.parse_args()
+    load_policy(args.policy)  # Fail now rather than in every worker
+    seeds = parse_seeds(args.seeds)
+
+    outcomes = {}
+    simulations, search_seconds = 0, 0.0
+    start = time.perf_counter()
+    with open(args.out, "w") as results:
+        for result in run_batch(seeds, args.policy, args.workers, args.max_prompts):
+            results.write(json.dumps(result) + "\n")
+            outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+            stats = result["policy_stats"] or {}
+            simulations += stats.get("simulations", 0)
+            search_seconds += stats.get("seconds", 0)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(seeds)} runs in {elapsed:.2f}s ({len(seeds) / elapsed:.2f} runs/sec), results in {args.out}")
+    for outcome, count in sorted(outcomes.items(), key=lambda item: -item[1]):
+        print(f"  {count:>5}  {outcome}")
+    if search_seconds > 0:
+        print(f"{simulations} simulations in {search_seconds:.2f}s of searching ({simulations / search_seconds:.0f} simulations/sec per worker)")
+
+
+if __name__ == '__main__':
+    main()
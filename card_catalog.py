@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import random
-from copy import deepcopy
 from typing import TYPE_CHECKING, Sequence
 from uuid import uuid4
 import effect_catalog
-from ansi_tags import ansiprint
+import zobrist
+from ansi_tags import Rendered
 from definitions import CardType, PlayerClass, Rarity, State, TargetType
+from drivers import ansiprint, echo
 from message_bus_tools import Registerable, Message
+from rng import Stream, stream
 
 if TYPE_CHECKING:
     from enemy import Enemy
@@ -18,6 +19,15 @@ import effect_interface as ei
 
 
 class Card(Registerable):
+    # Everything pretty_print() shows, so ansi_tags.render() knows when to build it again
+    name = zobrist.CardKey(Rendered())
+    info = Rendered()
+    rarity = Rendered()
+    type = Rendered()
+    energy_cost = zobrist.CardKey(Rendered())
+    base_energy_cost = Rendered()
+    upgraded = zobrist.CardKey()  # With the name and cost, what the card is hashed by in a pile (see zobrist)
+
     def __init__(self, name: str, info: str, rarity: Rarity, player_class: PlayerClass, card_type: CardType, target='Nothing', energy_cost=-1, upgradeable=True):
         self.uid = uuid4()
         self.name = name
@@ -33,7 +43,7 @@ class Card(Registerable):
         self.upgradeable = upgradeable
         self.removable = True
         self.upgrade_preview = f"{self.name} -> <green>{self.name + '+'}</green> | "
-        self.playable = card_type not in (CardType.STATUS, CardType.CURSE)
+        self.playable = card_type not in (CardType.STATUS, CardType.CURSE)  # Statuses and curses that can be played say so
 
     def upgrade(self):
         raise NotImplementedError("Subclasses must implement this method")
@@ -146,7 +156,7 @@ class Anger(Card):
 
     def apply(self, origin, target):
         origin.attack(target, self)
-        origin.discard_pile.append(deepcopy(self))
+        origin.discard_pile.append(self.clone())
 
 class Armaments(Card):
     def __init__(self):
@@ -200,7 +210,7 @@ class Clash(Card):
 
     def apply(self, origin, target):
         if not all((card for card in origin.hand if card.type == CardType.ATTACK)):
-            print("You have non-Attack cards in your hand.")
+            echo("You have non-Attack cards in your hand.")
             return
         origin.attack(target, self)
 
@@ -265,13 +275,17 @@ class Havoc(Card):
         self.energy_cost = 0
 
     def apply(self, origin, enemies):
-        top_card = origin.draw_pile[-1]
-        if top_card.target in (TargetType.SINGLE, TargetType.YOURSELF):
-            origin.use_card(top_card, True, origin.draw_pile, random.choice(enemies))
-        elif top_card.target in (TargetType.AREA, TargetType.ANY):
-            origin.use_card(top_card, True, origin.draw_pile, enemies)
-        else:
-            origin.use_card(top_card, True, origin.draw_pile, random.choice(enemies))
+        if not origin.draw_pile:
+            return
+        # Take the card off the pile before playing it, or a Havoc on top would play itself forever.
+        # It's played for free (no pile to pay from) and then exhausted.
+        top_card = origin.draw_pile.pop()
+        living_enemies = [enemy for enemy in enemies if enemy.state == State.ALIVE]
+        target = stream(Stream.COMBAT).choice(living_enemies) if living_enemies else None
+        origin.use_card(top_card, True, None, enemies, target=target)
+        ansiprint(f"{top_card.name} was <bold>Exhausted</bold>.")
+        origin.exhaust_pile.append(top_card)
+        origin.bus.publish(Message.ON_EXHAUST, (origin, top_card))
 
 class Headbutt(Card):
     def __init__(self):
@@ -288,6 +302,8 @@ class Headbutt(Card):
 
     def apply(self, origin, target):
         origin.attack(target, self)
+        if not origin.discard_pile:
+            return  # Nothing to choose from, and list_input would never return
         chosen_card = view.list_input("Choose a card to put on top of your draw pile", origin.discard_pile, view.view_piles)
         origin.draw_pile.append(origin.discard_pile.pop(chosen_card))
 
@@ -449,7 +465,7 @@ class TrueGrit(Card):
             chosen_card = view.list_input("Choose a card to <keyword>Exhaust</keyword>", origin.hand, view.view_piles, lambda card: card.upgradeable is True and card.upgraded is False, "That card is either not upgradeable or is already upgraded.")
             origin.move_card(origin.hand[chosen_card], origin.exhaust_pile, origin.hand, False)
         else:
-            random_card = random.choice([card for card in origin.hand if card.upgradeable is True and card.upgraded is False])
+            random_card = stream(Stream.COMBAT).choice([card for card in origin.hand if card.upgradeable is True and card.upgraded is False])
             origin.move_card(random_card, origin.exhaust_pile, origin.hand, False)
 
 class TwinStrike(Card):
@@ -500,7 +516,7 @@ class WildStrike(Card):
 
     def apply(self, origin, target):
         origin.attack(target, self)
-        origin.draw_pile.insert(random.randint(0, len(origin.draw_pile) - 1), Wound())
+        origin.draw_pile.insert(stream(Stream.SHUFFLE).randint(0, len(origin.draw_pile)), Wound())
 
 class BattleTrance(Card):
     def __init__(self):
@@ -668,13 +684,15 @@ class DualWield(Card):
         self.info = "Create 2 copies of an <keyword>Attack</keyword> or <keyword>Power</keyword> card in your hand."
 
     def apply(self, origin):
+        if not any(card.type in (CardType.ATTACK, CardType.POWER) for card in origin.hand):
+            return
         chosen_card = view.list_input(f"Choose a card to make {'a copy' if self.copies == 1 else '2 copies'} of",
                                       origin.hand,
                                       view.view_piles,
                                       validator=lambda card: card.type in (CardType.ATTACK, CardType.POWER),
                                       message_when_invalid="That card is neither an Attack or a Power.")
         for _ in range(self.copies):
-            origin.hand.insert(chosen_card, origin.hand[chosen_card])
+            origin.hand.insert(chosen_card, origin.hand[chosen_card].clone())
 
 class Entrench(Card):
     def __init__(self):
@@ -792,9 +810,9 @@ class InfernalBlade(Card):
         self.energy_cost = 0
 
     def apply(self, origin):
-        cards = create_all_cards()
-        attack_cards = [card for card in cards if card.type == CardType.ATTACK]
-        origin.hand.append(random.choice(attack_cards).modify_energy_cost(0, "Set", True))
+        attack_card = stream(Stream.COMBAT).choice(catalog.find(card_type=CardType.ATTACK)).clone()
+        attack_card.modify_energy_cost(0, "Set", True)
+        origin.hand.append(attack_card)
 
 class Inflame(Card):
     def __init__(self):
@@ -963,6 +981,7 @@ class Slimed(Card):
     def __init__(self):
         super().__init__("Slimed", "<keyword>Exhaust</keyword>.", Rarity.COMMON, PlayerClass.IRONCLAD, CardType.STATUS, TargetType.YOURSELF, energy_cost=1)
         self.exhaust = True
+        self.playable = True  # Unlike other statuses
         self.upgradeable = False
 
     def apply(self, *args, **kwargs):
@@ -979,18 +998,83 @@ class Dazed(Card):
         self.playable = False
 
 
+ALL_CARDS = (
+    # ----------IRONCLAD CARDS------------
+    # Starter(basic) cards
+    IroncladStrike, IroncladDefend, Bash,
+    # Common Cards
+    Anger, Armaments, BodySlam, Clash, Cleave, Clothesline, Flex, Havoc,
+    Headbutt, HeavyBlade, IronWave, PerfectedStrike, PommelStrike, ShrugItOff, SwordBoomerang, Thunderclap, TrueGrit, TwinStrike, Warcry, WildStrike,
+    # Uncommon Cards
+    BattleTrance, BloodForBlood, Bloodletting, BurningPact, Carnage, Combust, DarkEmbrace, Disarm, Dropkick, DualWield, Entrench, Evolve, FeelNoPain,
+    FireBreathing, FlameBarrier, GhostlyArmor, Hemokinesis, InfernalBlade, Inflame, Intimidate, Metallicize, PowerThrough, Pummel, Rage,
+    # Rare Cards
+    Barricade, Berzerk, Bludgeon, Brutality, Corruption
+)
+
+
+class CardCatalog():
+    """Every card in the game, built once per process.
+
+    The cards held here are prototypes: look at them, filter them, pick from them, but never put one in a deck.
+    Use clone() (or create()) to get a card the player can own.
+    """
+    def __init__(self, card_classes: Sequence[type[Card]]):
+        self.card_classes = tuple(card_classes)
+        self._cards = None
+        self._queries = {}
+
+    @property
+    def cards(self) -> tuple[Card, ...]:
+        if self._cards is None:
+            self._cards = tuple(card_class() for card_class in self.card_classes)
+            self.by_name = {card.name: card for card in self._cards}
+            self.by_rarity = self._index(lambda card: card.rarity)
+            self.by_type = self._index(lambda card: card.type)
+            self.by_class = self._index(lambda card: card.player_class)
+        return self._cards
+
+    def _index(self, key) -> dict:
+        index = {}
+        for card in self._cards:
+            index.setdefault(key(card), []).append(card)
+        return {value: tuple(cards) for value, cards in index.items()}
+
+    def __contains__(self, name: str) -> bool:
+        _ = self.cards
+        return name in self.by_name
+
+    def get(self, name: str) -> Card:
+        """The prototype called [name]. Raises KeyError if there isn't one."""
+        _ = self.cards
+        return self.by_name[name]
+
+    def create(self, name: str) -> Card:
+        """A new card called [name]."""
+        return self.get(name).clone()
+
+    def create_all(self) -> list[Card]:
+        return [card.clone() for card in self.cards]
+
+    def find(self, rarity: Rarity = None, card_type: CardType = None, player_class: PlayerClass = None,
+             exclude_types: Sequence[CardType] = (), exclude_rarities: Sequence[Rarity] = ()) -> tuple[Card, ...]:
+        """Prototypes matching every given filter, in catalog order. Results are cached, so repeat queries are free."""
+        key = (rarity, card_type, player_class, tuple(exclude_types), tuple(exclude_rarities))
+        result = self._queries.get(key)
+        if result is None:
+            result = self._queries[key] = tuple(
+                card for card in self.cards
+                if (rarity is None or card.rarity == rarity)
+                and (card_type is None or card.type == card_type)
+                and (player_class is None or card.player_class == player_class)
+                and card.type not in exclude_types
+                and card.rarity not in exclude_rarities
+            )
+        return result
+
+catalog = CardCatalog(ALL_CARDS)
+
+
 def create_all_cards() -> Sequence[Card]:
-    cards = [card() for card in (
-        # ----------IRONCLAD CARDS------------
-        # Starter(basic) cards
-        IroncladStrike, IroncladDefend, Bash,
-        # Common Cards
-        Anger, Armaments, BodySlam, Clash, Cleave, Clothesline, Flex, Havoc,
-        Headbutt, HeavyBlade, IronWave, PerfectedStrike, PommelStrike, ShrugItOff, SwordBoomerang, Thunderclap, TrueGrit, TwinStrike, Warcry, WildStrike,
-        # Uncommon Cards
-        BattleTrance, BloodForBlood, Bloodletting, BurningPact, Carnage, Combust, DarkEmbrace, Disarm, Dropkick, DualWield, Entrench, Evolve, FeelNoPain,
-        FireBreathing, FlameBarrier, GhostlyArmor, Hemokinesis, InfernalBlade, Inflame, Intimidate, Metallicize, PowerThrough, Pummel, Rage,
-        # Rare Cards
-        Barricade, Berzerk, Bludgeon, Brutality, Corruption
-    )]
-    return cards
\ No newline at end of file
+    """A fresh copy of every card. Prefer catalog.find() when you only need to look at or pick from them."""
+    return catalog.create_all()
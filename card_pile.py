@@ -0,0 +1,131 @@
+'''The player's draw pile, hand, discard pile and exhaust pile.
+
+A pile is a list with its top at the end, so drawing is a pop from the end and putting a card on top is an
+append. Cards in the middle are still reached by index, the way the card prompts pick them.
+
+On top of that, a pile keeps a count of the cards in it by identity. `card in pile` is a dict lookup,
+and remove() only looks for the card once it knows it's there, by identity from the top down, since the
+card being moved is almost always near the top or in a short hand. Two copies of a Strike are two different
+cards, so removing one never takes the other.
+
+    player.draw_pile.shuffle(stream(Stream.SHUFFLE))  # In place
+    player.hand.extend(player.draw_pile.draw(5))
+    player.hand.empty_into(player.discard_pile)
+
+A pile can also keep its cards subscribed to a bus (see listen()). The hand does, for the fight's bus: a card
+registers when it comes into the hand and unsubscribes when it leaves, however it got there or left, so the
+bus only calls cards that are in hand.
+'''
+from __future__ import annotations
+
+from random import Random
+from typing import TYPE_CHECKING
+
+from zobrist import HashedPile
+
+if TYPE_CHECKING:
+    from card_catalog import Card
+    from message_bus_tools import MessageBus
+
+
+class CardPile(HashedPile):
+    '''A pile of cards that knows which cards are in it. See the module docstring.'''
+    def __init__(self, name: str, cards=(), owner=None, ordered: bool = False):
+        self.members: dict[int, int] = {}  # id(card) -> how many times it's in the pile
+        self.bus: MessageBus | None = None  # The bus the cards in the pile are subscribed to, if any
+        super().__init__(name, cards, owner, ordered)
+        for card in self:
+            self.members[id(card)] = self.members.get(id(card), 0) + 1
+
+    def _added(self, cards, start: int):
+        super()._added(cards, start)
+        members, bus = self.members, self.bus
+        for card in cards:
+            count = members.get(id(card), 0)
+            members[id(card)] = count + 1
+            if bus is not None and count == 0:
+                card.register(bus)
+
+    def _removed(self, cards, start: int):
+        super()._removed(cards, start)
+        members, bus = self.members, self.bus
+        for card in cards:
+            left = members[id(card)] - 1
+            if left:
+                members[id(card)] = left
+            else:
+                del members[id(card)]
+                if bus is not None:
+                    card.unsubscribe()
+
+    def listen(self, bus: MessageBus | None):
+        '''Subscribes the cards in the pile to [bus] now and as they come in, and unsubscribes them as they leave.
+        None stops that and unsubscribes them all.'''
+        if bus is self.bus:
+            return
+        self._unsubscribe_all()
+        self.bus = bus
+        if bus is not None:
+            for card in self.unique():
+                card.register(bus)
+
+    def unique(self) -> list[Card]:
+        '''Each card in the pile once.'''
+        return list({id(card): card for card in list.__iter__(self)}.values())
+
+    def _unsubscribe_all(self):
+        if self.bus is not None:
+            for card in self.unique():
+                card.unsubscribe()
+
+    def __contains__(self, card) -> bool:
+        return id(card) in self.members
+
+    def position(self, card: Card) -> int:
+        '''Where [card] is, counting from the bottom. Raises ValueError if it isn't in the pile.'''
+        if id(card) in self.members:
+            for i in range(len(self) - 1, -1, -1):
+                if list.__getitem__(self, i) is card:
+                    return i
+        raise ValueError(f"{getattr(card, 'name', card)} isn't in the {self.name}")
+
+    def remove(self, card: Card):
+        '''Removes this exact card, not one that's equal to it.'''
+        del self[self.position(card)]
+
+    def clear(self):
+        self._unsubscribe_all()
+        super().clear()
+        self.members.clear()
+
+    def draw(self, amount: int) -> list[Card]:
+        '''Takes up to [amount] cards off the top, top card first.'''
+        amount = min(amount, len(self))
+        if amount <= 0:
+            return []
+        cards = list.__getitem__(self, slice(len(self) - amount, None))
+        del self[len(self) - amount:]
+        cards.reverse()
+        return cards
+
+    def empty_into(self, pile: HashedPile):
+        '''Puts every card in this pile on top of [pile], keeping their order.'''
+        if self:
+            pile.extend(list.__iter__(self))
+            self.clear()
+
+    def shuffle(self, random: Random):
+        '''Fisher-Yates, in place. Makes the same draws as random.shuffle(), so a seeded run shuffles the same way.'''
+        get, put = list.__getitem__, list.__setitem__
+        for i in range(len(self) - 1, 0, -1):
+            j = random.randrange(i + 1)
+            first = get(self, i)
+            put(self, i, get(self, j))
+            put(self, j, first)
+        self._moved()
+
+    def __copy__(self):
+        new = super().__copy__()
+        new.members = self.members.copy()
+        new.bus = self.bus
+        return new
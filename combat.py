@@ -1,26 +1,21 @@
-import random
-from time import sleep
 
-import card_catalog
 import displayer as view
+import effect_catalog
 import effect_interface as ei
 import game_map
 import generators as gen
-import potion_catalog
-from ansi_tags import ansiprint
-from definitions import CombatTier, State, TargetType
+import zobrist
+from definitions import CardType, CombatTier, State, TargetType
+from drivers import Driver, ansiprint, driven, echo, prompt, sleep
+from encounters import EncounterSchedule
 from enemy import Enemy
-from enemy_catalog import (
-    create_act1_boss,
-    create_act1_elites,
-    create_act1_normal_encounters,
-)
-from message_bus_tools import Message, bus
+from message_bus_tools import Message, MessageBus, Snapshot
 from player import Player
+from rng import Stream, stream
 
 
 class Combat:
-    def __init__(self, tier: CombatTier, player: Player, game_map: game_map.GameMap, all_enemies: list[Enemy] | None = None):
+    def __init__(self, tier: CombatTier, player: Player, game_map: game_map.GameMap, all_enemies: list[Enemy] | None = None, driver: Driver | None = None, bus: MessageBus | None = None, encounters: EncounterSchedule | None = None):
         self.tier = tier
         self.player = player
         self.all_enemies = all_enemies if all_enemies else []
@@ -28,28 +23,50 @@ class Combat:
         self.death_messages = []
         self.turn = 1
         self.game_map = game_map
+        self.driver = driver  # None plays with whatever driver is already active
+        self.bus = bus if bus is not None else player.bus
+        self.encounters = encounters  # Where enemies come from if none are given. A one-off schedule is made if needed.
+
+    def snapshot(self) -> Snapshot:
+        '''Saves the fight as it is now: the player, their cards, relics and potions, the enemies, every effect,
+        the bus subscriptions and the random state. Pass it to restore() to go back to this point.'''
+        objects = [self, *self.player.snapshot_objects()]
+        for enemy in self.all_enemies:
+            objects += enemy.snapshot_objects()
+        return Snapshot(objects, self.bus)
+
+    def restore(self, snapshot: Snapshot):
+        snapshot.restore()
+
+    @property
+    def state_hash(self) -> int:
+        '''A 64-bit hash of the player and every enemy (see zobrist), without walking over the whole fight.'''
+        return zobrist.combine([self.player.state_hash, *(enemy.state_hash for enemy in self.all_enemies)])
 
     @property
     def active_enemies(self):
         return [enemy for enemy in self.all_enemies if enemy.state == State.ALIVE]
 
+    @driven
     def combat(self) -> None:
         """There's too much to say here."""
         self.start_combat()
         # Combat automatically ends when all enemies are dead.
         while len(self.active_enemies) > 0:
-            bus.publish(Message.START_OF_TURN, (self.turn, self.player))
+            self.start_turn()
             while True:
                 self.on_player_move()
                 if all((enemy.state == State.DEAD for enemy in self.all_enemies)):
                     self.end_combat(killed_enemies=True)
                     break
+                if self.check_player_death():
+                    return
 
-                print(f"Turn {self.turn}: ")
+                echo(f"Turn {self.turn}: ")
                 # Shows the player's potions, cards(in hand), amount of cards in discard and draw pile, and shows the status for you and the enemies.
                 view.display_ui(self.player, self.active_enemies)
-                print("1-0: Play card, P: Play Potion, M: View Map, D: View Deck, A: View Draw Pile, S: View Discard Pile, X: View Exhaust Pile, E: End Turn, F: View Debuffs and Buffs")
-                action = input("> ").lower()
+                echo("1-0: Play card, P: Play Potion, M: View Map, D: View Deck, A: View Draw Pile, S: View Discard Pile, X: View Exhaust Pile, E: End Turn, F: View Debuffs and Buffs")
+                action = prompt("> ").lower()
                 other_options = {
                     "d": lambda: view.view_piles(self.player.deck, end=True),
                     "a": lambda: view.view_piles(
@@ -80,34 +97,55 @@ class Combat:
                 view.clear()
             if self.player.state == State.ESCAPED:
                 self.end_combat(self, escaped=True)
-            bus.publish(Message.END_OF_TURN, data=(self.player, self.all_enemies))
-            self.turn += 1
+            if self.end_turn():
+                return
+
+    def start_turn(self):
+        self.bus.publish(Message.START_OF_TURN, (self.turn, self.player))
+
+    def end_turn(self) -> bool:
+        '''Ends the player's turn, which is when the enemies act. Returns True if that killed the player.'''
+        self.bus.publish(Message.END_OF_TURN, data=(self.player, self.all_enemies))
+        if self.active_enemies and self.check_player_death():
+            return True
+        self.turn += 1
+        return False
+
+    def check_player_death(self) -> bool:
+        '''Kills the player if they're out of health. Returns True if that ended the fight.'''
+        if self.player.health > 0:
+            return False
+        self.player.die(killed_by=", ".join(enemy.name for enemy in self.all_enemies))
+        if self.player.state != State.DEAD:
+            return False  # Something brought them back
+        self.end_combat()
+        return True
 
     def end_combat(self, killed_enemies=False, escaped=False, robbed=False):
         if killed_enemies is True:
-            potion_roll = random.random()
+            potion_roll = stream(Stream.REWARDS).random()
             ansiprint("<green>Combat finished!</green>")
-            self.player.gain_gold(random.randint(10, 20))
+            self.player.gain_gold(stream(Stream.REWARDS).randint(10, 20))
             if (potion_roll < self.player.potion_dropchance):
-                gen.claim_potions(True, 1, self.player, potion_catalog.create_all_potions())
+                gen.claim_potions(True, 1, self.player)
                 self.player.potion_dropchance -= 10
             else:
                 self.player.potion_dropchance += 10
-            gen.card_rewards(self.tier, True, self.player, card_catalog.create_all_cards())
+            gen.card_rewards(self.tier, True, self.player)
             view.clear()
         elif escaped is True:
-            print("Escaped...")
+            echo("Escaped...")
             sleep(0.8)
-            print("You recieve nothing.")
+            echo("You recieve nothing.")
             sleep(1.5)
             view.clear()
         elif robbed:
-            print("Robbed...")
+            echo("Robbed...")
             sleep(0.8)
-            print("You recieve nothing.")
+            echo("You recieve nothing.")
             sleep(1.2)
             view.clear()
-        bus.publish(Message.END_OF_COMBAT, (self.tier, self.player))
+        self.bus.publish(Message.END_OF_COMBAT, (self.tier, self.player))
         self.player.unsubscribe()
         for enemy in self.all_enemies:
             enemy.unsubscribe()
@@ -116,40 +154,28 @@ class Combat:
         self.update_death_messages()
         self.previous_enemy_states = tuple(enemy.state for enemy in self.all_enemies)
 
-        def clean_effects(effects):
-            for effect in effects:
-                if effect.amount <= 0:
-                    effect.unsubscribe()
-                    ansiprint(f"{effect.get_name()} wears off.")
-            return [effect for effect in effects if effect.amount >= 1]
+        def wears_off(effect):
+            ansiprint(f"{effect.get_name()} wears off.")
 
-        for enemy in self.active_enemies:
-            enemy.buffs = clean_effects(enemy.buffs)
-            enemy.debuffs = clean_effects(enemy.debuffs)
-        self.player.buffs, self.player.debuffs = [
-            clean_effects(effects) for effects in (self.player.buffs, self.player.debuffs)
-        ]
+        for entity in (*self.active_enemies, self.player):
+            entity.buffs.prune(wears_off)
+            entity.debuffs.prune(wears_off)
 
     def create_enemies_from_tier(self) -> list[Enemy]:
-        act1_normal_encounters = create_act1_normal_encounters(self.all_enemies)
-        act1_elites = create_act1_elites()
-        act1_boss = create_act1_boss()
-        encounter_types = {
-            CombatTier.NORMAL: act1_normal_encounters,
-            CombatTier.ELITE: act1_elites,
-            CombatTier.BOSS: act1_boss,
-        }
-        return encounter_types[self.tier][0]
+        if self.encounters is None:
+            self.encounters = EncounterSchedule()
+        return self.encounters.create_enemies(self.tier)
 
     def start_combat(self) -> list[Enemy]:
-        self.player.register(bus=bus)
+        self.player.register(bus=self.bus)
         if not self.all_enemies:
             self.all_enemies = self.create_enemies_from_tier()
 
         for enemy in self.all_enemies:
-            enemy.register(bus=bus)
+            enemy.player = self.player
+            enemy.register(bus=self.bus)
 
-        bus.publish(Message.START_OF_COMBAT, (self.tier, self.active_enemies, self.player))
+        self.bus.publish(Message.START_OF_COMBAT, (self.tier, self.active_enemies, self.player))
         self.previous_enemy_states = tuple(enemy.state for enemy in self.all_enemies)
 
     def select_target(self):
@@ -158,32 +184,43 @@ class Combat:
         else:
             while True:
                 try:
-                    target = int(input("Choose an enemy to target > ")) - 1
+                    target = int(prompt("Choose an enemy to target > ")) - 1
                     _ = self.active_enemies[target]
                 except (IndexError, ValueError):
                     ansiprint(f"\u001b[1A\u001b[100D<red>You have to enter a number between 1 and {len(self.active_enemies)}</red>", end="")
                     sleep(1)
-                    print("\u001b[2K\u001b[100D", end="")
+                    echo("\u001b[2K\u001b[100D", end="")
                     continue
                 return target
 
-    def play_new_card(self, card):
+    def unplayable_reason(self, card) -> str | None:
+        '''Why [card] can't be played right now, or None if it can.'''
         # Prevents the player from using a card that they don't have enough energy for.
         if card.energy_cost > self.player.energy:
-            ansiprint("<red>You don't have enough energy to use this card.</red>")
-            sleep(1)
-            view.clear()
-            return
+            return "<red>You don't have enough energy to use this card.</red>"
+        if card.type == CardType.ATTACK and self.player.debuffs.get(effect_catalog.Entangled) is not None:
+            return "You can't play <keyword>Attacks</keyword> while <debuff>Entangled</debuff>."
         # Todo: Move to Velvet Choker relic
         if self.player.choker_cards_played == 6:
-            ansiprint("You have already played 6 cards this turn!")
+            return "You have already played 6 cards this turn!"
+        return None
+
+    def play_new_card(self, card):
+        reason = self.unplayable_reason(card)
+        if reason is not None:
+            ansiprint(reason)
             sleep(1)
             view.clear()
             return
+        if card.target == TargetType.SINGLE:
+            self.play_card(card, self.active_enemies[self.select_target()])
+        else:
+            self.play_card(card)
 
+    def play_card(self, card, target: Enemy | None = None):
+        '''Plays [card] from the player's hand at [target] (for cards with a single target). Doesn't check if it can be played.'''
         if card.target == TargetType.SINGLE:
-            target = self.select_target()
-            self.player.use_card(card, target=self.active_enemies[target], exhaust=False, pile=self.player.hand, enemies=self.all_enemies)
+            self.player.use_card(card, target=target, exhaust=False, pile=self.player.hand, enemies=self.all_enemies)
         else:
             self.player.use_card(card, target=self.active_enemies, exhaust=False, pile=self.player.hand, enemies=self.all_enemies)
 
@@ -0,0 +1,287 @@
+'''A step-based environment over a single fight, for training agents. Needs numpy.
+
+    env = CombatEnv()
+    observation, info = env.reset(seed=0)
+    while True:
+        action = agent(observation, env.legal_action_mask())
+        observation, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            break
+
+reset() and step() follow the Gymnasium conventions. Action 0 ends the turn. Action
+1 + slot * MAX_ENEMIES + target plays the card in hand slot [slot] at the enemy in slot [target].
+Cards that don't take a single target are played with target 0.
+
+Everything the game asks for in the middle of a card (which card to upgrade, which card to copy...)
+is answered by [responder], which picks at random by default.
+'''
+from __future__ import annotations
+
+import inspect
+import random
+
+import numpy as np
+
+import card_catalog
+import effect_catalog
+from combat import Combat
+from definitions import ActionType, CardType, CombatTier, State, TargetType
+from drivers import HeadlessDriver, use_driver
+from encounters import EncounterSchedule
+from enemy import Intent
+from message_bus_tools import MessageBus
+from player import Player
+from rng import RNG, get_rng, use_rng
+
+MAX_HAND = 10
+MAX_ENEMIES = 10  # The gremlin gang has 8, and slimes that split add more
+END_TURN = 0
+N_ACTIONS = 1 + MAX_HAND * MAX_ENEMIES
+
+# Card and effect classes get fixed ids so they always land in the same place in the observation. Card id 0 means no card.
+CARD_IDS = {cls: i + 1 for i, cls in enumerate(sorted(
+    (cls for _, cls in inspect.getmembers(card_catalog, inspect.isclass) if issubclass(cls, card_catalog.Card) and cls is not card_catalog.Card),
+    key=lambda cls: cls.__name__))}
+EFFECT_IDS = {cls: i for i, cls in enumerate(sorted(
+    (cls for _, cls in inspect.getmembers(effect_catalog, inspect.isclass) if issubclass(cls, effect_catalog.Effect) and cls is not effect_catalog.Effect),
+    key=lambda cls: cls.__name__))}
+CARD_TYPE_IDS = {card_type: i for i, card_type in enumerate(CardType)}
+N_CARD_IDS = len(CARD_IDS) + 1
+N_EFFECTS = len(EFFECT_IDS)
+
+# Observation layout. Every section has a fixed size and offset.
+PLAYER_FEATURES = 8  # health, max health, block, energy, turn, cards in draw, discard and exhaust piles
+CARD_FEATURES = 4  # card id, energy cost, upgraded, card type
+ENEMY_FEATURES = 12  # present, alive, health, max health, block, then the intent: damage per hit, hits, block, buff, debuff, status, anything else
+PLAYER = 0
+PLAYER_EFFECTS = PLAYER + PLAYER_FEATURES
+HAND = PLAYER_EFFECTS + N_EFFECTS
+PILES = HAND + MAX_HAND * CARD_FEATURES  # Count of every card id in the draw, discard and exhaust piles
+ENEMIES = PILES + 3 * N_CARD_IDS
+ENEMY_SIZE = ENEMY_FEATURES + N_EFFECTS
+OBSERVATION_SIZE = ENEMIES + MAX_ENEMIES * ENEMY_SIZE
+
+INTENT_FLAGS = {"Buff": 8, "Debuff": 9, "Status": 10}  # Offsets within an enemy. Other intents (besides Attack and Block) go in 11
+
+
+def intent_features(intent: Intent) -> tuple[int, int, int, int, int, int, int]:
+    '''Damage per hit, hits, block, buff, debuff, status, other for an enemy's intent.'''
+    flags = [0, 0, 0, 0]
+    for action in intent.actions:
+        if action.kind in INTENT_FLAGS:
+            flags[INTENT_FLAGS[action.kind] - 8] = 1
+        elif action.kind not in (ActionType.ATTACK, ActionType.BLOCK):
+            flags[3] = 1
+    return (intent.damage, intent.hits, intent.block, *flags)
+
+
+def check_fits(combat: Combat):
+    '''Raises ValueError if [combat] has more enemies than the observation and the actions have slots for.'''
+    if len(combat.all_enemies) > MAX_ENEMIES:
+        raise ValueError(f"The fight has {len(combat.all_enemies)} enemies but CombatEnv only has room for {MAX_ENEMIES}")
+
+
+class ObservationEncoder():
+    '''Writes a fight into a fixed-size float32 array.
+
+    Every section (the player, their effects, the hand, each pile, each enemy and its effects) remembers
+    what it last wrote, and is only rewritten when that changes. The hand, the piles and each entity's effects
+    are checked by their version (see zobrist), so checking one costs the same however many cards or effects
+    are in it. The player and each enemy are a handful of numbers and are compared as they are, with the
+    enemy's intent compared by identity, since a new one is made whenever the enemy picks a move.
+    '''
+    # Section numbers
+    PLAYER, PLAYER_EFFECTS, HAND = 0, 1, 2
+    PILES = 3  # One per pile
+    ENEMIES = 6  # Two per enemy: the enemy, then its effects
+    N_SECTIONS = ENEMIES + 2 * MAX_ENEMIES
+
+    def __init__(self, out: np.ndarray | None = None):
+        self.obs = out if out is not None else np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        self.written = [None] * self.N_SECTIONS
+        # Views of each part of the observation, made once
+        obs = self.obs
+        self.player = obs[PLAYER:PLAYER + PLAYER_FEATURES]
+        self.player_effects = obs[PLAYER_EFFECTS:PLAYER_EFFECTS + N_EFFECTS]
+        self.hand = obs[HAND:HAND + MAX_HAND * CARD_FEATURES].reshape(MAX_HAND, CARD_FEATURES)
+        self.piles = obs[PILES:ENEMIES].reshape(3, N_CARD_IDS)
+        self.enemies = obs[ENEMIES:].reshape(MAX_ENEMIES, ENEMY_SIZE)
+
+    def reset(self):
+        self.obs[:] = 0
+        self.written = [None] * self.N_SECTIONS
+
+    def changed(self, section: int, key) -> bool:
+        if self.written[section] == key:
+            return False
+        self.written[section] = key
+        return True
+
+    def write_effects(self, section: int, effects: np.ndarray, entity):
+        if self.changed(section, entity.__dict__.get("effects_version", 0)):  # 0 if it's never held an effect
+            effects[:] = 0
+            for effect in entity.buffs:
+                effects[EFFECT_IDS[type(effect)]] += effect.amount
+            for effect in entity.debuffs:
+                effects[EFFECT_IDS[type(effect)]] += effect.amount
+
+    def encode(self, combat: Combat) -> np.ndarray:
+        player = combat.player
+        piles = (player.draw_pile, player.discard_pile, player.exhaust_pile)
+        key = (player.health, player.max_health, player.block, player.energy, combat.turn, *map(len, piles))
+        if self.changed(self.PLAYER, key):
+            self.player[:] = key
+        self.write_effects(self.PLAYER_EFFECTS, self.player_effects, player)
+
+        if self.changed(self.HAND, player.hand.version):
+            rows = [(CARD_IDS.get(type(card), 0), card.energy_cost, card.upgraded, CARD_TYPE_IDS[card.type]) for card in player.hand[:MAX_HAND]]
+            self.hand[len(rows):] = 0
+            if rows:
+                self.hand[:len(rows)] = rows
+        for i, pile in enumerate(piles):
+            if self.changed(self.PILES + i, pile.version):
+                self.piles[i] = np.bincount([CARD_IDS.get(type(card), 0) for card in pile], minlength=N_CARD_IDS)
+
+        for i, enemy in enumerate(combat.all_enemies[:MAX_ENEMIES]):
+            section = self.ENEMIES + 2 * i
+            if self.changed(section, (enemy.state, enemy.health, enemy.max_health, enemy.block, enemy.intent)):
+                self.enemies[i, :ENEMY_FEATURES] = (1, enemy.state == State.ALIVE, enemy.health, enemy.max_health, enemy.block,
+                                                    *intent_features(enemy.intent))
+            self.write_effects(section + 1, self.enemies[i, ENEMY_FEATURES:], enemy)
+        return self.obs
+
+
+def random_responder(seed: int | None):
+    '''Answers the prompts cards make in the middle of being played with a random hand slot.'''
+    rng = random.Random(seed)
+    def respond(_message):
+        return str(rng.randint(1, MAX_HAND))
+    return respond
+
+
+class CombatEnv():
+    '''One fight against the enemies of [tier], or against [encounter]() if it's given, with the starting Ironclad deck.
+
+    Rewards are the share of the enemies' total health taken off them minus the share of the player's max health
+    lost, plus 1 for winning or -1 for dying. Fights that go past [max_turns] are truncated.
+
+    Observations are encoded into [out] if it's given (a row of a VectorEnv's batch, say) and copies are returned.
+    '''
+    def __init__(self, tier: CombatTier = CombatTier.NORMAL, encounter=None, responder=None, max_turns: int = 100,
+                 out: np.ndarray | None = None):
+        self.tier = tier
+        self.encounter = encounter
+        self.responder = responder
+        self.max_turns = max_turns
+        self.encoder = ObservationEncoder(out)
+        self.combat: Combat | None = None
+        self.bus: MessageBus | None = None  # The bus of the fight reset() made, which close() empties
+        self.done = True
+        self.mask = None  # The legal actions, worked out once per step
+
+    def reset(self, seed: int | None = None, options=None) -> tuple[np.ndarray, dict]:  # noqa: ARG002 (Gymnasium's signature)
+        self.close()
+        self.rng = RNG(seed)
+        self.driver = HeadlessDriver(self.responder if self.responder is not None else random_responder(self.rng.seed))
+        with use_driver(self.driver), use_rng(self.rng):
+            bus = self.bus = MessageBus(debug=False)
+            player = Player.create_player(bus=bus)
+            enemies = self.encounter() if self.encounter is not None else EncounterSchedule().create_enemies(self.tier)
+            self.combat = Combat(self.tier, player, game_map=None, all_enemies=enemies, driver=self.driver, bus=bus)
+            check_fits(self.combat)
+            self.combat.start_combat()
+            self.combat.start_turn()
+            self.combat.on_player_move()
+        self.done = False
+        self.mask = None
+        self.encoder.reset()
+        return self.encoder.encode(self.combat).copy(), {"seed": self.rng.seed}
+
+    def attach(self, combat: Combat, rng: RNG | None = None):
+        '''Takes over a fight that's already going, like a game's current one, instead of starting a new one.
+        [rng] is the RNG the fight draws from, the active one by default. Mid-card prompts still go to [responder].'''
+        check_fits(combat)
+        self.close()
+        self.combat = combat
+        self.rng = rng if rng is not None else get_rng()
+        self.driver = HeadlessDriver(self.responder if self.responder is not None else random_responder(getattr(self.rng, "seed", None)))
+        self.done = combat.player.state != State.ALIVE or not combat.active_enemies
+        self.mask = None
+        self.encoder.reset()
+
+    def close(self):
+        '''Empties the bus of the fight reset() last made, so nothing of that fight is kept alive. reset() and attach()
+        call it before moving on. An attached fight's bus belongs to its game and is left alone.'''
+        if self.bus is not None:
+            self.bus.clear()
+            self.bus = None
+
+    def snapshot(self):
+        '''Saves the fight, its random state and whether it's over. See Combat.snapshot().'''
+        with use_rng(self.rng):
+            return self.combat.snapshot(), self.done
+
+    def restore(self, snapshot):
+        combat_snapshot, self.done = snapshot
+        self.combat.restore(combat_snapshot)
+        self.mask = None
+
+    def legal_action_mask(self) -> np.ndarray:
+        if self.mask is not None:
+            return self.mask.copy()
+        mask = [False] * N_ACTIONS
+        if not self.done:
+            mask[END_TURN] = True
+            combat = self.combat
+            alive = [i for i, enemy in enumerate(combat.all_enemies[:MAX_ENEMIES]) if enemy.state == State.ALIVE]
+            for slot, card in enumerate(combat.player.hand[:MAX_HAND]):
+                if not card.playable or combat.unplayable_reason(card) is not None:
+                    continue
+                action = 1 + slot * MAX_ENEMIES
+                if card.target == TargetType.SINGLE:
+                    for target in alive:
+                        mask[action + target] = True
+                else:
+                    mask[action] = True
+        self.mask = np.array(mask)
+        return self.mask.copy()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        if self.done:
+            raise RuntimeError("The fight is over. Call reset() to start another.")
+        combat = self.combat
+        player = combat.player
+        health_before = player.health
+        enemy_health_before = sum(max(enemy.health, 0) for enemy in combat.all_enemies)
+        with use_driver(self.driver), use_rng(self.rng):
+            died = False
+            if action == END_TURN:
+                died = combat.end_turn()
+                if not died:
+                    combat.start_turn()
+            else:
+                slot, target = divmod(action - 1, MAX_ENEMIES)
+                if self.mask is None:
+                    self.legal_action_mask()
+                if not self.mask[action]:
+                    raise ValueError(f"Action {action} (hand slot {slot}, target {target}) can't be played right now.")
+                card = player.hand[slot]
+                combat.play_card(card, combat.all_enemies[target] if card.target == TargetType.SINGLE else None)
+            if not died:
+                combat.on_player_move()
+                died = combat.check_player_death()
+            won = not died and not combat.active_enemies
+            if won:
+                combat.end_combat()
+        self.mask = None
+        check_fits(combat)  # Enemies that split or summon can add more
+
+        enemy_max_health = sum(enemy.max_health for enemy in combat.all_enemies)
+        enemy_health = sum(max(enemy.health, 0) for enemy in combat.all_enemies)
+        reward = (enemy_health_before - enemy_health) / enemy_max_health - (health_before - max(player.health, 0)) / player.max_health
+        reward += 1 if won else -1 if died else 0
+        terminated = won or died
+        truncated = not terminated and combat.turn > self.max_turns
+        self.done = terminated or truncated
+        info = {"turn": combat.turn, "won": won}
+        return self.encoder.encode(combat).copy(), reward, terminated, truncated, info
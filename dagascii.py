@@ -12,6 +12,8 @@ from grandalf.graphs import Edge, Graph, Vertex
 from grandalf.layouts import SugiyamaLayout
 from grandalf.routing import EdgeViewer, route_with_lines
 
+from drivers import echo
+
 DVC_PAGER = "DVC_PAGER"
 
 def format_link(x):
@@ -101,10 +103,8 @@ class AsciiCanvas(object):
 
     def draw(self):
         """Draws ASCII canvas on the screen."""
-        pager = find_pager()
         lines = map("".join, self.canvas)
-        joined_lines = os.linesep.join(lines)
-        pager(joined_lines)
+        echo("\n".join(lines), end="")  # Through the driver, so it lands in the same frame as everything around it
 
     def point(self, x, y, char):
         """Create a point on ASCII canvas.
@@ -47,10 +47,21 @@ class TargetType(StrEnum):
     ANY = 'Any'
     AREA = 'Area' # Also use for cards that target a random enemy
     ENEMY = 'Enemy' # Only for use in enemy moves when the enemy targets another enemy
+    PLAYER = 'Player' # Only for use in enemy moves
     NOTHING = 'Nothing'
     SINGLE = 'Single'
     YOURSELF = 'Yourself'
 
+class ActionType(StrEnum):
+    '''What an enemy does as part of a move. The values are the names used in enemies' next_move.'''
+    ATTACK = 'Attack'
+    BLOCK = 'Block'
+    BUFF = 'Buff'
+    DEBUFF = 'Debuff'
+    STATUS = 'Status'
+    REMOVE_EFFECT = 'Remove Effect'
+    SPECIAL = 'Special' # Anything else, like splitting or escaping. See Enemy.misc_move().
+
 class CardCategory(StrEnum):
     CARD = 'Card'
     POTION = 'Potion'
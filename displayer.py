@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import random
-from os import name, system
-from time import sleep
 from typing import TYPE_CHECKING, Callable
 
-from ansi_tags import ansiprint, strip
+import drivers
+from ansi_tags import render, render_plain
 from definitions import (
     State,
 )
+from drivers import ansiprint, echo, prompt, sleep
+from rng import Stream, stream
 
 if TYPE_CHECKING:
     from card_catalog import Card
@@ -17,38 +17,41 @@ if TYPE_CHECKING:
 # Displays important info to the player during combat
 
 
+def pile_lines(pile: list[Card], validator: Callable = lambda placehold: bool(placehold)) -> list[str]:
+    """A numbered line for each card in [pile]. Cards [validator] rejects are grayed out."""
+    lines = []
+    for counter, card in enumerate(pile, start=1):
+        if validator(card):
+            lines.append(f"{counter}: {render(card)}")
+        else:
+            lines.append(f"{counter}: <light-black>{render_plain(card)}</light-black>")
+    return lines
+
 def view_piles(pile: list[Card], shuffle=False, end=False, validator: Callable = lambda placehold: bool(placehold)):
-    """Prints a numbered list of all the cards in a certain pile."""
+    """Prints a numbered list of all the cards in a certain pile, all at once."""
     if len(pile) == 0:
         ansiprint("<red>This pile is empty</red>.")
         sleep(1.5)
         clear()
         return
     if shuffle is True:
-        pile = random.sample(pile, len(pile))
+        pile = stream(Stream.DISPLAY).sample(pile, len(pile))
         ansiprint("<italic>Cards are not shown in order.</italic>")
-    counter = 1
-    for card in pile:
-        if validator(card):
-            ansiprint(f"{counter}: {card.pretty_print()}")
-            counter += 1
-            sleep(0.05)
-        else:
-            ansiprint(f"{counter}: <light-black>{strip(card.pretty_print())}</light-black>")
-            counter += 1
-            sleep(0.05)
+    for line in pile_lines(pile, validator):
+        ansiprint(line)
     if end:
-        input("Press enter to continue > ")
+        prompt("Press enter to continue > ")
         sleep(0.5)
         clear()
 
+def relic_lines(relic_pool, validator: Callable = lambda placehold: bool(placehold)) -> list[str]:
+    return [relic.pretty_print() for relic in relic_pool if validator(relic)]
+
 def view_relics(relic_pool, end=False, validator: Callable = lambda placehold: bool(placehold)):
-    for relic in relic_pool:
-        if validator(relic):
-            ansiprint(relic.pretty_print())
-            sleep(0.05)
+    for line in relic_lines(relic_pool, validator):
+        ansiprint(line)
     if end:
-        input("Press enter to continue > ")
+        prompt("Press enter to continue > ")
         sleep(1.5)
         clear()
 
@@ -65,27 +68,25 @@ def view_potions(potion_pool, only_the_potions = False, max_potions=3, numbered_
 
 def view_map(game_map):
     game_map.pretty_print()
-    print("\n")
+    echo("\n")
     sleep(0.2)
-    input("Press enter to leave > ")
+    prompt("Press enter to leave > ")
 
 def display_ui(entity, enemies, combat=True):
-    # Repeats for every card in the entity's hand
-    ansiprint("<bold>Relics: </bold>")
-    view_relics(entity.relics)
-    ansiprint("<bold>Hand: </bold>")
-    view_piles(entity.hand, entity, False, lambda card: (card.energy_cost if card.energy_cost != -1 else entity.energy) <= entity.energy)
+    """Draws the fight in one go, without pauses, so the terminal driver can rewrite just the lines that changed since the last time."""
+    lines = ["<bold>Relics: </bold>", *relic_lines(entity.relics), "<bold>Hand: </bold>"]
+    lines += pile_lines(entity.hand, lambda card: (card.energy_cost if card.energy_cost != -1 else entity.energy) <= entity.energy)
     if combat is True:
-        counter = 1
-        ansiprint("\n<bold>Enemies:</bold>")
+        lines.append("\n<bold>Enemies:</bold>")
         viewable_enemies = [enemy for enemy in enemies if enemy.state in (State.ALIVE, State.INTANGIBLE)]
-        for enemy in viewable_enemies:
-            ansiprint(f"{counter}: " + repr(enemy))
-            counter += 1
-        ansiprint("\n" + repr(entity))
+        for counter, enemy in enumerate(viewable_enemies, start=1):
+            lines.append(f"{counter}: " + repr(enemy))
+        lines.append("\n" + repr(entity))
     else:
-        ansiprint(str(entity))
-    print()
+        lines.append(str(entity))
+    for line in lines:
+        ansiprint(line)
+    echo()
 
 def list_input(input_string: str, choices: list, displayer: Callable,
                validator: Callable = lambda placehold: bool(placehold),
@@ -98,19 +99,19 @@ def list_input(input_string: str, choices: list, displayer: Callable,
         try:
             displayer(choices, validator=validator)
             ansiprint(input_string + " > ", end="")
-            response = input()
+            response = prompt()
             if response in extra_allowables:
                 return response
             option = int(response) - 1
             if not validator(choices[option]):
                 ansiprint(f"\u001b[1A\u001b[1000D<red>{message_when_invalid}</red>", end="")
                 sleep(1.5)
-                print("\u001b[2K")
+                echo("\u001b[2K")
                 continue
         except (IndexError, ValueError):
             ansiprint(f"\u001b[1A\u001b[100D<red>You have to enter a whole number between 1 and {len(choices)}.</red>", end="")
             sleep(1)
-            print("\u001b[2K\u001b[100D", end="")
+            echo("\u001b[2K\u001b[100D", end="")
             continue
         break
     return option
@@ -129,11 +130,11 @@ def multi_input(input_string: str, choices: list, displayer: Callable, max_choic
             try:
                 displayer(choices, validator=validator)
                 ansiprint(input_string + "(type 'exit' to finish) > ", end="")
-                response = input()
+                response = prompt()
                 if response == 'exit' and (strict and len(to_be_moved) < max_choices):
                     ansiprint(f"\u001b[1A\u001b[1000D<red>You have to choose exactly {max_choices} items.</red>", end="")
                     sleep(1)
-                    print("\u001b[2K\u001b[100D", end="")
+                    echo("\u001b[2K\u001b[100D", end="")
                     continue
                 elif response == 'exit':
                     finished = True
@@ -144,17 +145,17 @@ def multi_input(input_string: str, choices: list, displayer: Callable, max_choic
                 if not validator(choices[option]):
                     ansiprint(f"\u001b[1A\u001b[1000D<red>{message_when_invalid}</red>", end="")
                     sleep(1.5)
-                    print("\u001b[2K\u001b[100D")
+                    echo("\u001b[2K\u001b[100D")
                     continue
                 if len(to_be_moved) == max_choices:
                     del to_be_moved[0]
             except (IndexError, ValueError):
                 ansiprint(f"\u001b[1A\u001b[100D<red>You have to enter a whole number between 1 and {len(choices)}.</red>", end="")
                 sleep(1)
-                print("\u001b[2K\u001b[100D", end="")
+                echo("\u001b[2K\u001b[100D", end="")
                 continue
             to_be_moved.append(choices[option])
             break
 
 def clear():
-    system("cls" if name == "nt" else "clear")
+    drivers.clear()
@@ -0,0 +1,268 @@
+'''Drivers sit between the game and the outside world.
+
+Everything the game shows or asks for goes through the active driver: prompts, cosmetic pauses,
+printing and clearing the screen. The terminal driver plays the game like it always has, while the
+headless and scripted drivers let the game run without a terminal at all (no sleeping, no rendering).
+
+Game, Combat, RestSite, Shop and the events receive a driver and make it the active one while they run,
+so code deeper down (cards, enemies, the displayer) only ever needs the module level helpers below.
+'''
+from __future__ import annotations
+
+import atexit
+import io
+import re
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterable, TextIO
+
+import ansi_tags
+import pacing
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J\x1b[3J"  # Cursor to the top left, clear the screen, clear the scrollback
+COLORS = re.compile("\x1b\\[[0-9;]*m")
+CURSOR_CONTROL = re.compile("\x1b\\[[0-9;]*[^0-9;m]|\r")  # Anything that moves the cursor or erases, which the Screen can't follow
+
+
+class ScriptExhausted(Exception):
+    '''Raised when a ScriptedDriver is asked for more input than it was given.'''
+
+
+class Driver():
+    '''Base class for all drivers. Subclasses decide where output goes and where input comes from.'''
+    renders = True  # False if nothing is ever shown. Lets expensive rendering (like the map) be skipped.
+
+    def prompt(self, message: str = "") -> str:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def echo(self, *args, **kwargs) -> None:
+        '''Plain print(), no markup.'''
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def ansiprint(self, *args, **kwargs) -> None:
+        '''print() with ansimarkup tags.'''
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def clear(self) -> None:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def flush(self) -> None:
+        '''Writes out anything held back. Drivers that write straight away have nothing to do.'''
+
+
+class Screen():
+    '''What's on the terminal since it was last cleared, line by line, so the next screen can be drawn by
+    rewriting only the lines that changed.
+
+    Lines hold exactly what was written, colors and all. [lines] is None when the screen can't be followed,
+    like after the cursor was moved by hand or the text scrolled off the top, and the next screen is drawn in full.
+
+    The terminal's size is read once per frame (see refresh), not on every write.
+    '''
+    def __init__(self):
+        self.lines: list[str] | None = None
+        self.refresh()
+
+    def refresh(self):
+        '''Reads the terminal's size again, in case the window was resized.'''
+        self.columns, self.rows = shutil.get_terminal_size()
+
+    def fits(self, lines: list[str]) -> bool:
+        return len(lines) <= self.rows and all(len(COLORS.sub("", line)) < self.columns for line in lines)
+
+    def write(self, text: str):
+        '''Follows [text] being written after what's on the screen.'''
+        if self.lines is None:
+            return
+        if CURSOR_CONTROL.search(text):
+            self.lines = None
+            return
+        first, *rest = text.split("\n")
+        self.lines[-1] += first
+        self.lines += rest
+        if not self.fits(self.lines):
+            self.lines = None
+
+    def redraw(self, text: str) -> str:
+        '''What to write to replace the screen with [text].'''
+        old, new = self.lines, text.split("\n")
+        self.lines = new if not CURSOR_CONTROL.search(text) and self.fits(new) else None
+        if old is None or self.lines is None:
+            return CLEAR_SCREEN + text
+        changes = [f"\x1b[{row + 1};1H{line}\x1b[K" for row, line in enumerate(new[:-1])
+                   if row >= len(old) or old[row] != line]
+        # The last line is always written, to leave the cursor at its end, and everything below it is erased
+        changes.append(f"\x1b[{len(new)};1H{new[-1]}\x1b[J")
+        return "".join(changes)
+
+
+class TerminalDriver(Driver):
+    '''Plays the game in a terminal. This is the default driver.
+
+    Output is collected into a frame and written out in one go, with one flush, whenever the game waits for
+    the player (a prompt or a pause). Clearing the screen doesn't write anything by itself: the next frame is
+    compared with the screen it replaces and only the lines that changed are rewritten (see Screen).
+    No shell is started to run `clear`.
+
+    [out] is where frames go. None means whatever sys.stdout is when the frame is written.
+    '''
+    def __init__(self, out: TextIO | None = None):
+        self.out = out
+        self.frame = io.StringIO()
+        self.cleared = False  # Whether the frame replaces the screen or goes after it
+        self.screen = Screen()
+        self.frames = 0  # How many times the terminal was flushed
+
+    def flush(self):
+        '''Writes out the frame so far.'''
+        text = self.frame.getvalue()
+        if not text and not self.cleared:
+            return
+        self.frame.seek(0)
+        self.frame.truncate()
+        self.screen.refresh()
+        if self.cleared:
+            self.cleared = False
+            text = self.screen.redraw(text)
+        else:
+            self.screen.write(text)
+        out = self.out if self.out is not None else sys.stdout
+        out.write(text)
+        out.flush()
+        self.frames += 1
+
+    def prompt(self, message=""):
+        self.flush()
+        response = input(message)
+        self.screen.write(f"{message}{response}\n")  # The terminal echoed what was typed
+        return response
+
+    def sleep(self, seconds):
+        '''Pauses for as long as the active pacing says (see pacing). Pauses that come to nothing don't flush the frame.'''
+        if pacing.get_pacing().duration(seconds) <= 0:
+            return
+        if self.frame.tell():  # A pause on a just cleared screen keeps showing the old one, so the next screen can still be a diff
+            self.flush()
+        pacing.pause(seconds)
+
+    def echo(self, *args, **kwargs):
+        kwargs.pop("flush", None)
+        print(*args, **kwargs, file=self.frame)
+
+    def ansiprint(self, *args, **kwargs):
+        kwargs.pop("flush", None)
+        ansi_tags.ansiprint(*args, **kwargs, file=self.frame)
+
+    def clear(self):
+        self.frame.seek(0)
+        self.frame.truncate()
+        self.cleared = True
+
+
+class HeadlessDriver(Driver):
+    '''Runs the game without a terminal. Nothing is printed and nothing sleeps.
+
+    Input comes from [responder], which is called with the prompt and returns whatever the player would have typed.
+    '''
+    renders = False
+
+    def __init__(self, responder: Callable[[str], str]):
+        self.responder = responder
+        self.prompts = 0  # How many times the game asked for input. Handy for spotting runs that are stuck.
+
+    def prompt(self, message=""):
+        self.prompts += 1
+        return self.responder(message)
+
+    def sleep(self, seconds):
+        pass
+
+    def echo(self, *args, **kwargs):
+        pass
+
+    def ansiprint(self, *args, **kwargs):
+        pass
+
+    def clear(self):
+        pass
+
+
+class ScriptedDriver(HeadlessDriver):
+    '''A headless driver that answers prompts from a fixed list of responses, in order.'''
+    def __init__(self, responses: Iterable[str]):
+        self.responses = iter(responses)
+        super().__init__(self.next_response)
+
+    def next_response(self, message):
+        try:
+            return next(self.responses)
+        except StopIteration:
+            raise ScriptExhausted(f"Ran out of scripted responses at prompt {self.prompts}: {message!r}") from None
+
+
+class _ActiveDriver(threading.local):
+    '''The active driver is per thread, so games running in different threads can each have their own.'''
+    driver: Driver = TerminalDriver()
+
+_active = _ActiveDriver()
+
+@atexit.register
+def _flush_at_exit():
+    '''Writes out the active driver's last frame when Python exits, since nothing waited on it.
+
+    One handler for every driver, so drivers aren't kept alive until exit. The others flushed when they stopped being active.
+    '''
+    get_driver().flush()
+
+def get_driver() -> Driver:
+    return _active.driver
+
+def set_driver(driver: Driver) -> Driver:
+    '''Makes [driver] the active driver for this thread. Returns the driver it replaced.'''
+    previous, _active.driver = _active.driver, driver
+    return previous
+
+@contextmanager
+def use_driver(driver: Driver | None):
+    '''Makes [driver] the active driver for the duration of the with block, and flushes it at the end unless it was already active.
+    Does nothing if [driver] is None.'''
+    if driver is None:
+        yield get_driver()
+        return
+    previous = set_driver(driver)
+    try:
+        yield driver
+    finally:
+        set_driver(previous)
+        if driver is not previous:
+            driver.flush()
+
+def driven(method):
+    '''Decorator for entry point methods (Combat.combat, Shop.loop, ...). Runs the method with the object's driver active.'''
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_driver(self.driver):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# Shorthands for the active driver. These are what the rest of the game imports.
+def prompt(message: str = "") -> str:
+    return _active.driver.prompt(message)
+
+def sleep(seconds: float) -> None:
+    _active.driver.sleep(seconds)
+
+def echo(*args, **kwargs) -> None:
+    _active.driver.echo(*args, **kwargs)
+
+def ansiprint(*args, **kwargs) -> None:
+    _active.driver.ansiprint(*args, **kwargs)
+
+def clear() -> None:
+    _active.driver.clear()
@@ -1,18 +1,18 @@
 from __future__ import annotations
 
 import math
-from copy import deepcopy
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
 import definitions
 import effect_interface as ei
-from ansi_tags import ansiprint
+import zobrist
 from definitions import (
     CardType,
     EffectType,
     StackType,
 )
+from drivers import ansiprint, echo
 from message_bus_tools import Message, Registerable
 
 if TYPE_CHECKING:
@@ -31,12 +31,106 @@ def get_attribute(item, attribute):
     else:
         return getattr(item, attribute.lower())
 
-def effect_amount(effect: type[Effect], buffs_or_debuffs: list[Effect]) -> int:
+def effect_amount(effect: type[Effect], buffs_or_debuffs: EffectContainer | list[Effect]) -> int:
     ''' Returns the total amounts of a specific effect in a given list of effects.'''
+    if isinstance(buffs_or_debuffs, EffectContainer):
+        return buffs_or_debuffs.amount(effect)
     return sum([e.amount for e in buffs_or_debuffs if isinstance(e, effect)])
 
 
+class EffectContainer():
+    '''An entity's buffs or debuffs. Holds at most one effect per name, in the order they were first applied.
+
+    Adding an effect that's already there stacks its amount onto the existing one instead of making a new one,
+    so the effect that is subscribed to the bus stays the one being tracked. Looking up an effect (or its amount)
+    by name or class doesn't scan the whole list.
+
+    The effects held count towards [owner]'s state_hash (see zobrist).
+    '''
+    def __init__(self, effects=(), owner=None):
+        self._by_name: dict[str, Effect] = {}
+        self._by_class: dict[type[Effect], Effect] = {}
+        self.owner = owner
+        for effect in effects:
+            self.add(effect)
+
+    def add(self, effect: Effect) -> Effect:
+        '''Adds [effect], or stacks it onto the effect of the same name. Returns whichever effect is now held.'''
+        existing = self._by_name.get(effect.name)
+        if existing is not None:
+            existing.amount += effect.amount
+            return existing
+        self._by_name[effect.name] = effect
+        self._by_class[type(effect)] = effect
+        effect.hold(self.owner)
+        return effect
+
+    append = add  # So code written for plain lists keeps working
+
+    def get(self, key: str | type[Effect]) -> Effect | None:
+        if isinstance(key, str):
+            return self._by_name.get(key)
+        return self._by_class.get(key)
+
+    def amount(self, key: str | type[Effect]) -> int:
+        effect = self.get(key)
+        return effect.amount if effect is not None else 0
+
+    def remove(self, key: Effect | str | type[Effect]) -> Effect | None:
+        '''Removes the effect (or the effect with that name or class) and returns it. Doesn't unsubscribe it.'''
+        effect = self.get(key.name if isinstance(key, Effect) else key)
+        if effect is not None:
+            del self._by_name[effect.name]
+            del self._by_class[type(effect)]
+            effect.release()
+        return effect
+
+    def prune(self, on_expire=None) -> list[Effect]:
+        '''Removes and unsubscribes every effect whose amount has dropped below 1. [on_expire] is called with each one.'''
+        expired = [effect for effect in self._by_name.values() if effect.amount < 1]
+        for effect in expired:
+            self.remove(effect)
+            effect.unsubscribe()
+            if on_expire is not None:
+                on_expire(effect)
+        return expired
+
+    def clear(self):
+        for effect in self._by_name.values():
+            effect.release()
+        self._by_name.clear()
+        self._by_class.clear()
+
+    def __copy__(self):
+        new = EffectContainer(owner=self.owner)
+        new._by_name = self._by_name.copy()
+        new._by_class = self._by_class.copy()
+        return new
+
+    def __iter__(self):
+        return iter(tuple(self._by_name.values()))  # A copy, so effects can be added or removed while iterating
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __contains__(self, key):
+        if isinstance(key, Effect):
+            return self._by_name.get(key.name) is key
+        return self.get(key) is not None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return f"EffectContainer({list(self._by_name.values())!r})"
+
+
 class Effect(Registerable):
+    amount = zobrist.HeldAmount()
+
     def __init__(self, host, name, stack_type: StackType, effect_type, info, amount=0, one_turn=False):
         self.uid = uuid4()
         self.subscribed = False
@@ -48,10 +142,24 @@ class Effect(Registerable):
         self.amount = amount
         self.one_turn = one_turn
 
+    def hold(self, holder):
+        '''Called by the EffectContainer that takes this effect. From now on its amount is part of [holder]'s hash.'''
+        self.holder = holder
+        zobrist.add(holder, "effect", self.name, self.amount)
+
+    def release(self):
+        zobrist.remove(self.holder, "effect", self.name, self.amount)
+        self.holder = None
+
+    def clone(self):
+        new = super().clone()
+        new.holder = None  # The copy isn't in anyone's container yet
+        return new
+
     def __add__(self, other):
         if self.name != other.name:
             raise ValueError(f"Effects of names {self.name} and {other.name} cannot be merged. Addition only works with the same effect.")
-        new_effect = deepcopy(self)
+        new_effect = self.clone()
         new_effect.amount = self.amount + other.amount
         return new_effect
 
@@ -302,6 +410,26 @@ class NoDraw(Effect):
             self.unsubscribe()
 
 
+class Entangled(Effect):
+    # Applied while the enemies act, so it lasts through the player's next turn and wears off at the end of it.
+    registers = [Message.END_OF_TURN]
+
+    def __init__(self, host, amount=1):
+        super().__init__(
+            host,
+            "Entangled",
+            StackType.NONE,
+            EffectType.DEBUFF,
+            "You cannot play <keyword>Attacks</keyword> this turn.",
+            amount,
+        )
+
+    def callback(self, message, _):
+        if message == Message.END_OF_TURN:
+            self.amount = 0
+            self.host.debuffs.prune()
+
+
 class Combust(Effect):
     registers = [Message.END_OF_TURN]
 
@@ -553,7 +681,7 @@ class Split(Effect):
 
     def callback(self, message, data: tuple[Enemy, list[Enemy]]):
         if message == Message.ON_DEATH_OR_ESCAPE:
-            print("Split effect activated")
+            echo("Split effect activated")
             enemy, enemies = data
             split_into = {
                 "Slime Boss": (
@@ -602,7 +730,7 @@ class Artifact(Effect):
 
     def callback(self, message, data: tuple[Effect, Player, Player]):
         if message == Message.BEFORE_APPLY_EFFECT:
-            print("Artifact effect activated")
+            echo("Artifact effect activated")
             effect, target, user = data
             if effect.type == EffectType.DEBUFF and self.amount > 0:
                 effect.unsubscribe()
@@ -654,7 +782,7 @@ class Stunned(Effect):
 
     def callback(self, message, data: Action):
         if message == Message.AFTER_SET_INTENT:
-            print("TBD: Stunned Effect")
+            echo("TBD: Stunned Effect")
 
 
 class Dexterity(Effect):
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from ansi_tags import ansiprint
 from definitions import (
     EffectType,
 )
-from message_bus_tools import bus
+from drivers import ansiprint
 import effect_catalog
 
 
@@ -40,13 +39,11 @@ def apply_effect(target, user, effect, amount=0, recursion_tag=False) -> None:
             f"<debuff>{effect.name}</debuff> was blocked by {subject} <buff>Artifact</buff>."
         )
     else:
-        effect.register(bus)
-        if effect_type == EffectType.DEBUFF:
-            target.debuffs.append(effect)
-            target.debuffs = merge_duplicates(target.debuffs)
-        else:
-            target.buffs.append(effect)
-            target.buffs = merge_duplicates(target.buffs)
+        effects = target.debuffs if effect_type == EffectType.DEBUFF else target.buffs
+        held = effects.add(effect)
+        # Only a new effect needs subscribing. A stacked one was already subscribed when it was first applied.
+        if held is effect and target.bus is not None:  # Otherwise it's registered when the target joins a combat
+            effect.register(target.bus)
 
         if "Player" in str(target) and user is None:
             # If the player applied an effect to themselves
@@ -80,30 +77,8 @@ def tick_effects(subject):
         buff.tick()
     for debuff in subject.debuffs:
         debuff.tick()
-
-    def clean(effect):
-        if effect.amount >= 1:
-            return True
-        else:
-            effect.unsubscribe()
-            return False
-
-    subject.buffs = list(filter(clean, subject.buffs))
-    subject.debuffs = list(filter(clean, subject.debuffs))
-
-def merge_duplicates(effect_list):
-    # Thank you Claude Sonnet
-    result = []
-    seen = {}
-
-    for effect in effect_list:
-        if effect.name in seen:
-            seen[effect.name] += effect
-        else:
-            seen[effect.name] = effect
-            result.append(effect)
-
-    return [seen[effect.name] for effect in result]
+    subject.buffs.prune()
+    subject.debuffs.prune()
 
 def full_view(entity, enemies):
     ansiprint(f"<bold>{entity.name}</bold>")
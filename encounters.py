@@ -0,0 +1,45 @@
+from typing import Callable
+
+import enemy_catalog as ec
+from definitions import CombatTier
+from enemy import Enemy
+from rng import Stream, stream
+
+Encounter = Callable[[], list[Enemy]]
+
+
+class EncounterSchedule():
+    '''The fights for an act, decided once at the start of the run.
+
+    Only the encounter functions are picked here. Their enemies aren't created until the fight actually
+    starts (see create_enemies()), so nothing is built for fights the player never reaches.
+    '''
+    first_normal_encounters = 3
+    normal_encounters = 18
+    elite_encounters = 4
+
+    def __init__(self):
+        self.normal: list[Encounter] = [stream(Stream.ENCOUNTERS).choice(ec.first3_encounters) for _ in range(self.first_normal_encounters)]
+        self.normal += stream(Stream.ENCOUNTERS).choices(ec.remaining_act1_encounters, weights=ec.remaining_act1_weights,
+                                      k=self.normal_encounters - self.first_normal_encounters)
+        self.elites: list[Encounter] = [stream(Stream.ENCOUNTERS).choice(ec.act1_elites) for _ in range(self.elite_encounters)]
+        self.boss: type[Enemy] = stream(Stream.ENCOUNTERS).choice(ec.act1_bosses)
+        self.fought = {CombatTier.NORMAL: 0, CombatTier.ELITE: 0, CombatTier.BOSS: 0}
+
+    def next_encounter(self, tier: CombatTier) -> Encounter:
+        '''The encounter for the next fight of [tier]. Picks more if the player has somehow outlasted the schedule.'''
+        fought = self.fought[tier]
+        self.fought[tier] += 1
+        if tier == CombatTier.BOSS:
+            return lambda: [self.boss()]
+        schedule = self.normal if tier == CombatTier.NORMAL else self.elites
+        if fought >= len(schedule):
+            if tier == CombatTier.NORMAL:
+                schedule.append(stream(Stream.ENCOUNTERS).choices(ec.remaining_act1_encounters, weights=ec.remaining_act1_weights, k=1)[0])
+            else:
+                schedule.append(stream(Stream.ENCOUNTERS).choice(ec.act1_elites))
+        return schedule[fought]
+
+    def create_enemies(self, tier: CombatTier) -> list[Enemy]:
+        '''Creates the enemies for the next fight of [tier].'''
+        return self.next_encounter(tier)()
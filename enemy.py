@@ -1,38 +1,154 @@
 import math
-import random
 from copy import deepcopy
-from time import sleep
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
 import displayer as view
 import effect_interface as ei
-from ansi_tags import ansiprint
-from definitions import State
+from definitions import ActionType, State, TargetType
+from drivers import ansiprint, echo, sleep
 from entities import Damage
-from message_bus_tools import Message, Registerable, bus
+from message_bus_tools import Message, Registerable
+from rng import Stream, stream
 from card_catalog import Card
 from player import Player
-from effect_catalog import Effect
+from effect_catalog import Effect, EffectContainer
+from move_table import MoveHistory
+from zobrist import Hashed, Tracked
+
+if TYPE_CHECKING:
+    from move_table import MoveTable
 
 
 
 class Action():
-    '''A single action that an enemy takes'''
-    def __init__(self, action_type, ) -> None:
-        pass
+    '''A single action that an enemy takes, read once from its next_move.
+
+    [damage] and [hits] are for attacks, [effect] and [amount] for everything else (the block for Block, the
+    card and how many for Status). [target] is who it's aimed at, and [recipient] the enemy when that's another enemy.
+    '''
+    def __init__(self, kind: ActionType, damage: int = 0, hits: int = 0, effect=None, amount: int = 0,
+                 target: TargetType = TargetType.YOURSELF, recipient: "Enemy | None" = None, location: str | None = None,
+                 special: str | None = None, parameters: tuple = ()):
+        self.kind = kind
+        self.damage = damage
+        self.hits = hits
+        self.effect = effect
+        self.amount = amount
+        self.target = target
+        self.recipient = recipient
+        self.location = location  # Where Status cards go, or which effects (Buffs or Debuffs) Remove Effect looks in
+        self.special = special  # What a SPECIAL action does, like "Split" or "Escape"
+        self.parameters = parameters  # The SPECIAL action's parameters
+
+    @classmethod
+    def parse(cls, kind: str, parameters) -> "Action":
+        '''An action from a next_move entry, like ("Attack", (5, 2)) or ("Buff", (effect_catalog.Strength, 3)).'''
+        if kind not in ActionType.__members__.values() or kind == ActionType.SPECIAL:
+            return cls(ActionType.SPECIAL, special=kind, parameters=tuple(parameters))
+        kind = ActionType(kind)
+        if kind == ActionType.ATTACK:
+            return cls(kind, damage=parameters[0], hits=parameters[1] if len(parameters) > 1 else 1, target=TargetType.PLAYER)
+        if kind == ActionType.BUFF:
+            recipient = parameters[2] if len(parameters) > 2 else None
+            return cls(kind, effect=parameters[0], amount=parameters[1] if len(parameters) > 1 else 1,
+                       target=TargetType.ENEMY if recipient is not None else TargetType.YOURSELF, recipient=recipient)
+        if kind == ActionType.DEBUFF:
+            return cls(kind, effect=parameters[0], amount=parameters[1] if len(parameters) > 1 else 1, target=TargetType.PLAYER)
+        if kind == ActionType.STATUS:
+            assert (len(parameters) >= 3), f"Status action requires 3 parameters: given {parameters}"
+            return cls(kind, effect=parameters[0], amount=parameters[1], location=parameters[2].lower(), target=TargetType.PLAYER)
+        if kind == ActionType.REMOVE_EFFECT:
+            return cls(kind, effect=parameters[0], location=parameters[1])
+        recipient = parameters[1] if len(parameters) > 1 else None  # Block
+        return cls(kind, amount=parameters[0], target=TargetType.ENEMY if recipient is not None else TargetType.YOURSELF, recipient=recipient)
+
+    def __repr__(self):
+        details = {"damage": self.damage, "hits": self.hits, "effect": getattr(self.effect, "__name__", self.effect),
+                   "amount": self.amount, "special": self.special}
+        return f"Action({self.kind}, {', '.join(f'{name}={value}' for name, value in details.items() if value)})"
+
+
+class Intent():
+    '''What an enemy is about to do: the name of its move and the actions in it.
 
-    def execute(self):
-        pass
+    Worked out once when the move is picked (see Enemy.set_intent()). The display, the enemy's own turn and agents
+    all read it, rather than going back to the next_move tuples.
+    '''
+    LABELS = {
+        ActionType.BLOCK: "<light-blue>Block</light-blue>",
+        ActionType.BUFF: "<buff>Buff</buff>",
+        ActionType.DEBUFF: "<debuff>Debuff</debuff>",
+        ActionType.STATUS: "<debuff>Debuff</debuff>",
+    }
+    SPECIAL_LABELS = {
+        "Escape": "<red>Escape</red>",
+        "Charging": "<yellow>Charging</yellow>",
+        "Sleeping": "<yellow>Asleep</yellow>",
+        "Stunned": "<yellow>Stunned</yellow>",
+    }
+
+    def __init__(self, name: str = "", actions: tuple[Action, ...] = ()):
+        self.name = name
+        self.actions = actions
+        attacks = [action for action in actions if action.kind == ActionType.ATTACK]
+        self.damage = attacks[0].damage if attacks else 0  # Per hit
+        self.hits = sum(action.hits for action in attacks)
+        self.block = sum(action.amount for action in actions if action.kind == ActionType.BLOCK)
+        self.kinds = frozenset(action.kind for action in actions)
+        self.special = actions[0].special if actions and actions[0].kind == ActionType.SPECIAL else None
+
+    @classmethod
+    def from_next_move(cls, next_move) -> "Intent":
+        '''Reads an enemy's next_move: the first entry is (name, action, parameters) and the rest (action, parameters).
+        Moves that aren't one of the ActionTypes start with (name, what they do) or (name, what they do, parameters).'''
+        if not next_move:
+            return cls()
+        first, *rest = next_move
+        if len(first) > 2:
+            name, kind, parameters = first
+        elif first[0] in ActionType.__members__.values():
+            (kind, parameters), name = first, "DEFAULT: UNKNOWN"
+        else:
+            (name, kind), parameters = first, ()
+        return cls(name, (Action.parse(kind, parameters), *(Action.parse(*action) for action in rest)))
+
+    @property
+    def blocks(self) -> bool:
+        return ActionType.BLOCK in self.kinds
+
+    def pretty_print(self) -> str:
+        if self.special is not None:
+            return self.SPECIAL_LABELS.get(self.special, "<yellow>Unknown</yellow>")
+        labels = []
+        for action in self.actions:
+            if action.kind == ActionType.ATTACK:
+                label = f"<aggresive>Attack</aggresive> {action.damage}{f'x{action.hits}' if action.hits > 1 else ''}"
+            else:
+                label = self.LABELS.get(action.kind)
+            if label is not None and label not in labels:
+                labels.append(label)
+        return " / ".join(labels)
 
-class Enemy(Registerable):
+    def __repr__(self):
+        return f"Intent({self.name!r}, {list(self.actions)!r})"
+
+
+class Enemy(Hashed, Registerable):
     registers = [Message.START_OF_TURN, Message.END_OF_TURN, Message.ON_DEATH_OR_ESCAPE]
-    player = None
+    player = None  # The player this enemy is fighting. Set by Combat when the fight starts.
+    moves: "MoveTable | None" = None  # How the enemy picks its moves. Enemies without one override choose_move() instead.
+    # What the enemy's state_hash is made of, besides its effects
+    health = Tracked()
+    max_health = Tracked()
+    block = Tracked()
+    state = Tracked()
 
     def __init__(self, health_range: list, block: int, name: str, powers: list[Effect] | None = None):
         self.uid = uuid4()
         if not powers:
             powers = []
-        actual_health = random.randint(health_range[0], health_range[1])
+        actual_health = stream(Stream.COMBAT).randint(health_range[0], health_range[1])
         self.health = actual_health
         self.max_health = actual_health
         self.block = block
@@ -40,12 +156,12 @@ class Enemy(Registerable):
         self.third_person_ref = (
             f"{self.name}'s"  # Python f-strings suck so I have to use this
         )
-        self.past_moves = ["place"] * 3
-        self.intent: str = ""
+        self.move_history = MoveHistory(["place"] * 3)
+        self.intent = Intent()
         self.next_move: list[tuple[str, str, tuple] | tuple[str, tuple]] = ""
         self.state = State.ALIVE
-        self.buffs = powers
-        self.debuffs = []
+        self.buffs = EffectContainer(powers, owner=self)
+        self.debuffs = EffectContainer(owner=self)
         self.stolen_gold = 0
         self.awake_turns = 0
         self.mode = ""
@@ -56,76 +172,82 @@ class Enemy(Registerable):
     def __str__(self):
         return "Enemy"
 
+    @property
+    def past_moves(self) -> MoveHistory:
+        '''The moves the enemy has made, most recent last. Assigning a list of moves replaces the history.'''
+        return self.move_history
+
+    @past_moves.setter
+    def past_moves(self, moves):
+        self.move_history = MoveHistory(moves)
+
     def __repr__(self):
         status = f"{self.name} (<red>{self.health} </red>/ <red>{self.max_health}</red> | <light-blue>{self.block} Block</light-blue>)"
         for effect in self.buffs + self.debuffs:
             status += " | " + effect.get_name()
         if self.flames > 0:
             status += f" | <yellow>{self.flames} Flames</yellow>"
-        status += " | Intent: " + self.intent.replace('Σ', '')
+        status += " | Intent: " + self.intent.pretty_print()
         return status
 
+    def snapshot_objects(self):
+        return [self, *self.buffs, *self.debuffs]
+
     def set_intent(self):
-        pass
+        '''Picks the enemy's next move and works out its intent.'''
+        if self.moves is not None:
+            self.next_move = self.moves.pick(self).next_move(self)
+        else:
+            self.choose_move()
+        self.intent = Intent.from_next_move(self.next_move)
+
+    def choose_move(self):
+        '''Sets next_move, for enemies without a move table.'''
+
+    def intent_probabilities(self) -> dict[str, float] | None:
+        '''The chance of each move being picked the next time set_intent() is called, or None for enemies without a move table.'''
+        return self.moves.distribution(self) if self.moves is not None else None
 
     def execute_move(self, player: Player, enemies: list["Enemy"]):
-        moves = 1
-        display_name = "DEFAULT: UNKNOWN"
-        for action in self.next_move:
-            if moves == 1 and len(action) > 2:
-                display_name, action, parameters = action
-            else:
-                action, parameters = action
-            if action not in ("Attack", "Buff", "Debuff", "Remove Effect", "Status", "Block"):
+        if self.bus is None:
+            # Not registered with a combat yet, so act on the player's game
+            self.bus = player.bus
+        intent = self.intent
+        for i, action in enumerate(intent.actions):
+            if action.kind == ActionType.SPECIAL:
                 self.misc_move(enemies)
                 sleep(1)
                 view.clear()
                 return
-            ansiprint(f"<bold>{display_name}</bold>\n" if moves == 1 else "", end="")
+            if i == 0:
+                ansiprint(f"<bold>{intent.name}</bold>")
             sleep(0.6)
-            if action == "Attack":
-                dmg = parameters[0]
-                times = parameters[1] if len(parameters) > 1 else 1
-                self.attack(dmg, times, target=player)
-            elif action == "Buff":
-                buff = parameters[0]
-                amount = parameters[1] if len(parameters) > 1 else 1
-                target = parameters[2] if len(parameters) > 2 else self
-                ei.apply_effect(target, self, buff, amount)
-            elif action == "Debuff":
-                debuff = parameters[0]
-                amount = parameters[1] if len(parameters) > 1 else 1
-                ei.apply_effect(self, self, debuff, amount)
-            elif action == "Remove Effect":
-                effect_name = parameters[0]
-                effect_type = parameters[1]
-                self.remove_effect(effect_name, effect_type)
-            elif action == "Status":
-                assert (len(parameters) >= 3), f"Status action requires 3 parameters: given {parameters}"
-                status = parameters[0]
-                amount = parameters[1]
-                location = parameters[2].lower()
-                self.status(status, amount, location, player=player)
-            elif action == "Block":
-                block = parameters[0]
-                target = parameters[1] if len(parameters) > 1 else None
-                self.blocking(block, target)
+            if action.kind == ActionType.ATTACK:
+                self.attack(action.damage, action.hits, target=player)
+            elif action.kind == ActionType.BUFF:
+                ei.apply_effect(action.recipient or self, self, action.effect, action.amount)
+            elif action.kind == ActionType.DEBUFF:
+                ei.apply_effect(player, self, action.effect, action.amount)
+            elif action.kind == ActionType.REMOVE_EFFECT:
+                self.remove_effect(action.effect, action.location)
+            elif action.kind == ActionType.STATUS:
+                self.status(action.effect, action.amount, action.location, player=player)
+            elif action.kind == ActionType.BLOCK:
+                self.blocking(action.amount, action.recipient)
             sleep(0.2)
-            moves += 1
+        display_name = intent.name or "DEFAULT: UNKNOWN"
         if display_name == "Inferno" and self.flames > -1:
             self.upgrade_burn = True
             self.flames = 0
         sleep(0.5)
-        self.past_moves.append(display_name)
+        self.move_history.append(display_name)
         self.active_turns += 1
         if self.flames > -1:
             self.flames += 1
 
     def misc_move(self, enemies):
-        if len(self.next_move[0]) > 2:
-            name, func_name, parameters = self.next_move[0]
-        else:
-            name, func_name = self.next_move[0]
+        name = self.intent.name
+        func_name, parameters = self.intent.actions[0].special, self.intent.actions[0].parameters
         ansiprint(f"<bold>{name}</bold>")
         sleep(0.6)
         if func_name == "Cowardly":
@@ -146,12 +268,10 @@ class Enemy(Registerable):
             pass
         elif func_name == "Rebirth":
             for debuff in self.debuffs:
-                if debuff not in ei.NON_STACKING_EFFECTS:
-                    self.debuffs[debuff] = 0
-                else:
-                    self.debuffs[debuff] = False
-            self.buffs["Curiosity"] = False
-            self.buffs["Unawakened"] = False
+                debuff.amount = 0
+            self.debuffs.prune()
+            for buff in ("Curiosity", "Unawakened"):
+                self.remove_effect(buff, "Buffs")
         elif func_name == "Revive":
             self.health = math.floor(self.health * 0.5)
             ansiprint(f"<bold>{self.name}</bold> revived!")
@@ -182,7 +302,7 @@ class Enemy(Registerable):
         """
         Dies.
         """
-        print(f"{self.name} has died.")
+        echo(f"{self.name} has died.")
         self.state = State.DEAD
 
     def debuff_and_buff_check(self):
@@ -190,10 +310,14 @@ class Enemy(Registerable):
         Not finished
         """
 
+    def last_move_repeats(self, limit: int) -> tuple[str, int]:
+        '''The last move and how many times in a row it was used, counting no further than [limit].'''
+        history = self.move_history
+        return history.last, min(history.repeats, limit)
+
     def move_spam_check(self, target_move, max_count) -> bool:
         """Returns False if the move occurs [max_count] times in a row. Otherwise returns True"""
-        enough_moves = len(self.past_moves) >= max_count
-        return not(enough_moves and all(move == target_move for move in self.past_moves[-max_count:]))
+        return not self.move_history.repeated(target_move, max_count)
 
     def attack(self, dmg: int, times: int, target: Player):
         for _ in range(times):
@@ -201,7 +325,7 @@ class Enemy(Registerable):
                 ansiprint(f"{self.name} stopped attacking: {target.name} is already dead.")
                 return
             modifiable_dmg = Damage(dmg)
-            bus.publish(Message.BEFORE_ATTACK, (self, target, modifiable_dmg))  # allows for damage modification from relics/effects
+            self.bus.publish(Message.BEFORE_ATTACK, (self, target, modifiable_dmg))  # allows for damage modification from relics/effects
             dmg = modifiable_dmg.damage
             if dmg <= target.block:
                 target.block -= dmg
@@ -213,18 +337,15 @@ class Enemy(Registerable):
                 ansiprint(f"{self.name} dealt {dmg}(<light-blue>{target.block} Blocked</light-blue>) damage to you.")
                 target.block = 0
                 target.health -= dmg
-                bus.publish(Message.ON_PLAYER_HEALTH_LOSS, None)
-            bus.publish(Message.AFTER_ATTACK, (self, target, dmg))
+                self.bus.publish(Message.ON_PLAYER_HEALTH_LOSS, None)
+            self.bus.publish(Message.AFTER_ATTACK, (self, target, dmg))
         sleep(1)
 
     def remove_effect(self, effect_name, effect_type):
-        if effect_name not in ei.ALL_EFFECTS:
-            raise ValueError(f"{effect_name} is not a member of any debuff or buff list.")
         effect_types = {"Buffs": self.buffs, "Debuffs": self.debuffs}
-        if effect_name not in ei.NON_STACKING_EFFECTS:
-            effect_types[effect_type][effect_name] = 0
-        else:
-            effect_types[effect_type][effect_name] = False
+        effect = effect_types[effect_type].remove(effect_name)
+        if effect is not None:
+            effect.unsubscribe()
 
     def blocking(self, block: int, target: "Enemy" = None, context: str=None):
         if not target:
@@ -246,7 +367,7 @@ class Enemy(Registerable):
         status_card = status_card()
         for _ in range(amount):
             upper_bound = len(location) - 1 if len(location) > 0 else 1
-            insert_index = random.randint(0, upper_bound)
+            insert_index = stream(Stream.SHUFFLE).randint(0, upper_bound)
             pile.insert(insert_index, deepcopy(status_card))
         ansiprint(f"{player.name} gained {amount} {status_card.name} \nPlaced into {location}")
         sleep(1)
@@ -255,23 +376,22 @@ class Enemy(Registerable):
         if len(enemy) == 1:
             enemy = enemy[0]
         for _ in range(amount):
-            chosen_enemy = random.choice(enemy) if random_enemy else enemy
+            chosen_enemy = stream(Stream.COMBAT).choice(enemy) if random_enemy else enemy
             enemies.append(chosen_enemy)
             ansiprint(f"<bold>{chosen_enemy.name}</bold> summoned!")
 
     def callback(self, message, data):
-        global bus
         if message == Message.START_OF_TURN:
             ansiprint(f"{self.name}'s current state: {self.state}")
             if self.state == State.ALIVE:
                 for effect in self.buffs + self.debuffs:
                     if effect.subscribed is False:
-                        effect.register(bus)
+                        effect.register(self.bus)
                 ansiprint(f"<underline><bold>{self.name}</bold></underline>:")
-                if "Block" not in self.intent:  # Checks the last move(its intent hasn't been updated yet) used to see if the enemy Blocked last turn
+                if not self.intent.blocks:  # Checks the last move(its intent hasn't been updated yet) used to see if the enemy Blocked last turn
                     self.block = 0
                 ei.tick_effects(self)
-                print()
+                echo()
                 self.set_intent()
         elif message == Message.END_OF_TURN:
             player, enemies = data
@@ -279,7 +399,7 @@ class Enemy(Registerable):
                 self.execute_move(player, enemies)
             # Needs to be expanded at some point
         elif message == Message.ON_DEATH_OR_ESCAPE:
-            event, bus = data
+            event, death_bus = data
             for effect in self.buffs + self.debuffs:
                 effect.unsubscribe()
-            bus.death_messages.append(event)
+            death_bus.death_messages.append(event)
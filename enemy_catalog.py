@@ -1,373 +1,290 @@
 import math
-import random
 
 import effect_catalog
 import card_catalog
+import move_table
 from enemy import Enemy
+import rng
+
+# Conditions for move tables
+def below_half_health(enemy):
+    return enemy.health < math.floor(enemy.max_health * 0.5)
+
+def above_half_health(enemy):
+    return not below_half_health(enemy)
+
+def first_turn(enemy):
+    return enemy.active_turns == 1
+
+def after_first_turn(enemy):
+    return enemy.active_turns > 1
+
+def after(move_name):
+    '''A condition that holds when the enemy's last move was [move_name].'''
+    def condition(enemy):
+        return enemy.move_history.last == move_name
+    return condition
+
+def bite(enemy):
+    return [("Attack", (enemy.damage,))]
 
 
 class AcidSlimeL(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Split", 1, [("Split",)], when=below_half_health),
+        move_table.Move("Corrosive Spit", 0.3, [("Attack", (11,)), ("Status", (card_catalog.Slimed, 2, "discard pile"))], max_repeat=3, when=above_half_health),
+        move_table.Move("Tackle", 0.4, [("Attack", (16,))], max_repeat=2, when=above_half_health),
+        move_table.Move("Lick", 0.3, [("Debuff", (effect_catalog.Weak, 2))], max_repeat=2, when=above_half_health),
+    ])
+
     def __init__(self, ):
         super().__init__([65, 69], 0, 'Acid Slime (L)', [effect_catalog.Split(self, 1)])
 
-    def set_intent(self):
-        move_roll = random.random()
-        while True:
-            if self.health < math.floor(self.max_health * 0.5):
-                self.next_move, self.intent = [("Split", "Split")], "<yellow>Unknown</yellow>"
-            elif move_roll <= 0.3 and self.move_spam_check("Corrosive Spit", 3):
-                self.next_move, self.intent = [("Corrosive Spit", "Attack", (11,)), ("Status", (card_catalog.Slimed, 2, "discard pile"))], "<aggresive>Attack</aggresive> Σ11 / <debuff>Debuff</debuff>"
-                                            # Attack("Corrosive Spit", 11),
-            elif 0.3 < move_roll < 0.7 and self.move_spam_check("Tackle", 2):
-                self.next_move, self.intent = [("Tackle", "Attack", (16,))], "<aggresive>Attack</aggresive> Σ16"
-            elif 0.7 <= move_roll < 1 and self.move_spam_check("Lick", 2):
-                self.next_move, self.intent = [("Lick", "Debuff", (effect_catalog.Weak, 2))], "<debuff>Debuff</debuff>"
-            else:
-                continue
-            break
-
 class AcidSlimeM(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Corrosive Spit", 0.3, [("Attack", (7,)), ("Status", (card_catalog.Slimed, 1, "discard pile"))], max_repeat=3),
+        move_table.Move("Tackle", 0.4, [("Attack", (10,))], max_repeat=2),
+        move_table.Move("Lick", 0.3, [("Debuff", (effect_catalog.Weak, 1))], max_repeat=2),
+    ])
+
     def __init__(self, ):
         super().__init__([28, 32], 0, "Acid Slime (M)", )
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if move_roll <= 0.3 and self.move_spam_check("Corrosive Spit", 3):
-                self.next_move, self.intent = [("Corrosive Spit", "Attack", (7,)), ("Status", (card_catalog.Slimed, 1, "discard pile"))], "<aggresive>Attack</aggresive> Σ11 / <debuff>Debuff</debuff>"
-            elif 0.3 < move_roll < 0.7 and self.move_spam_check("Tackle", 2):
-                self.next_move, self.intent = [("Tackle", "Attack", (10,))], "<aggresive>Attack</aggresive> Σ16"
-            elif 0.7 <= move_roll < 1 and self.move_spam_check("Lick", 2):
-                self.next_move, self.intent = [("Lick", "Debuff", (effect_catalog.Weak, 1))], "<debuff>Debuff</debuff>"
-            else:
-                continue
-            break
-
 class AcidSlimeS(Enemy):
+    # A coin flip on the first turn, then it alternates
+    moves = move_table.MoveTable([
+        move_table.Move("Lick", 0.5, [("Debuff", (effect_catalog.Weak, 1))], max_repeat=1),
+        move_table.Move("Tackle", 0.5, [("Attack", (3,))], max_repeat=1),
+    ])
+
     def __init__(self, ):
         super().__init__([8, 12], 0, "Acid Slime (S)")
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if self.active_turns == 1:
-                if move_roll <= 0.5:
-                    self.next_move, self.intent = [("Lick", "Debuff", (effect_catalog.Weak, 1))], "<debuff>Debuff</debuff>"
-                else:
-                    self.next_move, self.intent = [("Tackle", "Attack", (3,))], "<aggresive>Attack</aggresive> Σ3"
-            else:
-                if self.past_moves[-1] == 'Lick':
-                    self.next_move, self.intent = [("Tackle", "Attack", (3, ))], "<aggresive>Attack</aggresive> Σ3"
-                else:
-                    self.next_move, self.intent = [("Lick", "Debuff", (effect_catalog.Weak, 1))], "<debuff>Debuff</debuff>"
-            break
-
 class SpikeSlimeL(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Split", 1, [("Split",)], when=below_half_health),
+        move_table.Move("Flame Tackle", 0.3, [("Attack", (16,)), ("Status", (card_catalog.Slimed, 2, "discard pile"))], max_repeat=3, when=above_half_health),
+        move_table.Move("Lick", 0.7, [("Debuff", (effect_catalog.Frail, 2))], max_repeat=3, when=above_half_health),
+    ])
+
     def __init__(self, ):
         super().__init__([64, 70], 0, "Spike Slime (L)", [effect_catalog.Split(self, 1)])
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if self.health < math.floor(self.max_health * 0.5):
-                self.next_move, self.intent = [("Split", "Split")], "<yellow>Unknown</yellow>"
-            elif move_roll <= 0.3 and self.move_spam_check("Flame Tackle", 3):
-                self.next_move, self.intent = [("Flame Tackle", "Attack", (16,)), ("Status", (card_catalog.Slimed, 2, "discard pile"))], "<aggresive>Attack</aggresive> Σ16 / <debuff>Debuff</debuff>"
-            elif move_roll < 0.3 and self.move_spam_check("Lick", 3):
-                self.next_move, self.intent = [("Lick", "Debuff", (effect_catalog.Frail, 2))], "<debuff>Debuff</debuff>"
-            else:
-                continue
-            break
-
 class SpikeSlimeM(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Flame Tackle", 0.3, [("Attack", (16,)), ("Status", (card_catalog.Slimed, 2, "discard pile"))], max_repeat=3),
+        move_table.Move("Lick", 0.7, [("Debuff", (effect_catalog.Frail, 2))], max_repeat=3),
+    ])
+
     def __init__(self, ):
         super().__init__([28, 32], 0, "Spike Slime (M)")
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if move_roll <= 0.3 and self.move_spam_check("Flame Tackle", 3):
-                self.next_move, self.intent = [("Flame Tackle", "Attack", (16,)), ("Status", (card_catalog.Slimed, 2, "discard pile"))], "<aggresive>Attack</aggresive> Σ16 / <debuff>Debuff</debuff>"
-            elif move_roll < 0.3 and self.move_spam_check("Lick", 3):
-                self.next_move, self.intent = [("Lick", "Debuff", (effect_catalog.Frail, 2))], "<debuff>Debuff</debuff>"
-            else:
-                continue
-            break
-
 class SpikeSlimeS(Enemy):
     def __init__(self, ):
         super().__init__([10, 14], 0, "Spike Slime (S)", )
 
-    def set_intent(self):
-        self.next_move, self.intent = [("Tackle", "Attack", (5, ))], "<aggresive>Attack</aggresive> Σ5"
+    def choose_move(self):
+        self.next_move = [("Tackle", "Attack", (5, ))]
 
 class Cultist(Enemy):
     def __init__(self, ):
         super().__init__([48, 54], 0, "Cultist", )
 
-    def set_intent(self):
+    def choose_move(self):
         if self.active_turns == 1:
-            self.next_move, self.intent = [("Incantation", "Buff", (effect_catalog.Ritual, 3))], "<buff>Buff</buff>"
+            self.next_move = [("Incantation", "Buff", (effect_catalog.Ritual, 3))]
         else:
-            self.next_move, self.intent = [("Dark Strike", "Attack", (6, ))], "<aggresive>Attack</aggresive> Σ6"
+            self.next_move = [("Dark Strike", "Attack", (6, ))]
 
 class JawWorm(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Chomp", 1, [("Attack", (11,))], when=first_turn),
+        move_table.Move("Bellow", 0.45, [("Buff", (effect_catalog.Strength, 3)), ("Block", (6,))], max_repeat=2, when=after_first_turn),
+        move_table.Move("Thrash", 0.3, [("Attack", (7,)), ("Block", (5,))], max_repeat=3, when=after_first_turn),
+        move_table.Move("Chomp", 0.25, [("Attack", (11,))], max_repeat=2, when=after_first_turn),
+    ])
+
     def __init__(self, ):
         super().__init__([40, 44], 0, "Jaw Worm", )
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if self.active_turns == 1:
-                self.next_move, self.intent = [("Chomp", "Attack", (11,))], "<aggresive>Attack</aggresive> 11"
-            elif self.active_turns > 1:
-                if move_roll <= 0.45 and self.move_spam_check("Bellow", 2):
-                    self.next_move, self.intent = [("Bellow", "Buff", (effect_catalog.Strength, 3)), ("Block", (6,))], "<buff>Buff</buff> / <light-blue>Block</light-blue>"
-                elif 0.45 < move_roll <= 0.75 and self.move_spam_check("Thrash", 3):
-                    self.next_move, self.intent = [("Thrash", "Attack", (7,)), ("Block", (5,))], "<aggresive>Attack</aggresive> 7 / <light-blue>Block</light-blue>"
-                elif move_roll > 0.75 and self.move_spam_check("Chomp", 2):
-                    self.next_move, self.intent = [("Chomp", "Attack", (11,))], "<aggresive>Attack</aggresive> 11"
-            else:
-                continue
-            break
-
 class RedLouse(Enemy):
-    def __init__(self, ):
-        self.damage = random.randint(5, 7)
-        super().__init__([10, 15], 0, "Red Louse", [effect_catalog.CurlUp(self, random.randint(3, 7))])
+    moves = move_table.MoveTable([
+        move_table.Move("Grow", 0.25, [("Buff", (effect_catalog.Strength, 3))], max_repeat=3),
+        move_table.Move("Bite", 0.75, bite, max_repeat=3),
+    ])
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if move_roll <= 0.25 and self.move_spam_check("Grow", 3):
-                self.next_move, self.intent = [("Grow", "Buff", (effect_catalog.Strength, 3))], "<buff>Buff</buff>"
-            elif move_roll > 0.25 and self.move_spam_check("Bite", 3):
-                self.next_move, self.intent = [("Bite", "Attack", (self.damage,))], f"<aggresive>Attack</aggresive> {self.damage}"
-            else:
-                continue
-            break
+    def __init__(self, ):
+        self.damage = rng.stream(rng.Stream.COMBAT).randint(5, 7)
+        super().__init__([10, 15], 0, "Red Louse", [effect_catalog.CurlUp(self, rng.stream(rng.Stream.COMBAT).randint(3, 7))])
 
 class GreenLouse(Enemy):
-    def __init__(self, ):
-        self.damage = random.randint(5, 7)
-        super().__init__([11, 17], 0, "Green Louse", [effect_catalog.CurlUp(self, random.randint(3, 7))])
+    moves = move_table.MoveTable([
+        move_table.Move("Spit Web", 0.25, [("Debuff", (effect_catalog.Weak, 2))], max_repeat=3),
+        move_table.Move("Bite", 0.75, bite, max_repeat=3),
+    ])
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if move_roll <= 0.25 and self.move_spam_check("Spit Web", 3):
-                self.next_move, self.intent = [("Spit Web", "Debuff", (effect_catalog.Weak, 2))], "<debuff>Debuff</debuff>"
-            elif move_roll > 0.25 and self.move_spam_check("Bite", 3):
-                self.next_move, self.intent = [("Bite", "Attack", (self.damage,))], f"<aggresive>Attack</aggresive> {self.damage}"
-            else:
-                continue
-            break
+    def __init__(self, ):
+        self.damage = rng.stream(rng.Stream.COMBAT).randint(5, 7)
+        super().__init__([11, 17], 0, "Green Louse", [effect_catalog.CurlUp(self, rng.stream(rng.Stream.COMBAT).randint(3, 7))])
 
 class FungiBeast(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Bite", 0.6, [("Attack", (6,))], max_repeat=3),
+        move_table.Move("Grow", 0.4, [("Buff", (effect_catalog.Strength, 3))], max_repeat=2),
+    ])
+
     def __init__(self, ):
         super().__init__([22, 28], 0, "Fungi Beast", [effect_catalog.SporeCloud(self, 2)])
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if move_roll <= 0.6 and self.move_spam_check("Bite", 3):
-                self.next_move, self.intent = [("Bite", "Attack", (6, ))], "<aggresive>Attack</aggresive> 6"
-            elif move_roll > 0.6 and self.move_spam_check("Grow", 2):
-                self.next_move, self.intent = [("Grow", "Buff", (effect_catalog.Strength, 3))], "<buff>Buff</buff>"
-            else:
-                continue
-            break
-
 class FatGremlin(Enemy): # Fatass
     def __init__(self, ):
         super().__init__([13, 17], 0, "Fat Gremlin")
 
-    def set_intent(self):
-        self.next_move, self.intent = [("Smash", "Attack", (4,)), ("Debuff", (effect_catalog.Weak, 1))], "<aggresive>Attack</aggresive> 4 / <debuff>Debuff</debuff>"
+    def choose_move(self):
+        self.next_move = [("Smash", "Attack", (4,)), ("Debuff", (effect_catalog.Weak, 1))]
 
 class MadGremlin(Enemy):
     def __init__(self, ):
         super().__init__([20, 24], 0, "Mad Gremlin", [effect_catalog.Angry(self, 1)])
 
-    def set_intent(self):
-        self.next_move, self.intent = [("Scratch", "Attack", (4,))], "<aggresive>Attack</aggresive> 4"
+    def choose_move(self):
+        self.next_move = [("Scratch", "Attack", (4,))]
 
 class ShieldGremlin(Enemy):
     def __init__(self, enemies):
         super().__init__([12, 15], 0, "Shield Gremlin")
         self.enemies = enemies
 
-    def set_intent(self):
+    def choose_move(self):
         other_gremlins = [enemy for enemy in self.enemies if "Gremlin" in enemy.name and "Shield" not in enemy.name]
-        move_roll = random.random()
+        move_roll = rng.enemy_stream(self).random()
         if len(other_gremlins) > 0:
-            self.next_move, self.intent = [("Protect", "Block", (7, random.choice(other_gremlins)))], "<light-blue>Block</light-blue>"
+            self.next_move = [("Protect", "Block", (7, rng.enemy_stream(self).choice(other_gremlins)))]
         else:
             # These stats are made up since the wiki(https://slay-the-spire.fandom.com/wiki/Gremlins) is unclear
             if move_roll <= 0.75:
-                self.next_move, self.intent = [("Shield Bash", "Attack", (6,))], "<aggresive>Attack</aggresive> 6"
+                self.next_move = [("Shield Bash", "Attack", (6,))]
             else:
-                self.next_move, self.intent = [("Protect", "Block", (6,))], "<light-blue>Block</light-blue>"
+                self.next_move = [("Protect", "Block", (6,))]
 
 class SneakyGremlin(Enemy):
     def __init__(self, ):
         super().__init__([10, 14], 0, "Sneaky Gremlin", )
 
-    def set_intent(self):
-        self.next_move, self.intent = [("Puncture", "Attack", (9,))], "<aggresive>Attack</aggresive> 9"
+    def choose_move(self):
+        self.next_move = [("Puncture", "Attack", (9,))]
 
 class WizardGremlin(Enemy):
     def __init__(self, ):
         super().__init__([23, 25], 0, "Gremlin Wizard", )
 
-    def set_intent(self):
+    def choose_move(self):
         attack_indices = [2 + 4 * x for x in range(50)]
         if self.active_turns - 1 in attack_indices:
-            self.next_move, self.intent = [("Ultimate Blast", "Attack", (25,))], "<aggresive>Attack</aggresive> 25"
+            self.next_move = [("Ultimate Blast", "Attack", (25,))]
         else:
-            self.next_move, self.intent = [("Charging.", ("Charging",))], "<yellow>Charging</yellow>"
+            self.next_move = [("Charging", "Charging", ("Charging...",))]
 
 class Looter(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Mug", 1, [("Attack", (10,))], when=lambda enemy: enemy.active_turns in (1, 2)),
+        move_table.Move("Lunge", 0.5, [("Attack", (12,))], when=lambda enemy: enemy.active_turns == 3),
+        move_table.Move("Smoke Bomb", 0.5, [("Block", (6,))], when=lambda enemy: enemy.active_turns == 3),
+        move_table.Move("Smoke Bomb", 1, [("Block", (6,))], when=after("Lunge")),
+        move_table.Move("Escape", 1, [("Escape",)], when=after("Smoke Bomb")),
+    ])
+
     def __init__(self, ):
         self.escaped = False
         super().__init__([44, 48], 0, "Looter", [effect_catalog.Thievery(self,15)])
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if self.active_turns in (1, 2):
-                self.next_move, self.intent = [("Mug", "Attack", (10,))], "<aggresive>Attack</aggresive> 10"
-            elif self.active_turns == 3:
-                if move_roll <= 0.5:
-                    self.next_move, self.intent = [("Lunge", "Attack", (12,))], "<aggresive>Attack</aggresive> 12"
-                else:
-                    self.next_move, self.intent = [("Smoke Bomb", "Block", (6,))], "<light-blue>Block</light-blue>"
-            elif self.active_turns > 3:
-                if self.past_moves[-1] == 'Lunge':
-                    self.next_move, self.intent = [("Smoke Bomb", "Block", (6,))], "<light-blue>Block</light-blue>"
-                elif self.past_moves[-1] == 'Smoke Bomb':
-                    self.next_move, self.intent = [("Escape", "Escape")], "<red>Escape</red>"
-            else:
-                continue
-            break
-
 class Mugger(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Mug", 1, [("Attack", (10,))], when=lambda enemy: enemy.active_turns in (1, 2)),
+        move_table.Move("Lunge", 0.5, [("Attack", (16,))], when=lambda enemy: enemy.active_turns == 3),
+        move_table.Move("Smoke Bomb", 0.5, [("Block", (11,))], when=lambda enemy: enemy.active_turns == 3),
+        move_table.Move("Smoke Bomb", 1, [("Block", (11,))], when=after("Lunge")),
+        move_table.Move("Escape", 1, [("Escape",)], when=after("Smoke Bomb")),
+    ])
+
     def __init__(self, ):
         self.escaped = False
         super().__init__([44, 48], 0, "Looter", [effect_catalog.Thievery(self,15)])
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if self.active_turns in (1, 2):
-                self.next_move, self.intent = [("Mug", "Attack", (10,))], "<aggresive>Attack</aggresive> 10"
-            elif self.active_turns == 3:
-                if move_roll <= 0.5:
-                    self.next_move, self.intent = [("Lunge", "Attack", (16,))], "<aggresive>Attack</aggresive> 16"
-                else:
-                    self.next_move, self.intent = [("Smoke Bomb", "Block", (11,))], "<light-blue>Block</light-blue>"
-            elif self.active_turns > 3:
-                if self.past_moves[-1] == 'Lunge':
-                    self.next_move, self.intent = [("Smoke Bomb", "Block", (11,))], "<light-blue>Block</light-blue>"
-                elif self.past_moves[-1] == 'Smoke Bomb':
-                    self.next_move, self.intent = [("Escape", "Escape")], "<red>Escape</red>"
-            else:
-                continue
-            break
-
 class BlueSlaver(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Stab", 0.6, [("Attack", (12,))], max_repeat=3),
+        move_table.Move("Rake", 0.4, [("Attack", (7,)), ("Debuff", (effect_catalog.Weak, 1))], max_repeat=3),
+    ])
+
     def __init__(self, ):
         super().__init__([46, 50], 0, "Blue Slaver", )
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if move_roll <= 0.6 and self.move_spam_check("Stab", 3):
-                self.next_move, self.intent = [("Stab", "Attack", (12,))], "<aggresive>Attack</aggresive> 12"
-            elif move_roll > 0.6 and self.move_spam_check("Rake", 3):
-                self.next_move, self.intent = [("Rake", "Attack", (7,)), ("Debuff", (effect_catalog.Weak, 1))], "<aggresive>Attack</aggresive> 7 / <debuff>Debuff</debuff>"
-            else:
-                continue
-            break
+def red_slaver_scrapes(enemy):
+    '''Before it Entangles, the Red Slaver goes Scrape, Scrape, Stab.'''
+    return (enemy.active_turns - 1) % 3 != 2
+
+def has_entangled(enemy):
+    return "Entangle" in enemy.move_history
 
 class RedSlaver(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Stab", 1, [("Attack", (13,))], when=first_turn),
+        move_table.Move("Entangle", 0.25, [("Debuff", (effect_catalog.Entangled, 1))],
+                      when=lambda enemy: after_first_turn(enemy) and not has_entangled(enemy)),
+        move_table.Move("Scrape", 0.75, [("Attack", (8,)), ("Debuff", (effect_catalog.Vulnerable, 1))],
+                      when=lambda enemy: after_first_turn(enemy) and not has_entangled(enemy) and red_slaver_scrapes(enemy)),
+        move_table.Move("Stab", 0.75, [("Attack", (13,))],
+                      when=lambda enemy: after_first_turn(enemy) and not has_entangled(enemy) and not red_slaver_scrapes(enemy)),
+        move_table.Move("Scrape", 0.55, [("Attack", (8,)), ("Debuff", (effect_catalog.Vulnerable, 1))], max_repeat=3, when=has_entangled),
+        move_table.Move("Stab", 0.45, [("Attack", (13,))], max_repeat=3, when=has_entangled),
+    ])
+
     def __init__(self, ):
         super().__init__([46, 50], 0, "Red Slaver", )
 
-    def set_intent(self):
-        scrape_pattern = [i + (i // 2) for i in range(1, 50 + 1)]
-        stab_pattern = [i * 3 for i in range(1, 50)]
-        while True:
-            move_roll = random.random()
-            if self.active_turns == 1:
-                self.next_move, self.intent = [("Stab", "Attack", (13,))], "<aggresive>Attack</aggresive> 13"
-            elif self.active_turns > 1 and "Entangled" not in self.past_moves:
-                if move_roll <= 0.75:
-                    if self.active_turns - 1 in scrape_pattern:
-                        self.next_move, self.intent = [("Scrape", "Attack", (8,)), ("Debuff", (effect_catalog.Vulnerable, 1))], "<aggresive>Attack</aggresive> 8 / <debuff>Debuff</debuff>"
-                    elif self.active_turns - 1 in stab_pattern:
-                        self.next_move, self.intent = [("Stab", "Attack", (13,))], "<aggresive>Attack</aggresive> 13"
-                else:
-                    self.next_move, self.intent = [("Entangle", "Debuff", ("Entangled", 1))], "<debuff>Debuff</debuff>"
-            elif "Entangled" in self.past_moves:
-                if move_roll <= 0.55 and self.move_spam_check("Scrape", 3):
-                    self.next_move, self.intent = [("Scrape", "Attack", (8,)), ("Debuff", (effect_catalog.Vulnerable, 1))], "<aggresive>Attack</aggresive> 8 / <debuff>Debuff</debuff>"
-                elif move_roll > 0.55 and self.move_spam_check("Stab", 3):
-                    self.next_move, self.intent = [("Stab", "Attack", (13,))], "<aggresive>Attack</aggresive> 13"
-            else:
-                continue
-            break
-
 # Elites
 class GremlinNob(Enemy):
+    moves = move_table.MoveTable([
+        move_table.Move("Bellow", 1, [("Buff", (effect_catalog.Enrage, 2))], when=first_turn),
+        move_table.Move("Skull Bash", 0.33, [("Attack", (6,)), ("Debuff", (effect_catalog.Vulnerable, 2))], when=after_first_turn),
+        move_table.Move("Rush", 0.67, [("Attack", (14,))], max_repeat=3, when=after_first_turn),
+    ])
+
     def __init__(self, ):
         super().__init__([82, 86], 0, "Gremlin Nob", )
 
-    def set_intent(self):
-        while True:
-            move_roll = random.random()
-            if self.active_turns == 1:
-                self.next_move, self.intent = [("Bellow", "Buff", (effect_catalog.Enrage, 2))], "<buff>Buff</buff>"
-            elif self.active_turns > 1:
-                if move_roll <= 0.33:
-                    self.next_move, self.intent = [("Skull Bash", "Attack", (6,)), (effect_catalog.Vulnerable, 2)], "<aggresive>Attack</aggresive> 6 / <debuff>Debuff</debuff>"
-                elif move_roll > 0.33 and self.move_spam_check("Rush", 3):
-                    self.next_move, self.intent = [("Rush", "Attack", (14,))], "<aggresive>Attack</aggresive> 14"
-            else:
-                continue
-            break
-
 class Lagavulin(Enemy):
     def __init__(self, ):
         super().__init__([109, 111], 0, "Lagavulin", [effect_catalog.Asleep(host=self, amount=3), effect_catalog.Metallicize(host=self, amount=8)])
 
-    def set_intent(self):
+    def choose_move(self):
         # if self.debuffs["Asleep"]:
-            # self.next_move, self.intent = [("Sleeping", "Sleeping", ("..."))], "<yellow>Asleep</yellow>"
+            # self.next_move = [("Sleeping", "Sleeping", ("..."))]
         # elif not self.debuffs['Asleep'] and self.health < self.max_health:
-            # self.next_move, self.intent = [("Stunned", "Stunned")], "<yellow>Stunned</yellow>" # Fix later
+            # self.next_move = [("Stunned", "Stunned")] # Fix later
         if self.active_turns % 3 == 0:
-            self.next_move, self.intent = [("Siphon Soul", "Debuff", (effect_catalog.Dexterity, -1)), ("Debuff", (effect_catalog.Strength, -1))], "<debuff>Debuff</debuff>"
+            self.next_move = [("Siphon Soul", "Debuff", (effect_catalog.Dexterity, -1)), ("Debuff", (effect_catalog.Strength, -1))]
         else:
-            self.next_move, self.intent = [("Attack", "Attack", (18,))], "<aggresive>Attack</aggresive> 18"
+            self.next_move = [("Attack", "Attack", (18,))]
 
 class Sentry(Enemy):
     def __init__(self, state = "Beam"):
         self.state = state
         super().__init__([38, 42], 0, "Sentry", [effect_catalog.Artifact(1)])
 
-    def set_intent(self):
+    def choose_move(self):
         while True:
             if self.active_turns == 1:
                 if self.state == 'Beam':
-                    self.next_move, self.intent = [("Beam", "Attack", (9,))], "<aggresive>Attack</aggresive> 9"
+                    self.next_move = [("Beam", "Attack", (9,))]
                 elif self.state == 'Bolt':
-                    self.next_move, self.intent = [("Bolt", "Status", (card_catalog.Dazed, 2, 'discard pile'))], "<debuff>Debuff</debuff>"
+                    self.next_move = [("Bolt", "Status", (card_catalog.Dazed, 2, 'discard pile'))]
             elif self.active_turns > 1:
                 if self.past_moves[-1] == 'Beam':
-                    self.next_move, self.intent = [("Bolt", "Status", (card_catalog.Dazed, 2, 'discard pile'))], "<debuff>Debuff</debuff>"
+                    self.next_move = [("Bolt", "Status", (card_catalog.Dazed, 2, 'discard pile'))]
                 else:
-                    self.next_move, self.intent = [("Beam", "Attack", (9,))], "<aggresive>Attack</aggresive> 9"
+                    self.next_move = [("Beam", "Attack", (9,))]
             else:
                 continue
             break
@@ -383,13 +300,13 @@ class SlimeBoss(Enemy):
         defaults.update(kwargs)
         super().__init__(**defaults)
 
-    def set_intent(self):
+    def choose_move(self):
         if self.active_turns in list(range(1, 50 + 1, 3)): # Goop turn
-            self.next_move, self.intent = [("Goop Spray", "Status", (card_catalog.Slimed, 3, 'discard pile'))], "<debuff>Debuff</debuff>"
+            self.next_move = [("Goop Spray", "Status", (card_catalog.Slimed, 3, 'discard pile'))]
         elif self.active_turns in list(range(2, 50 + 1, 3)): # Preparing turns
-            self.next_move, self.intent = [("Preparing", "Charging", ("Preparing."))], "<yellow>Unknown</yellow>"
+            self.next_move = [("Preparing", "Charging", ("Preparing.",))]
         elif self.active_turns in list(range(3, 50 + 1, 3)):
-            self.next_move, self.intent = [("Slam", "Attack", (35,))], "<aggresive>Attack</aggresive> 35"
+            self.next_move = [("Slam", "Attack", (35,))]
 
 class Guardian(Enemy):
     def __init__(self, ):
@@ -399,48 +316,49 @@ class Guardian(Enemy):
         self.mode_shift_base = 30
         super().__init__([240, 240], 0, "Guardian")
 
-    def set_intent(self):
+    def choose_move(self):
         if self.mode == 'Offensive':
             self.offensive_turns = 1
             if self.offensive_turns in list(range(1, 50, 4)):
-                self.next_move, self.intent = [("Charging Up", "Block", (9,))], "<light-blue>Block</light-blue>"
+                self.next_move = [("Charging Up", "Block", (9,))]
             elif self.offensive_turns in list(range(2, 50, 4)):
-                self.next_move, self.intent = [("Fierce Bash", "Attack", (32,))], "<aggresive>Attack</aggresive> Σ32"
+                self.next_move = [("Fierce Bash", "Attack", (32,))]
             elif self.offensive_turns in list(range(3, 50, 4)):
-                self.next_move, self.intent = [("Vent Steam", "Debuff", (effect_catalog.Vulnerable, 2)), ("Debuff", (effect_catalog.Weak, 2))], "<debuff>Debuff</debuff>"
+                self.next_move = [("Vent Steam", "Debuff", (effect_catalog.Vulnerable, 2)), ("Debuff", (effect_catalog.Weak, 2))]
             elif self.offensive_turns in list(range(4, 50, 4)):
-                self.next_move, self.intent = [("Whirlwind", "Attack", (5, 4))], "<aggresive>Attack</aggresive> Σ5x4"
+                self.next_move = [("Whirlwind", "Attack", (5, 4))]
         elif self.mode == 'Defensive':
             self.defensive_turns = 1
             if self.defensive_turns in list(range(1, 50, 3)):
-                self.next_move, self.intent = [("Defensive Mode", "Buff", ("Sharp Hide", 3))], "<buff>Buff</buff>"
+                self.next_move = [("Defensive Mode", "Buff", ("Sharp Hide", 3))]
             elif self.defensive_turns in list(range(2, 50, 3)):
-                self.next_move, self.intent = [("Roll Attack", "Attack", (9,))], "<aggresive>Attack</aggresive> 9"
+                self.next_move = [("Roll Attack", "Attack", (9,))]
             elif self.defensive_turns in list(range(3, 50, 3)):
                 self.mode_shift_base += 10
-                self.next_move, self.intent = [("Twin Slam", "Attack", (8, 2)), ("Remove Effect", ("Sharp Hide", "Buffs")), ("Buff", ("Mode Shift", self.mode_shift_base))], "<aggresive>Attack</aggresive> 8x2 / <buff>Buff</buff>"
+                self.next_move = [("Twin Slam", "Attack", (8, 2)), ("Remove Effect", ("Sharp Hide", "Buffs")), ("Buff", ("Mode Shift", self.mode_shift_base))]
 
 class Hexaghost(Enemy):
     def __init__(self, ):
         self.flames = 0
         self.upgrade_burn = False
-        self.divider_dmg = (self.player.health // 12) + 1
+        self.divider_dmg = 0  # Depends on the player's health, so it's worked out when Divider is chosen
         super().__init__([250, 250], 0, "Hexaghost", )
 
-    def set_intent(self):
+    def choose_move(self):
         if self.active_turns == 1:
-            self.next_move, self.intent = [("Activate", "Charging", ("..."))], "<yellow>Unknown</yellow>"
+            self.next_move = [("Activate", "Charging", ("...",))]
         elif self.active_turns == 2:
-            self.next_move, self.intent = [("Divider", "Attack", (self.divider_dmg, 6))], f"<aggresive>Attack</aggresive> Σ{self.divider_dmg}x6"
+            self.divider_dmg = (self.player.health // 12) + 1
+            self.next_move = [("Divider", "Attack", (self.divider_dmg, 6))]
         elif self.active_turns > 2:
             if self.flames in (0, 2, 5):
-                self.next_move, self.intent = [("Sear", "Attack", (6,)), ("Status", (card_catalog.Burn if not self.upgrade_burn else card_catalog.Burn, 1, "discard pile"))]
+                self.next_move = [("Sear", "Attack", (6,)), ("Status", (card_catalog.Burn if not self.upgrade_burn else card_catalog.Burn, 1, "discard pile"))]
             elif self.flames in (1, 4):
-                self.next_move, self.intent = [("Tackle", "Attack", (5, 2))], "<aggresive>Attack</aggresive> Σ5x2"
+                self.next_move = [("Tackle", "Attack", (5, 2))]
             elif self.flames == 3:
-                self.next_move, self.intent = [("Inflame", "Buff", (effect_catalog.Strength, 2)), ("Block", (12,))], "<buff>Buff</buff> / <light-blue>Block</light-blue>"
+                self.next_move = [("Inflame", "Buff", (effect_catalog.Strength, 2)), ("Block", (12,))]
             elif self.flames == 6:
-                self.next_move, self.intent = [("Inferno", "Attack", (2, 5)), ("Status", (card_catalog.Burn, 3, "discard pile"))]
+                self.next_move = [("Inferno", "Attack", (2, 5)), ("Status", (card_catalog.Burn, 3, "discard pile"))]
 
 # Act 1 Encounters
 # First 3 Encounters
@@ -449,15 +367,17 @@ def cultist():
 def jaw_worm():
     return [JawWorm()] # 25%
 def two_louses():
-    return [random.choice([RedLouse, GreenLouse])(), random.choice([RedLouse, GreenLouse])()] # 25%
+    return [rng.stream(rng.Stream.ENCOUNTERS).choice([RedLouse, GreenLouse])(), rng.stream(rng.Stream.ENCOUNTERS).choice([RedLouse, GreenLouse])()] # 25%
 def small_slimes():
-    return [random.choice([SpikeSlimeM, AcidSlimeM])(), random.choice([SpikeSlimeS, AcidSlimeS])()] # 25%
+    return [rng.stream(rng.Stream.ENCOUNTERS).choice([SpikeSlimeM, AcidSlimeM])(), rng.stream(rng.Stream.ENCOUNTERS).choice([SpikeSlimeS, AcidSlimeS])()] # 25%
 first3_encounters = [cultist, jaw_worm, two_louses, small_slimes]
 # Remaining Encounters
-def gremlin_gang(enemies):
-    return [MadGremlin(), MadGremlin(), SneakyGremlin(), SneakyGremlin(), FatGremlin(), FatGremlin(), WizardGremlin(), ShieldGremlin(enemies)]
+def gremlin_gang():
+    gang = [MadGremlin(), MadGremlin(), SneakyGremlin(), SneakyGremlin(), FatGremlin(), FatGremlin(), WizardGremlin()]
+    gang.append(ShieldGremlin(gang))  # Watches the gang it's in. Combat fights this same list.
+    return gang
 def large_slime():
-    return [random.choice([SpikeSlimeL, AcidSlimeL])()]
+    return [rng.stream(rng.Stream.ENCOUNTERS).choice([SpikeSlimeL, AcidSlimeL])()]
 def lots_of_slimes():
     return [enemy() for enemy in [SpikeSlimeS, SpikeSlimeS, SpikeSlimeS, AcidSlimeS, AcidSlimeS]]
 def blue_slaver():
@@ -465,17 +385,17 @@ def blue_slaver():
 def red_slaver():
     return [RedSlaver()]
 def three_louses():
-    return [random.choice([GreenLouse, RedLouse])() for _ in range(3)]
+    return [rng.stream(rng.Stream.ENCOUNTERS).choice([GreenLouse, RedLouse])() for _ in range(3)]
 def two_fungi_beasts():
     return [FungiBeast(), FungiBeast()]
 def exordium_thugs():
     enemy_one = [RedLouse, GreenLouse, SpikeSlimeM, AcidSlimeM]
     enemy_two = [BlueSlaver, RedSlaver, Looter, Cultist]
-    return [random.choice(enemy_one)(), random.choice(enemy_two)()]
+    return [rng.stream(rng.Stream.ENCOUNTERS).choice(enemy_one)(), rng.stream(rng.Stream.ENCOUNTERS).choice(enemy_two)()]
 def exordium_wildlife():
     enemy_one = [FungiBeast, JawWorm]
     enemy_two = [RedLouse, GreenLouse, SpikeSlimeM, AcidSlimeM]
-    return [random.choice(enemy_one)(), random.choice(enemy_two)()]
+    return [rng.stream(rng.Stream.ENCOUNTERS).choice(enemy_one)(), rng.stream(rng.Stream.ENCOUNTERS).choice(enemy_two)()]
 def looter():
     return [Looter()]
 # Elites
@@ -486,13 +406,8 @@ def sentries():
 def lagavulin():
     return [Lagavulin()]
 
-def create_act1_normal_encounters(enemies):
-    remaining_act1_encounters = [lambda: gremlin_gang(enemies), large_slime, lots_of_slimes, blue_slaver, red_slaver,
-                                three_louses, two_fungi_beasts, exordium_thugs, exordium_wildlife, looter]
-    return [random.choice(first3_encounters)() for _ in range(3)] + [random.choices(remaining_act1_encounters, weights=[6.25, 12.5, 6.35, 12.5, 6.25, 12.5, 12.5, 9.375, 9.375, 12.5], k=1)[0]() for _ in range(15)]
-
-def create_act1_elites():
-    return [random.choice([gremlin_nob, sentries, lagavulin])() for _ in range(4)]
-
-def create_act1_boss():
-    return [[random.choice([SlimeBoss(), Hexaghost(), Guardian()])]]
+remaining_act1_encounters = [gremlin_gang, large_slime, lots_of_slimes, blue_slaver, red_slaver,
+                             three_louses, two_fungi_beasts, exordium_thugs, exordium_wildlife, looter]
+remaining_act1_weights = [6.25, 12.5, 6.35, 12.5, 6.25, 12.5, 12.5, 9.375, 9.375, 12.5]
+act1_elites = [gremlin_nob, sentries, lagavulin]
+act1_bosses = [SlimeBoss, Hexaghost, Guardian]
@@ -1,5 +1,5 @@
 
-from ansi_tags import ansiprint
+from drivers import ansiprint, echo
 
 
 class Damage:
@@ -33,7 +33,7 @@ class Action:
 
     def execute(self):
         if self.executed:
-            print(f"{self.name} already executed.")
+            echo(f"{self.name} already executed.")
             return
         if self.cancelled:
             ansiprint(self.reason)
@@ -1,18 +1,16 @@
 import inspect
 import math
-import random
-from time import sleep
 from typing import Callable
 
 import card_catalog
 import displayer as view
 import generators as gen
 import items
-import potion_catalog
 import relic_catalog
-from ansi_tags import ansiprint
 from definitions import CardType, CombatTier, PlayerClass
+from drivers import ansiprint, echo, prompt, sleep
 from player import Player
+from rng import Stream, stream
 
 
 def event_Neow(player):
@@ -40,7 +38,7 @@ def event_BonfireSpirits(player):
 The spirits toss small bones and fragments unto the fire, which brilliantly erupts each time. As you approach, the spirits all turn to you, expectantly...""")
         sleep(0.8)
         ansiprint("<bold>[Offer]</bold> Recieve a reward based on the offer.")
-        input('Press enter > ')
+        prompt('Press enter > ')
         offering = view.list_input("What card do you want to offer? > ", player.deck, view.view_piles, lambda card: not card.removable, "The card you chose is not removable.")
         ansiprint("<bold>You toss an offering into the bonfire</bold>")
         if player.deck[offering].get("Rarity") == "Curse":
@@ -84,7 +82,7 @@ def event_TheDivineFountain(player):
         ansiprint("You come across <light-blue>shimmering water</light-blue> flowing endlessly from a fountain on a nearby wall.")
         sleep(0.8)
         ansiprint("<bold>[Drink]</bold> <green>Remove all <bold>Curses</bold></green> from your deck. \n<bold>[Leave]</bold> Nothing happens")
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == "drink":
             for card in player.deck:
                 if card.type == CardType.CURSE:
@@ -94,7 +92,7 @@ def event_TheDivineFountain(player):
             view.clear()
             break
         if option == 'leave':
-            print("Unsure of the nature of this water, you continue on your way, parched.")
+            echo("Unsure of the nature of this water, you continue on your way, parched.")
             sleep(1.5)
             view.clear()
             break
@@ -107,19 +105,19 @@ def event_Duplicator(player):
     while True:
         ansiprint("<bold>Duplicator</bold>\n")
         sleep(0.8)
-        print("Before you lies a dedicated altar to some ancient entity.")
+        echo("Before you lies a dedicated altar to some ancient entity.")
         sleep(0.8)
         ansiprint("<bold>[Pray]</bold> <green>Duplicate a card in your deck</green> \n<bold>[Leave]</bold> Nothing happens")
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'pray':
             duplicate = view.list_input("What card do you want to duplicate? > ", player.deck, view.view_piles)
             player.deck.append(player.deck[duplicate])
-            print("You kneel respectfully. A ghastly mirror image appears from the shrine and collides into you.")
+            echo("You kneel respectfully. A ghastly mirror image appears from the shrine and collides into you.")
             sleep(1.5)
             view.clear()
             break
         if option == 'leave':
-            print("You ignore the shrine, confident in your choice.")
+            echo("You ignore the shrine, confident in your choice.")
             sleep(1.5)
             view.clear()
             break
@@ -132,11 +130,11 @@ def event_GoldenShrine(player):
     while True:
         ansiprint("<bold>Golden Shrine</bold>")
         sleep(0.8)
-        print("Before you lies an elaborate shrine to an ancient spirit.")
+        echo("Before you lies an elaborate shrine to an ancient spirit.")
         sleep(0.8)
         ansiprint("<bold>[Pray]</bold> <green>Gain 100 gold</green> \n<bold>[Desecrate]</bold> <green>Gain 275 gold.</green> <red>Become <bold>Cursed - <keyword>Regret</keyword></bold></red> \n<bold>[Leave]</bold> Nothing happens")
         ansiprint("<curse>Regret</curse> | <yellow><keyword>Unplayable</keyword>. At the end of your turn, lose 1 HP for each card in your hand.</yellow>")
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'pray':
             player.gain_gold(100, False)
             ansiprint("As your hand touches the shrine, <yellow>gold</yellow> rains from the ceiling showering you in riches.")
@@ -154,7 +152,7 @@ As you pocket the riches, something <red>weighs heavily on you.</red>""")
             view.clear()
             break
         if option == 'leave':
-            print("You ignore the shrine.")
+            echo("You ignore the shrine.")
             sleep(1.5)
             view.clear()
             break
@@ -165,14 +163,14 @@ As you pocket the riches, something <red>weighs heavily on you.</red>""")
 
 def event_Lab(player):
     ansiprint("<bold>Lab</bold>")
-    print()
+    echo()
     sleep(1)
-    print("""You find yourself in a room filled with racks of test tubes, beakers, flasks, forceps, pinch clamps, stirring rods, tongs, goggles, funnels, pipets, cylinders, condensers, and even a rare spiral tube of glass.
+    echo("""You find yourself in a room filled with racks of test tubes, beakers, flasks, forceps, pinch clamps, stirring rods, tongs, goggles, funnels, pipets, cylinders, condensers, and even a rare spiral tube of glass.
 
 Why do you know the name of all these tools? It doesn't matter, you take a look around.""")
     ansiprint("<bold>[Search]</bold> <green>Obtain 3 random potions</green>")
-    input('Press enter > ')
-    gen.claim_potions(True, 3, player, potion_catalog.create_all_potions())
+    prompt('Press enter > ')
+    gen.claim_potions(True, 3, player)
 
 # Won't add the Match and Keep event because i just don't know how to.
 
@@ -181,10 +179,10 @@ def event_OminousForge(player: Player):
     while True:
         ansiprint("<bold>Ominous Forge</bold>")
         sleep(0.8)
-        print("You duck into a small hut. Inside, you find what appears to be a forge. The smithing tools are covered with dust, yet a fire roars inside the furnace. You feel on edge...")
+        echo("You duck into a small hut. Inside, you find what appears to be a forge. The smithing tools are covered with dust, yet a fire roars inside the furnace. You feel on edge...")
         sleep(0.8)
         ansiprint("<bold>[Forge]</bold> <green>Upgrade a Card</green> \n<bold>[Rummage]</bold> <green>Obtain Warped Tongs.</green> <red>Become <keyword>Cursed | Pain</keyword></red> \n<bold>[Leave]</bold> Nothing happens")
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'forge':
             option = view.list_input("What card do you want to upgrade? > ", player.deck, view.upgrade_preview, lambda card: not card.upgraded and (card.name == "Burn" or card.type not in (CardType.CURSE, CardType.STATUS)), "That card is not upgradeable.")
             if option is not None:
@@ -194,10 +192,10 @@ def event_OminousForge(player: Player):
             ansiprint('''You decide to see if you can find anything of use. After uncovering tarps, looking through boxes, and checking nooks and crannies, you find a dust covered <yellow>relic!</yellow>.
 
 Taking the relic, you can't shake a sudden feeling of <red>sharp pain</red> as you exit the hut. Maybe you disturbed some sort of spirit?''')
-            gen.claim_relics(False, player, 1, relic_catalog.create_all_relics(), [items.WarpedTongs()])
-            gen.card_rewards(CombatTier.NORMAL, False, player, card_catalog.create_all_cards(), [items.Pain()])
+            gen.claim_relics(False, player, 1, rewards=[items.WarpedTongs()])
+            gen.card_rewards(CombatTier.NORMAL, False, player, rewards=[items.Pain()])
             break
-    input('Press enter to continue > ')
+    prompt('Press enter to continue > ')
     sleep(1)
     view.clear()
 
@@ -209,20 +207,20 @@ def event_Purifier(player):
         ansiprint('Before you lies an elaborate shrine to a forgotten spirit.')
         sleep(0.8)
         ansiprint("<bold>[Pray]</bold> <green>Remove a card from your deck.</green> \n<bold>[Leave]</bold> Nothing happens.")
-        option = input('')
+        option = prompt('')
         if option == 'pray':
             view.view_piles(player.deck, player, False, 'Removable')
             remove_card = view.list_input('What card do you want to remove?', player.deck, view.view_piles, lambda card: card.get("Removable") is False, "That card is not removable.")
-            player.deck[remove_card] = player.card_actions(player.deck[remove_card], 'Remove', card_catalog.create_all_cards())
-            print('As you kneel in reverence, you feel a weight lifted off your shoulders.')
+            player.deck[remove_card] = player.card_actions(player.deck[remove_card], 'Remove')
+            echo('As you kneel in reverence, you feel a weight lifted off your shoulders.')
             break
         if option == 'leave':
-            print('You ignore the shrine.')
+            echo('You ignore the shrine.')
             break
         ansiprint('<red>Valid inputs: ["pray", "leave"]</red>')
         sleep(1.5)
         view.clear()
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -234,20 +232,20 @@ def event_Transmogrifier(player):
         ansiprint('Before you lies an elaborate shrine to a forgotten spirit.')
         sleep(0.8)
         ansiprint('<bold>[Pray]</bold> <green>Transform a card.</green> \n<bold>[Leave]</bold> Nothing happens.')
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'pray':
             view.view_piles(player.deck, player, False, 'Removable')
             transform_card = view.list_input('What card would you like to transform?', player.deck, view.view_piles, lambda card: card.get("Removable") is False, "That card is not transformable.")
-            player.deck[transform_card] = player.card_actions(player.deck[transform_card], 'Transform', card_catalog.create_all_cards())
-            print('As the power of the shrine flows through you, your mind feels altered.')
+            player.deck[transform_card] = player.card_actions(player.deck[transform_card], 'Transform')
+            echo('As the power of the shrine flows through you, your mind feels altered.')
             break
         if option == 'leave':
-            print('You ignore the shrine.')
+            echo('You ignore the shrine.')
             break
         ansiprint("<red>Valid inputs: ['pray'], ['leave']</red>")
         sleep(1.5)
         view.clear()
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -256,10 +254,10 @@ def event_UpgradeShrine(player: Player):
     while True:
         ansiprint('<bold>Upgrade Shrine</bold>')
         sleep(0.8)
-        print('Before you lies an elaborate shrine to a forgotten spirit.')
+        echo('Before you lies an elaborate shrine to a forgotten spirit.')
         sleep(0.8)
         ansiprint('<bold>[Pray]</bold> <green>Upgrade a card.</green> \n<bold>[Leave]</bold> Nothing happens.')
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'pray':
             view.upgrade_preview(player.deck)
             upgrade_card = view.list_input('What card do you want to upgrade?', player.deck, view.upgrade_preview, lambda card: not card.upgraded and (card.type not in (CardType.CURSE, CardType.STATUS) or card.name == 'Burn'), "That card is not upgradeable.")
@@ -267,12 +265,12 @@ def event_UpgradeShrine(player: Player):
                 player.deck[upgrade_card].upgrade()
             break
         if option == 'leave':
-            print('You ignore the shrine.')
+            echo('You ignore the shrine.')
             break
         ansiprint('<red>Valid inputs: ["pray", "leave"]</red>')
         sleep(1.5)
         view.clear()
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -290,17 +288,17 @@ A cheery disheveled fellow approaches you gleefully. You do not know this man.
 You eye him suspiciously and consider your options...""")
         sleep(0.8)
         ansiprint("<bold>[Give Potion]</bold> <red>Lose a potion.</red> <green>Recieve a relic.</green> \n<bold>[Give Gold]</bold> <red>Lose a varying amount of gold.</red> <green>Recieve a relic.</green> \n<bold>[Give Card]</bold> <red>Lose a card.</red> <green>Recieve a relic.</green> \n<bold>[Attack]</bold> Nothing happens.")
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if 'give' in option:
             relic_rewards = [relic for relic in relic_catalog.create_all_relics() if relic.get('Rarity') in ('Common', 'Uncommon', 'Rare')]
             if 'potion' in option:
                 if len(player.potions) == 0:
-                    print("You don't have any potions.")
+                    echo("You don't have any potions.")
                     sleep(1.5)
                     view.clear()
                     continue
-                remove_potion = random.choice(player.potions)
-                print(f"You lost {remove_potion.get('Name')}")
+                remove_potion = stream(Stream.EVENTS).choice(player.potions)
+                echo(f"You lost {remove_potion.get('Name')}")
                 player.potions.remove(remove_potion)
                 ansiprint("""<bold>Ranwid</bold>: "Exquisite! Was feeling parched."
 
@@ -309,29 +307,29 @@ You eye him suspiciously and consider your options...""")
 He downs the potion in one go and lets out a satisfied burp.""")
             if 'gold' in option:
                 if player.gold < 50:
-                    print("You don't have enough gold.")
+                    echo("You don't have enough gold.")
                     sleep(1.5)
                     view.clear()
                     continue
                 gold_max = min(player.gold, 150)
-                gold_loss = random.randint(50, gold_max)
+                gold_loss = stream(Stream.EVENTS).randint(50, gold_max)
                 player.gold -= gold_loss
-                print(f'You lost {gold_loss - abs(player.gold)} Gold.')
+                echo(f'You lost {gold_loss - abs(player.gold)} Gold.')
                 player.gold = max(0, player.gold)
-                print(f'You now have {player.gold} Gold.')
+                echo(f'You now have {player.gold} Gold.')
                 ansiprint('Ranwid: "Magnificent! This will be quite handy if I run into those <red>mask wearing hoodlums</red> again."')
             if 'card' in option:
                 valid_cards = [card for card in player.deck if card.get('Removable') is not False and card.get('Bottled') is not True]
-                spend_card = random.choice(valid_cards)
-                print(f"You lost {spend_card.get('Name')}")
+                spend_card = stream(Stream.EVENTS).choice(valid_cards)
+                echo(f"You lost {spend_card.get('Name')}")
                 player.deck.remove(spend_card)
-                print('<bold>Ranwid</bold>: "Exemplary! I shall study this further in my chambers."')
+                echo('<bold>Ranwid</bold>: "Exemplary! I shall study this further in my chambers."')
             sleep(0.9)
             ansiprint('''He rummages around his various pockets...
 
 <bold>Ranwid</bold>: "Here, look what I've got for you today! Take it take it!"''')
-            player.relics.append(random.choice(relic_rewards))
-            print(f'You obtained {player.relics[-1].get("Name")}.')
+            player.relics.append(stream(Stream.EVENTS).choice(relic_rewards))
+            echo(f'You obtained {player.relics[-1].get("Name")}.')
             sleep(1)
             break
         if option == 'attack':
@@ -347,34 +345,33 @@ He runs away.''')
 
 
 def event_TheWomanInBlue(player):
-    valid_potions = {potion: stats for potion, stats in potion_catalog.create_all_potions().items() if stats.get('Class') == player.player_class}
     while True:
         ansiprint('<bold>The Woman in Blue</bold>')
         sleep(0.8)
         ansiprint("""From the darkness, an arm pulls you into a small shop. As your eyes adjust, you see a pale woman in sharp clothes gesturing towards a wall of potions.
 
 <bold>Pale Woman</bold>: 'Buy a potion. <italic>Now!</italic>' she states.""")
-        print()
+        echo()
         sleep(0.8)
         ansiprint('<bold>[Buy 1 Potion]</bold> <yellow>20 Gold</yellow>. \n<bold>[Buy 2 Potions]</bold> <yellow>30 Gold</yellow>. \n<bold>[Buy 3 Potions]</bold> <yellow>40 Gold</yellow>. \n<bold>[Leave]</bold> Nothing happens.')
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if 'potion' in option:
             if '1' in option:
-                gen.claim_potions(True, 1, player, valid_potions, False)
+                gen.claim_potions(True, 1, player, chance_based=False)
                 break
             if '2' in option:
-                gen.claim_potions(True, 2, player, valid_potions, False)
+                gen.claim_potions(True, 2, player, chance_based=False)
                 break
             if '3' in option:
-                gen.claim_potions(True, 3, player, valid_potions, False)
+                gen.claim_potions(True, 3, player, chance_based=False)
                 break
-            print('Invalid potion amount.')
+            echo('Invalid potion amount.')
             sleep(1.5)
             view.clear()
     ansiprint('''<bold>Pale Woman</bold>: "Good, now leave."
 
 You exit the shop cautiously.''')
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -395,7 +392,7 @@ On closer inspection, it's not a statue but a statuesque, gaunt man. Is he even
 <bold>Eerie Man</bold>: "Face. Let me touch? Maybe trade?"''')
         sleep(0.8)
         ansiprint(f'<bold>[Touch]</bold> <green>Gain 75 gold</green>. <red>Lose {math.floor(player.max_health * 0.1)} HP</red> \n<bold>[Trade]</bold> <green>50% Good Face</green> <red>50% Bad Face</red> \n<bold>[Leave]</bold> Nothing happens.')
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'touch':
             player.gain_gold(75)
             player.take_sourceless_dmg(math.floor(player.max_health * 0.1))
@@ -412,7 +409,7 @@ During this, his mask falls off and shatters. Screaming, he quickly covers his f
 His face was completely blank.''')
             break
         if option == 'trade':
-            gen.claim_relics(False, player, 1, relic_catalog.create_all_relics(), [random.choice(face_relics)], False)
+            gen.claim_relics(False, player, 1, rewards=[stream(Stream.EVENTS).choice(face_relics)], chance_based=False)
             sleep(0.8)
             ansiprint('''<bold>Eerie Man</bold>: "For me? <italic>FOR ME?</italic> Oh yes.. Yes. Yes.. mmm..."
 
@@ -426,7 +423,7 @@ You see one of his arms flicker, <red>and your face is in its hand</red>! Your f
 This was probably the right call.''')
             break
         ansiprint('<red>Valid inputs: ["trade", "touch", "leave"]</red>')
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -438,11 +435,11 @@ def event_BigFish(player):
         ansiprint('''As you make your way down a long corridor you see a <yellow>banana</yellow>, a <yellow>donut</yellow>, and a <yellow>box</yellow> floating about. No... upon closer inspection they are tied to strings coming from holes in the ceiling. There is a quiet cackling from above as you approach the objects.
 
 What do you do?''')
-        print()
+        echo()
         sleep(0.8)
         ansiprint(f'<bold>[Banana]</bold> <green>Heal {math.floor(player.max_health / 3)} HP</green> \n<bold>[Donut]</bold> <green>Max HP +5</green> \n<bold>[Box]</bold> <green>Recieve a relic.</green> <red>Become Cursed: <bold>Regret</bold></red>')
-        ansiprint(f'<keyword>Regret</keyword> | <yellow>{card_catalog.create_all_cards()["Regret"]["Info"]}</yellow>') # curse is purple
-        option = input('> ').lower()
+        ansiprint("<curse>Regret</curse> | <yellow><keyword>Unplayable</keyword>. At the end of your turn, lose 1 HP for each card in your hand.</yellow>")
+        option = prompt('> ').lower()
         if option == 'banana':
             ansiprint('You eat the <yellow>banana</yellow>. It is nutritious and slightly <light-blue>magical</light-blue>, healing you.')
             sleep(0.5)
@@ -456,12 +453,12 @@ What do you do?''')
         if option == 'box':
             ansiprint('You grab the box. Inside you find a <yellow>relic</yellow>! \nHowever, you really craved the donut... \nYou are filled with sadness, but mostly <red>regret</red>.')
             sleep(1.3)
-            gen.claim_relics(False, player, 1, relic_catalog.create_all_relics(), None, False)
+            gen.claim_relics(False, player, 1, chance_based=False)
             player.deck.append(card_catalog.Regret())
             ansiprint(f'You obtained <magenta>Regret</magenta> | {card_catalog.Regret().info}')
         sleep(1.5)
         view.clear()
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -475,7 +472,7 @@ def event_TheCleric(player):
 "Hello friend! I am <light-blue>Cleric</light-blue>! Are you interested in my services!?" the creature shouts, loudly.''')
         sleep(0.5)
         ansiprint(f'<bold>[Heal]</bold> <red>Lose 35 Gold</red>. <green>Heal {math.floor(player.max_health * 0.25)} HP</green> \n<bold>[Purify]</bold> <red>Lose 50 Gold</red>. Remove a card from your deck. \n<bold>[Leave]</bold> Nothing happens.')
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option == 'heal':
             if player.gold < 35:
                 ansiprint("<red>You don't have enough gold.</red>")
@@ -501,7 +498,7 @@ def event_TheCleric(player):
 The creature grins.
 
 <bold>Cleric</bold>: "Cleric talented. Have a good day!"''')
-            player.deck[option] = player.card_actions(player.deck[option], "Remove", card_catalog.create_all_cards())
+            player.deck[option] = player.card_actions(player.deck[option], "Remove")
             break
         if option == 'leave':
             ansiprint("You don't trust this <light-blue>'Cleric'</light-blue>, so you leave.")
@@ -509,7 +506,7 @@ The creature grins.
         ansiprint("<red>Valid inputs: ['heal', 'purify', 'leave']</red>")
         sleep(1.5)
         view.clear()
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -521,27 +518,27 @@ def event_GoldenIdol(player):
 
 You're sure you don't see any traps nearby.\n""")
         ansiprint("<bold>[Take]</bold> <green>Obtain <bold>Golden Idol</bold>.</green> <red>Trigger a trap</red> \n<bold>[Leave]</bold> Nothing happens")
-        option = input('> ').lower()
+        option = prompt('> ').lower()
         if option.lower() not in ('take', 'leave'):
             sleep(1)
             view.clear()
             continue
         if option == 'take':
-            gen.claim_relics(False, player, 1, relic_catalog.create_all_relics(), [items.GoldenIdol], False)
+            gen.claim_relics(False, player, 1, rewards=[items.GoldenIdol], chance_based=False)
             ansiprint("""As you grab the idol and stow it away, a giant boulder smashes through the ceiling into the ground next to you.
 
 You realize that the floor is slanted downwards as the boulder starts to roll towards you.""")
             ansiprint(f"<bold>[Outrun]</bold> <red>Become <bold>Cursed</bold></red> - <keyword>Injury</keyword> \n<bold>[Smash]</bold> <red>Take {math.floor(player.max_health * 0.25)} damage</red> \n<bold>[Hide]</bold> <red>Lose {math.floor(player.max_health * 0.08)} Max HP</red>")
-            option = input('> ').lower()
+            option = prompt('> ').lower()
             if option == 'outrun':
                 ansiprint("""<italic>RUUUUUUUUUUUUUUUN!</italic>
 
 You barely leap into a side passageway as the boulder rushes by. Unfortunatly, it feels like you sprained something.""")
-                gen.card_rewards("Normal", False, player, card_catalog.create_all_cards(), [items.Injury()])
+                gen.card_rewards("Normal", False, player, rewards=[items.Injury()])
                 break
             if option == 'smash':
                 player.take_sourceless_dmg(math.floor(player.max_health * 0.25))
-                print('You throw yourself at the boulder with everything you have. When the dust clears, you can make a safe way out.')
+                echo('You throw yourself at the boulder with everything you have. When the dust clears, you can make a safe way out.')
                 break
             if option == 'hide':
                 player.health_actions(-math.floor(player.max_health * 0.08), "Max Health")
@@ -554,7 +551,7 @@ The boulder flattens you a little as it passes by, but otherwise you can get out
 
 You decide not to interfere with objects placed on pedastals.''')
             break
-    input('Press enter to leave > ')
+    prompt('Press enter to leave > ')
     sleep(1.5)
     view.clear()
 
@@ -565,9 +562,8 @@ act1_events = [event_FaceTrader, event_BigFish, event_TheCleric, event_GoldenIdo
 
 def choose_event(game_map, player) -> Callable:
     while True:
-        valid_events: list[Callable] = global_events
-        valid_events.extend(act1_events)
-        chosen_event = random.choice(valid_events)
+        valid_events: list[Callable] = global_events + act1_events
+        chosen_event = stream(Stream.EVENTS).choice(valid_events)
         if chosen_event == event_TheCleric and player.gold < 35:
             continue
         if chosen_event == event_TheWomanInBlue and player.gold < 10:
@@ -1,40 +1,73 @@
 import random
 
 import game_map
-from ansi_tags import ansiprint
 from combat import Combat
-from definitions import CombatTier, EncounterType
-from enemy import Enemy
+from definitions import CombatTier, EncounterType, State
+from drivers import Driver, ansiprint, driven, echo, get_driver
+from encounters import EncounterSchedule
 from events import choose_event
-from message_bus_tools import bus
+from message_bus_tools import Message, MessageBus, Snapshot
 from player import Player
 from rest_site import RestSite
+from rng import RNG, Stream, stream, use_rng
 from shop import Shop
 
 
 class Game:
-    def __init__(self, seed=None):
-        self.bus = bus
+    def __init__(self, seed=None, driver: Driver | None = None):
+        self.bus = MessageBus(debug=False)  # Every game gets its own bus so games in the same process don't hear each other
         self.seed = seed
+        self.driver = driver if driver is not None else get_driver()
         if self.seed is not None:
-            random.seed(self.seed)
-        self.player = Player.create_player()
-        self.game_map = game_map.create_first_map()
-        Enemy.player = self.player
+            random.seed(self.seed)  # For anything outside the game that still uses the random module, like the autoplayer
+        self.rng = RNG(self.seed)  # Every part of the game draws from its own stream. Active while the game runs.
+        with use_rng(self.rng):
+            self.player = Player.create_player(bus=self.bus)
+            self.game_map = game_map.create_first_map()
+            self.encounters = EncounterSchedule()  # Every fight in the act is picked now, but enemies are made when their fight starts
         self.current_encounter = None
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        '''Tears the run down: empties its bus, which is the only thing that keeps the run's objects tied together
+        once it's over. The player and the map can still be looked at afterwards, but the run can't go on.'''
+        self.bus.clear()
+        self.current_encounter = None
+
+    def snapshot(self) -> Snapshot:
+        '''Saves the run as it is now, including the fight in progress (if there is one). See Combat.snapshot().'''
+        objects = [self, self.encounters, *self.player.snapshot_objects()]
+        if self.current_encounter is not None:
+            objects.append(self.current_encounter)
+            for enemy in self.current_encounter.all_enemies:
+                objects += enemy.snapshot_objects()
+        return Snapshot(objects, self.bus, self.rng)
+
+    def restore(self, snapshot: Snapshot):
+        snapshot.restore()
+
+    @driven
     def start(self):
-        self.game_map.pretty_print()
-        for encounter in self.game_map:
-            self.play(encounter, self.game_map)
-            self.player.floors += 1
+        with use_rng(self.rng):
             self.game_map.pretty_print()
+            for encounter in self.game_map:
+                self.play(encounter, self.game_map)
+                self.bus.publish(Message.END_OF_FLOOR, (self.player.floors, self.player))
+                if self.player.state == State.DEAD:
+                    break
+                self.player.floors += 1
+                self.game_map.pretty_print()
 
     def play(self, encounter: game_map.Encounter, the_map: game_map.GameMap):
         if encounter.type == EncounterType.START:
             pass
         elif encounter.type == EncounterType.REST_SITE:
-            return RestSite(self.player).rest_site()
+            return RestSite(self.player, driver=self.driver).rest_site()
         elif encounter.type == EncounterType.UNKNOWN:
             return self.unknown(self.game_map)
         elif encounter.type in (EncounterType.BOSS, EncounterType.ELITE, EncounterType.NORMAL):
@@ -43,12 +76,12 @@ class Game:
                 EncounterType.ELITE: CombatTier.ELITE,
                 EncounterType.NORMAL: CombatTier.NORMAL,
             }
-            self.current_encounter = Combat(tier=mapping[encounter.type], player=self.player, game_map=self.game_map)
+            self.current_encounter = Combat(tier=mapping[encounter.type], player=self.player, game_map=self.game_map, driver=self.driver, bus=self.bus, encounters=self.encounters)
             retval = self.current_encounter.combat()
             self.current_encounter = None
             return retval
         elif encounter.type == EncounterType.SHOP:
-            return Shop(self.player).loop()
+            return Shop(self.player, driver=self.driver).loop()
         else:
             raise game_map.MapError(f"Encounter type {encounter.type} is not valid.")
 
@@ -57,7 +90,7 @@ class Game:
         normal_combat: float = 0.1
         treasure_room: float = 0.02
         merchant: float = 0.03
-        random_number = random.random()
+        random_number = stream(Stream.MAP).random()
 
         if random_number < treasure_room:
             treasure_room = 0.02
@@ -71,7 +104,7 @@ class Game:
             normal_combat = 0.1
             treasure_room += 0.02
             merchant += 0.03
-            self.current_encounter = Combat(player=self.player, tier=CombatTier.NORMAL, game_map=self.game_map)
+            self.current_encounter = Combat(player=self.player, tier=CombatTier.NORMAL, game_map=self.game_map, driver=self.driver, bus=self.bus, encounters=self.encounters)
             retval = self.current_encounter.combat()
             self.current_encounter = None
             return retval
@@ -82,8 +115,8 @@ class Game:
             chosen_event()
 
     def pretty_print(self):
-        print(f"{self.game_map.current.type}")
+        echo(f"{self.game_map.current.type}")
         if self.current_encounter:
-            print(f"Current encounter: {self.current_encounter}")
+            echo(f"Current encounter: {self.current_encounter}")
 
 
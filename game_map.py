@@ -7,6 +7,7 @@ from grandalf.graphs import Edge, Graph, Vertex
 
 from dagascii import draw
 from definitions import EncounterType
+from drivers import echo, get_driver, prompt
 
 
 class MapError(Exception):
@@ -59,7 +60,7 @@ class GameMap():
         DEBUG = False
         def debug_print(*args, **kwargs):
            if DEBUG:
-              print(*args, **kwargs)
+              echo(*args, **kwargs)
         debug_print(f"NODE: {node}")
         if edges is None:
             edges = []
@@ -76,7 +77,9 @@ class GameMap():
         return edges
 
     def pretty_print(self):
-      print()
+      if not get_driver().renders:
+        return  # Laying out the graph is slow and nobody would see it
+      echo()
       draw(self.verts,self.edges)
 
     def update_current(self, node):
@@ -86,18 +89,18 @@ class GameMap():
 
     def choice(self, choices):
       # Todo: move this to a helper function
-      print()
+      echo()
       for idx, choice in enumerate(choices):
-        print(f"{idx+1}: {choice}")
+        echo(f"{idx+1}: {choice}")
       while True:
         try:
-          choice = int(input("Choose next encounter: "))
+          choice = int(prompt("Choose next encounter: "))
           if choice in range(1, len(choices)+1):
             break
           else:
-             print(f"Choose between 1 and {len(choices)}")
+             echo(f"Choose between 1 and {len(choices)}")
         except ValueError:
-          print("Invalid choice")
+          echo("Invalid choice")
       return choices[choice-1]
 
     def __iter__(self):
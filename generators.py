@@ -1,23 +1,134 @@
 from __future__ import annotations
 
-import random
-from time import sleep
-from typing import TYPE_CHECKING
+from bisect import bisect
+from itertools import accumulate
+from typing import TYPE_CHECKING, Sequence
 
+import card_catalog
 import displayer as view
-from ansi_tags import ansiprint
+import potion_catalog
+import relic_catalog
 from definitions import (
     CardType,
     CombatTier,
     PlayerClass,
     Rarity,
 )
-from message_bus_tools import Message, bus
+from drivers import ansiprint, echo, prompt, sleep
+from message_bus_tools import Message, Potion, Relic
+from rng import Stream, stream
 
 # Generators module
 # Generates relic_pool, potions, and cards
 
-def generate_card_rewards(reward_tier: CombatTier, amount: int, entity: object, card_pool: dict) -> list[dict]:
+REWARD_RARITIES = (Rarity.COMMON, Rarity.UNCOMMON, Rarity.RARE)
+CARD_REWARD_CHANCES = {
+    CombatTier.NORMAL: (0.60, 0.37, 0.03),
+    CombatTier.ELITE: (0.5, 0.4, 0.1),
+    CombatTier.BOSS: (0, 0, 1),
+}
+POTION_REWARD_CHANCES = (0.65, 0.25, 0.1)
+RELIC_REWARD_CHANCES = {
+    "Chest": (0.49, 0.42, 0.09),
+    "Other": (0.50, 0.33, 0.17),
+}
+
+
+class WeightedPools():
+    """A few pools of items (usually common/uncommon/rare) and the chance of picking from each.
+
+    Picking a pool is one bisect into the cumulative weights. It draws exactly the same random numbers
+    as choices() followed by choice() on the rewards stream.
+    """
+    def __init__(self, pools: Sequence[Sequence], weights: Sequence[float]):
+        self.pools = pools
+        self.cumulative_weights = tuple(accumulate(weights))
+        self.total = self.cumulative_weights[-1]
+        self.last = len(pools) - 1
+
+    def sample(self):
+        rewards_rng = stream(Stream.REWARDS)
+        pool = self.pools[bisect(self.cumulative_weights, rewards_rng.random() * self.total, 0, self.last)]
+        return rewards_rng.choice(pool)
+
+
+class RelicPool():
+    """The relics a player can still find, split by rarity.
+
+    Claimed relics are taken out as the player picks them up (see sync()), rather than the pool being
+    rebuilt from every relic in the game for each reward.
+    """
+    def __init__(self, player_class: PlayerClass, relics: Sequence):
+        self.player_class = player_class
+        self.relics = relics
+        self.reset()
+
+    def reset(self):
+        self.pools = tuple(
+            [relic for relic in self.relics if relic.rarity == rarity and relic.player_class in (PlayerClass.ANY, self.player_class)]
+            for rarity in REWARD_RARITIES
+        )
+        self.claimed: set[str] = set()
+        self.synced = 0  # How many of the owner's relics have been taken out already
+
+    def sync(self, owned: list):
+        """Takes out any relics added to [owned] since the last sync."""
+        if len(owned) < self.synced:
+            # Relics were lost, so they may be findable again. Rare enough to just start over.
+            self.reset()
+        for relic in owned[self.synced:]:
+            self.claim(relic.name)
+        self.synced = len(owned)
+
+    def claim(self, name: str):
+        if name in self.claimed:
+            return
+        self.claimed.add(name)
+        for pool in self.pools:
+            pool[:] = [relic for relic in pool if relic.name != name]
+
+    def __copy__(self):
+        # Snapshots copy the pool (see message_bus_tools.save_state), so relics claimed after one are findable again once it's restored
+        new = RelicPool.__new__(RelicPool)
+        new.player_class, new.relics = self.player_class, self.relics
+        new.pools = tuple(pool.copy() for pool in self.pools)
+        new.claimed = self.claimed.copy()
+        new.synced = self.synced
+        return new
+
+
+_potion_prototypes = None
+_relic_prototypes = None
+_potion_pools: dict[PlayerClass, tuple] = {}
+_card_pools: dict[tuple, WeightedPools] = {}
+
+def potion_prototypes() -> tuple:
+    global _potion_prototypes
+    if _potion_prototypes is None:
+        _potion_prototypes = tuple(potion_catalog.create_all_potions())
+    return _potion_prototypes
+
+def relic_prototypes() -> tuple:
+    global _relic_prototypes
+    if _relic_prototypes is None:
+        _relic_prototypes = tuple(relic_catalog.create_all_relics())
+    return _relic_prototypes
+
+def split_potions(potion_pool: Sequence, player_class: PlayerClass) -> tuple:
+    return tuple(
+        tuple(potion for potion in potion_pool if potion.rarity == rarity and potion.player_class in (PlayerClass.ANY, player_class))
+        for rarity in REWARD_RARITIES
+    )
+
+def relic_pool_for(entity) -> RelicPool:
+    """The entity's own relic pool, created on first use and kept in step with its relics."""
+    if entity.relic_pool is None:
+        entity.relic_pool = RelicPool(entity.player_class, relic_prototypes())
+    entity.relic_pool.sync(entity.relics)
+    return entity.relic_pool
+
+
+def generate_card_rewards(reward_tier: CombatTier, amount: int, entity: object, card_pool: list[card_catalog.Card] | None = None) -> list[card_catalog.Card]:
     """
     Normal combat rewards:
     Rare: 3% | Uncommon: 37% | Common: 60%
@@ -27,80 +138,76 @@ def generate_card_rewards(reward_tier: CombatTier, amount: int, entity: object,
 
     Boss combat rewards:
     Rare: 100% | Uncommon: 0% | Common: 0%
+
+    Picks from the card catalog unless given a [card_pool]. The picked cards are copies, so the pool is never changed.
     """
-    common_cards = [card for card in card_pool if card.rarity == Rarity.COMMON and card.type not in (CardType.STATUS, CardType.CURSE) and card.player_class == entity.player_class]
-    uncommon_cards = [card for card in card_pool if card.rarity == Rarity.UNCOMMON and card.type not in (CardType.STATUS, CardType.CURSE) and card.player_class == entity.player_class]
-    rare_cards = [card for card in card_pool if card.rarity == Rarity.RARE and card.type not in (CardType.STATUS, CardType.CURSE) and card.player_class == entity.player_class]
-    assert len(common_cards) > 0, "Common pool is empty."
-    assert len(uncommon_cards) > 0, "Uncommon pool is empty."
-    assert len(rare_cards) > 0, "Rare pool is empty."
-
-    rarities = [common_cards, uncommon_cards, rare_cards]
-    rewards = []
-    if reward_tier == CombatTier.NORMAL:
-        chances = [0.60, 0.37, 0.03]
-    elif reward_tier == CombatTier.ELITE:
-        chances = [0.5, 0.4, 0.1]
-    elif reward_tier == CombatTier.BOSS:
-        chances = [0, 0, 1]
-    for _ in range(amount):
-        chosen_pool = random.choices(rarities, chances, k=1)[0]
-        rewards.append(random.choice(chosen_pool))
-    return rewards
+    key = (entity.player_class, reward_tier)
+    pools = _card_pools.get(key) if card_pool is None else None
+    if pools is None:
+        if card_pool is None:
+            rarities = tuple(
+                card_catalog.catalog.find(rarity=rarity, player_class=entity.player_class, exclude_types=(CardType.STATUS, CardType.CURSE))
+                for rarity in REWARD_RARITIES
+            )
+        else:
+            rarities = tuple(
+                [card for card in card_pool if card.rarity == rarity and card.type not in (CardType.STATUS, CardType.CURSE) and card.player_class == entity.player_class]
+                for rarity in REWARD_RARITIES
+            )
+        assert len(rarities[0]) > 0, "Common pool is empty."
+        assert len(rarities[1]) > 0, "Uncommon pool is empty."
+        assert len(rarities[2]) > 0, "Rare pool is empty."
+        pools = WeightedPools(rarities, CARD_REWARD_CHANCES[reward_tier])
+        if card_pool is None:
+            _card_pools[key] = pools
+    return [pools.sample().clone() for _ in range(amount)]
 
-def generate_potion_rewards(amount: int, entity: object, potion_pool: dict, chance_based=True) -> list[dict]:
+def generate_potion_rewards(amount: int, entity: object, potion_pool: list | None = None, chance_based=True) -> list[Potion]:
     """You have a 40% chance to get a potion at the end of combat.
     -10% when you get a potion.
     +10% when you don't get a potion."""
-    common_potions: list[dict] = [potion for potion in potion_pool if potion.rarity == Rarity.COMMON and (potion.player_class == PlayerClass.ANY or potion.player_class == entity.player_class)]
-    uncommon_potions: list[dict] = [potion for potion in potion_pool if potion.rarity == Rarity.UNCOMMON and (potion.player_class == PlayerClass.ANY or potion.player_class == entity.player_class)]
-    rare_potions: list[dict] = [potion for potion in potion_pool if potion.rarity == Rarity.RARE and (potion.player_class == PlayerClass.ANY or potion.player_class == entity.player_class)]
-    assert len(common_potions) > 0, "Common potions pool is empty."
-    assert len(uncommon_potions) > 0, "Uncommon potions pool is empty."
-    assert len(rare_potions) > 0, "Rare potions pool is empty."
-
-    all_potions = common_potions + uncommon_potions + rare_potions
-    rarities = [common_potions, uncommon_potions, rare_potions]
+    if potion_pool is None:
+        if entity.player_class not in _potion_pools:
+            rarities = split_potions(potion_prototypes(), entity.player_class)
+            _potion_pools[entity.player_class] = (rarities, WeightedPools(rarities, POTION_REWARD_CHANCES), sum(rarities, ()))
+        rarities, pools, all_potions = _potion_pools[entity.player_class]
+    else:
+        rarities = split_potions(potion_pool, entity.player_class)
+        pools, all_potions = WeightedPools(rarities, POTION_REWARD_CHANCES), sum(rarities, ())
+    assert len(rarities[0]) > 0, "Common potions pool is empty."
+    assert len(rarities[1]) > 0, "Uncommon potions pool is empty."
+    assert len(rarities[2]) > 0, "Rare potions pool is empty."
+
     rewards = []
     for _ in range(amount):
         if chance_based:
-            rewards.append(random.choice(random.choices(rarities, [0.65, 0.25, 0.1], k=1)[0]))
+            rewards.append(pools.sample().clone())
         else:
-            rewards.append(random.choice(all_potions))
+            rewards.append(stream(Stream.REWARDS).choice(all_potions).clone())
     return rewards
 
-def generate_relic_rewards(source: str, amount: int, entity, relic_pool: dict, chance_based=True) -> list[dict]:
-    claimed_relics = [relic.name for relic in entity.relics]
-
-    common_relics = [relic for relic in relic_pool if relic.rarity == Rarity.COMMON and relic.player_class == entity.player_class and relic not in entity.relics and relic.name not in claimed_relics]
-    uncommon_relics = [relic for relic in relic_pool if relic.rarity == Rarity.UNCOMMON and relic.player_class == entity.player_class and relic not in entity.relics and relic.name not in claimed_relics]
-    rare_relics = [relic for relic in relic_pool if relic.rarity == Rarity.RARE and relic.player_class == entity.player_class and relic not in entity.relics and relic.name not in claimed_relics]
-
-    all_relic_pool = common_relics + uncommon_relics + rare_relics
-    rarities = [common_relics, uncommon_relics, rare_relics]
+def generate_relic_rewards(source: str, amount: int, entity, relic_pool: list | None = None, chance_based=True) -> list[Relic]:
+    if relic_pool is None:
+        relics = relic_pool_for(entity)
+    else:
+        relics = RelicPool(entity.player_class, relic_pool)
+        relics.sync(entity.relics)
+    rarities = relics.pools
 
-    assert len(common_relics) > 0, "Common relics pool is empty."
-    assert len(uncommon_relics) > 0, "Uncommon relics pool is empty."
-    assert len(rare_relics) > 0, "Rare relics pool is empty."
+    assert len(rarities[0]) > 0, "Common relics pool is empty."
+    assert len(rarities[1]) > 0, "Uncommon relics pool is empty."
+    assert len(rarities[2]) > 0, "Rare relics pool is empty."
 
     rewards = []
-    if source == "Chest":
-        percent_common = 0.49
-        percent_uncommon = 0.42
-        percent_rare = 0.09
-    else:
-        percent_common = 0.50
-        percent_uncommon = 0.33
-        percent_rare = 0.17
+    pools = WeightedPools(rarities, RELIC_REWARD_CHANCES["Chest" if source == "Chest" else "Other"])
     for _ in range(amount):
         if chance_based:
-            rewards.append(random.choice(random.choices(rarities, [percent_common, percent_uncommon, percent_rare], k=1)[0]))
+            rewards.append(pools.sample().clone())
         else:
-            rewards.append(random.choice(all_relic_pool))
+            rewards.append(stream(Stream.REWARDS).choice(rarities[0] + rarities[1] + rarities[2]).clone())
     return rewards
 
-def claim_relics(choice: bool, entity: object, relic_amount: int, relic_pool: dict = None, rewards: list = None, chance_based=True):
-    relic_pool = relic_pool if relic_pool else relic_pool
+def claim_relics(choice: bool, entity: object, relic_amount: int, relic_pool: list = None, rewards: list = None, chance_based=True):
     if not rewards:
         rewards = generate_relic_rewards("Other", relic_amount, entity, relic_pool, chance_based)
     if not choice:
@@ -118,11 +225,11 @@ def claim_relics(choice: bool, entity: object, relic_amount: int, relic_pool: di
             view.clear()
             continue
         entity.relics.append(rewards[option])
-        bus.publish(Message.ON_RELIC_ADD, (rewards[option], entity))
-        print(f"{entity.name} obtained {rewards[option].name}.")
+        entity.bus.publish(Message.ON_RELIC_ADD, (rewards[option], entity))
+        echo(f"{entity.name} obtained {rewards[option].name}.")
         rewards.remove(rewards[i])
 
-def claim_potions(choice: bool, potion_amount: int, entity, potion_pool: dict, rewards=None, chance_based=True):
+def claim_potions(choice: bool, potion_amount: int, entity, potion_pool: list = None, rewards=None, chance_based=True):
     for relic in entity.relics:
         if relic.name == "Sozu":
             return
@@ -132,23 +239,23 @@ def claim_potions(choice: bool, potion_amount: int, entity, potion_pool: dict, r
         for i in range(potion_amount):
             if len(entity.potions) <= entity.max_potions:
                 entity.potions.append(rewards[i])
-                print(f"{entity.name} obtained {rewards[i].name} | {rewards[i].info}")
+                echo(f"{entity.name} obtained {rewards[i].name} | {rewards[i].info}")
                 rewards.remove(rewards[i])
         sleep(1)
         view.clear()
     while len(rewards) > 0:
-        print(f"Potion Bag: ({len(potion_pool)} / {entity.max_potions})")
+        echo(f"Potion Bag: ({len(entity.potions)} / {entity.max_potions})")
         view.view_potions(entity.potions)
-        print()
-        print("Potion reward(s):")
+        echo()
+        echo("Potion reward(s):")
         option = view.list_input("Choose a potion", rewards, lambda potion_pool, validator: view.view_potions(potion_pool, True, validator=validator))
-        if len(potion_pool) == entity.max_potions:
+        if len(entity.potions) == entity.max_potions:
             ansiprint("<red>Potion bag full!</red>")
             sleep(0.5)
-            option = input("Discard a potion?(y|n) > ")
+            option = prompt("Discard a potion?(y|n) > ")
             if option == "y":
                 option = view.list_input("Choose a potion to discard", entity.potions, view.view_potions,)
-                print(f"Discarded {entity.potions[option]['Name']}.")
+                echo(f"Discarded {entity.potions[option]['Name']}.")
                 del entity.potions[option]
                 sleep(1)
                 view.clear()
@@ -160,7 +267,7 @@ def claim_potions(choice: bool, potion_amount: int, entity, potion_pool: dict, r
         sleep(0.2)
         view.clear()
 
-def card_rewards(tier: str, choice: bool, entity, card_pool: dict, rewards=None):
+def card_rewards(tier: str, choice: bool, entity, card_pool: list[card_catalog.Card] | None = None, rewards=None):
     if not rewards:
         rewards = generate_card_rewards(tier, entity.card_reward_choices, entity, card_pool)
     while True:
@@ -172,14 +279,15 @@ def card_rewards(tier: str, choice: bool, entity, card_pool: dict, rewards=None)
                 or entity.upgrade_powers and rewards[chosen_reward].type == CardType.POWER
             )):
                 rewards[chosen_reward].upgrade()
+            entity.bus.publish(Message.ON_CARD_ADD, (entity, rewards[chosen_reward]))
             entity.deck.append(rewards[chosen_reward])
             ansiprint(f"{entity.name} obtained <bold>{rewards[chosen_reward].name}</bold>")
             rewards.clear()
             break
         for card in rewards:
-            bus.publish(Message.ON_CARD_ADD, (entity, card))
+            entity.bus.publish(Message.ON_CARD_ADD, (entity, card))
             entity.deck.append(card)
-            print(f"{entity.name} obtained {card.name}")
+            echo(f"{entity.name} obtained {card.name}")
             rewards.remove(card)
         break
     rewards.clear()
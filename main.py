@@ -2,8 +2,14 @@
 from argparse import ArgumentParser
 
 from game import Game
+from pacing import Pacing, set_pacing
 
 if __name__ == '__main__':
     args = ArgumentParser(description="Run a game of Slay the Spire")
     args.add_argument('-s', '--seed', type=int, help="Seed to use for the game", default=None)
-    Game(seed=args.parse_args().seed).start()
+    args.add_argument('--pace', type=float, default=1.0,
+                      help="Multiplies how long the game's pauses last: 1 is real time, 0.25 is four times faster, 0 skips them")
+    options = args.parse_args()
+    set_pacing(Pacing.scaled(options.pace))
+    with Game(seed=options.seed) as game:
+        game.start()
@@ -0,0 +1,197 @@
+'''Monte Carlo tree search over a fight, through CombatEnv's step API. Needs numpy.
+
+    agent = MCTS(iterations=200, seed=0)
+    env = CombatEnv()
+    env.reset(seed=0)
+    while not env.done:
+        env.step(agent.choose(env))
+    print(agent.stats())  # Simulations, seconds and simulations per second
+
+Every simulation starts from a snapshot of the real fight. It walks down the tree with UCB1, adds a node,
+plays [rollout] for up to [rollout_depth] steps, backs up the total reward and restores the snapshot.
+A fight is deterministic given its RNG, and the snapshot includes it, so every node is one exact state.
+
+With workers > 1 the search is root-parallel. Each worker process is forked with the fight as it is,
+searches with the full budget and its own seed, and the visit counts at the root are added up. This needs a
+platform that can fork.
+
+mcts_policy() plays whole games for the batch runner (python batch.py --policy mcts). MCTS picks the
+cards in fights and the autoplayer answers everything else.
+'''
+from __future__ import annotations
+
+import math
+import multiprocessing
+import random
+import time
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from combat_env import END_TURN, MAX_ENEMIES, CombatEnv
+from definitions import State
+from policies import Responder, autoplayer
+
+if TYPE_CHECKING:
+    from game import Game
+
+Rollout = Callable[[CombatEnv, random.Random], int]
+
+
+def random_rollout(env: CombatEnv, rng: random.Random) -> int:
+    '''Any legal action.'''
+    return int(rng.choice(np.flatnonzero(env.legal_action_mask())))
+
+def cards_first_rollout(env: CombatEnv, rng: random.Random) -> int:
+    '''Any playable card, and only ends the turn when there are none.'''
+    legal = np.flatnonzero(env.legal_action_mask()[1:])
+    return int(rng.choice(legal)) + 1 if len(legal) else END_TURN
+
+ROLLOUTS: dict[str, Rollout] = {
+    'random': random_rollout,
+    'cards_first': cards_first_rollout,
+}
+
+
+class Node():
+    '''A state in the tree. Its value is the sum of the total rewards of every simulation through it.'''
+    def __init__(self, actions: list[int], terminal: bool = False):
+        self.untried = actions
+        self.children: dict[int, Node] = {}
+        self.terminal = terminal
+        self.visits = 0
+        self.value = 0.0
+
+    def select(self, exploration: float) -> tuple[int, Node]:
+        '''The child with the best UCB1 score.'''
+        log_visits = math.log(self.visits)
+        return max(self.children.items(), key=lambda item: item[1].value / item[1].visits
+                   + exploration * math.sqrt(log_visits / item[1].visits))
+
+
+class MCTS():
+    '''Picks actions for a CombatEnv. The search stops after [iterations] simulations or [time_limit] seconds,
+    whichever comes first. Either can be None, but not both.'''
+    def __init__(self, iterations: int | None = 200, time_limit: float | None = None, rollout: str | Rollout = 'cards_first',
+                 rollout_depth: int = 30, exploration: float = 1.4, workers: int = 1, seed: int | None = None):
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTS needs an iteration budget, a time limit or both")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollout = ROLLOUTS[rollout] if isinstance(rollout, str) else rollout
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.simulations = 0
+        self.seconds = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "simulations": self.simulations,
+            "seconds": round(self.seconds, 3),
+            "simulations_per_second": round(self.simulations / self.seconds, 1) if self.seconds > 0 else None,
+        }
+
+    def choose(self, env: CombatEnv) -> int:
+        '''The most visited action at the root. [env] is left exactly as it was.'''
+        legal = np.flatnonzero(env.legal_action_mask())
+        if len(legal) == 1:
+            return int(legal[0])  # Nothing to think about
+        start = time.perf_counter()
+        if self.workers > 1:
+            visits = self.search_parallel(env)
+        else:
+            visits, simulations = self.search(env, self.rng)
+            self.simulations += simulations
+        self.seconds += time.perf_counter() - start
+        return max(visits, key=visits.get)
+
+    def search(self, env: CombatEnv, rng: random.Random) -> tuple[dict[int, int], int]:
+        '''Searches from [env]'s current state. Returns the visits of every action at the root and the number of simulations.'''
+        snapshot = env.snapshot()
+        root = Node(np.flatnonzero(env.legal_action_mask()).tolist())
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else math.inf
+        simulations = 0
+        while (self.iterations is None or simulations < self.iterations) and time.perf_counter() < deadline:
+            self.simulate(env, root, rng)
+            env.restore(snapshot)
+            simulations += 1
+        return {action: child.visits for action, child in root.children.items()}, simulations
+
+    def simulate(self, env: CombatEnv, root: Node, rng: random.Random):
+        node = root
+        path = [root]
+        total = 0.0
+        while not node.untried and node.children and not node.terminal:
+            action, node = node.select(self.exploration)
+            total += env.step(action)[1]
+            path.append(node)
+        if node.untried and not node.terminal:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            _, reward, terminated, truncated, _ = env.step(action)
+            total += reward
+            done = terminated or truncated
+            child = node.children[action] = Node([] if done else np.flatnonzero(env.legal_action_mask()).tolist(), done)
+            path.append(child)
+        for _ in range(self.rollout_depth):
+            if env.done:
+                break
+            total += env.step(self.rollout(env, rng))[1]
+        for node in path:
+            node.visits += 1
+            node.value += total
+
+    def search_parallel(self, env: CombatEnv) -> dict[int, int]:
+        '''Forks a worker per search so each starts with the fight as it is now, and adds up their root visits.'''
+        context = multiprocessing.get_context("fork")
+        connections = []
+        processes = []
+        for _ in range(self.workers):
+            connection, worker_connection = context.Pipe(duplex=False)
+            process = context.Process(target=self.search_worker, args=(env, self.rng.randrange(2**32), worker_connection), daemon=True)
+            process.start()
+            worker_connection.close()
+            connections.append(connection)
+            processes.append(process)
+        visits: dict[int, int] = {}
+        for connection in connections:
+            worker_visits, simulations = connection.recv()
+            self.simulations += simulations
+            for action, count in worker_visits.items():
+                visits[action] = visits.get(action, 0) + count
+        for process in processes:
+            process.join()
+        return visits
+
+    def search_worker(self, env: CombatEnv, seed: int, connection):
+        connection.send(self.search(env, random.Random(seed)))
+        connection.close()
+
+
+def mcts_policy(game: Game, seed: int, iterations: int = 50, **options) -> Responder:
+    '''Plays fights with MCTS (see MCTS for the [options]) and everything else with the autoplayer.
+    The responder's .stats() are the MCTS agent's, which the batch runner records.'''
+    agent = MCTS(iterations=iterations, seed=seed, **options)
+    fallback = autoplayer(game, seed)
+    env = CombatEnv()
+    target = None  # The enemy slot of the card just chosen, for when the game asks who to play it at
+
+    def respond(message=""):
+        nonlocal target
+        combat = game.current_encounter
+        if combat is None or not combat.active_enemies or combat.player.state != State.ALIVE:
+            return fallback(message)
+        if message == "> ":  # The fight's main prompt
+            env.attach(combat, game.rng)
+            action = agent.choose(env)
+            if action == END_TURN:
+                return 'e'
+            slot, target = divmod(action - 1, MAX_ENEMIES)
+            return str(slot + 1)
+        if "Choose an enemy" in message and target is not None:
+            return str(combat.active_enemies.index(combat.all_enemies[target]) + 1)
+        return fallback(message)
+
+    respond.stats = agent.stats
+    return respond
@@ -1,9 +1,12 @@
-from copy import deepcopy
-from enum import StrEnum
+import json
+import time
+from copy import copy, deepcopy
+from enum import Enum, StrEnum
 from uuid import uuid4
 
 from ansi_tags import ansiprint
 from definitions import CardType, PlayerClass, Rarity, StackType, TargetType, STACK_TYPE_COLOR_MAPPING
+from rng import get_rng
 
 
 class Message(StrEnum):
@@ -12,6 +15,7 @@ class Message(StrEnum):
     END_OF_COMBAT = 'end_of_combat'
     START_OF_TURN = 'start_of_turn'
     END_OF_TURN = 'end_of_turn'
+    END_OF_FLOOR = 'end_of_floor'
     BEFORE_ATTACK = 'before_attack'
     AFTER_ATTACK = 'after_attack'
     BEFORE_BLOCK = 'before_block'
@@ -34,18 +38,140 @@ class Message(StrEnum):
     BEFORE_SET_INTENT = 'before_intent'
     AFTER_SET_INTENT = 'after_intent'
 
+class CallbackStats():
+    '''Timings for one subscriber on one message. Times are in nanoseconds and include any nested publishes.'''
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = {}  # bucket -> calls. Bucket b holds calls that took under 2**b microseconds.
+
+    def record(self, elapsed_ns: int):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = (elapsed_ns // 1000).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else 0,
+            "max_us": self.max_ns / 1e3,
+            "histogram": {f"<{2 ** bucket}us": count for bucket, count in sorted(self.histogram.items())},
+        }
+
+
+class BusProfiler():
+    '''Collects publish counts and per subscriber timings for a MessageBus. See MessageBus.enable_profiling().'''
+    def __init__(self):
+        self.publishes = {}  # Message -> times published
+        self.callbacks = {}  # (Message, subscriber __qualname__) -> CallbackStats
+
+    def stats_for(self, event_type: Message, callback) -> CallbackStats:
+        key = (event_type, callback.__qualname__)
+        stats = self.callbacks.get(key)
+        if stats is None:
+            stats = self.callbacks[key] = CallbackStats()
+        return stats
+
+    def slowest(self, top: int = 10) -> list[tuple[Message, str, CallbackStats]]:
+        '''The [top] subscribers that spent the most time in total.'''
+        ranked = sorted(self.callbacks.items(), key=lambda item: item[1].total_ns, reverse=True)
+        return [(event_type, name, stats) for (event_type, name), stats in ranked[:top]]
+
+    def report(self, top: int = 10) -> str:
+        '''A plain text table of the slowest subscribers.'''
+        lines = [f"{'message':<22} {'subscriber':<36} {'calls':>8} {'total ms':>10} {'mean us':>9} {'max us':>9}"]
+        for event_type, name, stats in self.slowest(top):
+            summary = stats.to_dict()
+            lines.append(f"{event_type:<22} {name:<36} {stats.calls:>8} {summary['total_ms']:>10.2f} {summary['mean_us']:>9.1f} {summary['max_us']:>9.1f}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        subscribers = {}
+        for (event_type, name), stats in self.callbacks.items():
+            subscribers.setdefault(str(event_type), {})[name] = stats.to_dict()
+        return {"publishes": {str(event_type): count for event_type, count in self.publishes.items()},
+                "subscribers": subscribers}
+
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
 class MessageBus():
     '''This is a Pub/Sub, or Publish/Subscribe, message bus. It allows components to subscribe to messages,
     registering a callback function that will be called when that message is published.
+
+    Each game gets its own bus (see Game and Player.create_player), so several games can share a process
+    without hearing each other's messages.
+
+    With compiled=True (the default) every message keeps a ready-made tuple of its callbacks, rebuilt only
+    when its subscriptions change, and publish() skips all the bookkeeping it doesn't need. Debug mode
+    always uses the original (slower, chattier) dispatch.
     '''
-    def __init__(self, debug=True):
+    def __init__(self, debug=True, compiled=True):
         self.subscribers = dict(dict())  # noqa: C408
         self.debug = debug
+        self.compiled = compiled
+        self.dispatch = {}  # Message -> tuple of callbacks. Only has messages with at least one subscriber.
+        self.profiler = None
         self.death_messages = []  # what is this?
         self.unsubscribe_set = set()
         self.subscribe_set = set()
         self.lock_count = 0
 
+    def __deepcopy__(self, memo):
+        # Anything that holds a bus (cards, effects, relics...) can be deepcopied. The copy should
+        # talk on the same bus, not drag a private copy of every subscriber along with it.
+        return self
+
+    def __copy__(self):
+        return self
+
+    def snapshot(self):
+        '''Who is subscribed to what, so it can be put back with restore().'''
+        return ({event_type: subscribers.copy() for event_type, subscribers in self.subscribers.items()},
+                self.subscribe_set.copy(), self.unsubscribe_set.copy(), self.death_messages.copy(), self.lock_count)
+
+    def restore(self, state):
+        subscribers, subscribe_set, unsubscribe_set, death_messages, self.lock_count = state
+        self.subscribers = {event_type: callbacks.copy() for event_type, callbacks in subscribers.items()}
+        self.subscribe_set = subscribe_set.copy()
+        self.unsubscribe_set = unsubscribe_set.copy()
+        self.death_messages = death_messages.copy()
+        self.dispatch.clear()
+        for event_type in self.subscribers:
+            self._compile(event_type)
+
+    def clear(self):
+        '''Drops every subscriber, so the bus no longer keeps the cards, effects and relics on it alive.
+        Game.close() and CombatEnv.close() call it once a run or a fight is over.'''
+        self.subscribers.clear()
+        self.dispatch.clear()
+        self.subscribe_set.clear()
+        self.unsubscribe_set.clear()
+        self.death_messages.clear()
+
+    def enable_profiling(self, profiler: BusProfiler | None = None) -> BusProfiler:
+        '''Starts timing every callback. Returns the profiler the numbers go into.
+
+        The profiled publish is swapped in on this instance only, so a bus that isn't being profiled
+        runs exactly the same code as before.
+        '''
+        self.profiler = profiler if profiler is not None else BusProfiler()
+        self.publish = self._publish_profiled
+        return self.profiler
+
+    def disable_profiling(self) -> BusProfiler | None:
+        '''Stops profiling. Returns the profiler so its numbers can still be read.'''
+        profiler, self.profiler = self.profiler, None
+        self.__dict__.pop("publish", None)
+        return profiler
+
     def _clear_subscribes(self):
         if self.lock_count > 0:
             return
@@ -62,6 +188,7 @@ class MessageBus():
             if event_type not in self.subscribers:
                 self.subscribers[event_type] = {}
             self.subscribers[event_type][uid] = callback
+            self._compile(event_type)
             if self.debug:
                 ansiprint(f"<basic>MESSAGEBUS</basic>: <blue>{event_type}</blue> | Subscribed <bold>{callback.__qualname__}</bold>")
 
@@ -84,8 +211,58 @@ class MessageBus():
                 if self.debug:
                     ansiprint(f"<basic>MESSAGEBUS</basic>: Unsubscribed <bold>{self.subscribers[event_type][uid].__qualname__}</bold> from {', '.join(event_type).replace(', ', '')}")
                 del self.subscribers[event_type][uid]
+                self._compile(event_type)
+
+    def _compile(self, event_type):
+        '''Rebuilds the callback tuple for [event_type]. Called whenever its subscribers change.'''
+        callbacks = tuple(self.subscribers[event_type].values())
+        if callbacks:
+            self.dispatch[event_type] = callbacks
+        else:
+            self.dispatch.pop(event_type, None)
 
     def publish(self, event_type: Message, data):
+        if self.debug or not self.compiled:
+            return self._publish_uncompiled(event_type, data)
+        callbacks = self.dispatch.get(event_type)
+        if callbacks is None:
+            return data
+        # Subscriptions made by the callbacks are deferred until the outermost publish finishes,
+        # so the tuple can't change under us.
+        self.lock_count += 1
+        try:
+            for callback in callbacks:
+                callback(event_type, data)
+        finally:
+            self.lock_count -= 1
+        if self.lock_count == 0 and (self.subscribe_set or self.unsubscribe_set):
+            self._clear_subscribes()
+            self._clear_unsubscribes()
+        return data
+
+    def _publish_profiled(self, event_type: Message, data):
+        profiler = self.profiler
+        profiler.publishes[event_type] = profiler.publishes.get(event_type, 0) + 1
+        callbacks = self.dispatch.get(event_type)
+        if callbacks is None:
+            return data
+        clock = time.perf_counter_ns
+        self.lock_count += 1
+        try:
+            for callback in callbacks:
+                if self.debug:
+                    ansiprint(f"<basic>MESSAGEBUS</basic>: <blue>{event_type}</blue> | Calling <bold>{callback.__qualname__}</bold>")
+                start = clock()
+                callback(event_type, data)
+                profiler.stats_for(event_type, callback).record(clock() - start)
+        finally:
+            self.lock_count -= 1
+        if self.lock_count == 0 and (self.subscribe_set or self.unsubscribe_set):
+            self._clear_subscribes()
+            self._clear_unsubscribes()
+        return data
+
+    def _publish_uncompiled(self, event_type: Message, data):
         self.lock_count += 1
         if event_type in self.subscribers:
             for uid, callback in self.subscribers[event_type].items():
@@ -98,10 +275,86 @@ class MessageBus():
         self._clear_unsubscribes()
         return data
 
+_copiers: dict[type, object] = {}  # How to copy an attribute of each type, or None to share it
+
+def _copier(kind: type):
+    if kind in (list, dict, set):
+        return kind.copy
+    if issubclass(kind, Enum) or not hasattr(kind, "__copy__"):
+        return None  # Enum members copy to themselves anyway
+    return kind.__copy__
+
+def save_state(obj) -> tuple[dict, tuple]:
+    '''A copy of [obj]'s attributes for load_state(). Lists, dicts, sets and anything else that can copy itself
+    (like an EffectContainer) are copied one level deep. Everything else, including other game objects and
+    catalog data, is shared rather than copied.
+
+    Which attributes need copying is worked out here, once, so loading the same state again and again is cheap.'''
+    attributes = vars(obj).copy()
+    copied = []
+    copiers = _copiers
+    for name, value in attributes.items():
+        kind = type(value)
+        copier = copiers.get(kind, _copier)
+        if copier is _copier:
+            copier = copiers[kind] = _copier(kind)
+        if copier is not None:
+            attributes[name] = copier(value)
+            copied.append((name, copier))
+    return attributes, tuple(copied)
+
+def load_state(obj, state: tuple[dict, tuple]) -> None:
+    '''Puts [obj] back the way it was when save_state() was called. The same state can be loaded any number of times.'''
+    attributes, copied = state
+    current = vars(obj)
+    current.clear()
+    current.update(attributes)
+    for name, copier in copied:
+        current[name] = copier(attributes[name])
+
+class Snapshot():
+    '''The state of a group of objects, their bus subscriptions and the run's random number streams at one moment.
+
+    Objects are restored in place, so everything that points at them (effects at their host, the bus at their
+    callbacks...) is still right afterwards. Objects created after the snapshot are simply forgotten.
+    '''
+    def __init__(self, objects, bus: MessageBus | None = None, rng=None):
+        seen = set()
+        self.states = []
+        for obj in objects:
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                self.states.append((obj, save_state(obj)))
+        self.bus = bus
+        self.bus_state = bus.snapshot() if bus is not None else None
+        self.rng = rng if rng is not None else get_rng()  # The run's RNG, or the random module if no run is active
+        self.rng_state = self.rng.getstate()
+
+    def restore(self):
+        for obj, state in self.states:
+            load_state(obj, state)
+        if self.bus is not None:
+            self.bus.restore(self.bus_state)
+        self.rng.setstate(self.rng_state)
+
+
 class Registerable():
     registers = []
+    bus = None  # The bus this object last registered with
+
+    def snapshot(self) -> tuple[dict, tuple]:
+        '''This object's own state. Subclasses that own other objects also list them in snapshot_objects().'''
+        return save_state(self)
+
+    def restore(self, state: tuple[dict, tuple]):
+        load_state(self, state)
+
+    def snapshot_objects(self):
+        '''Every object whose state belongs to this one, starting with itself.'''
+        return [self]
 
     def register(self, bus):
+        self.bus = bus
         for message in self.registers:
             bus.subscribe(message, self.callback, self.uid)
         self.subscribed = True
@@ -110,10 +363,24 @@ class Registerable():
         '''Unsubscribes the object from certain events. Unsubscribes from all registers by default.'''
         if not event_types:
             event_types = self.registers
-        for message in event_types:
-            bus.unsubscribe(message, self.uid)
+        if self.bus is not None:
+            for message in event_types:
+                self.bus.unsubscribe(message, self.uid)
         self.subscribed = False
 
+    def clone(self):
+        """A new, unsubscribed object with the same state as this one. Much cheaper than calling the constructor or deepcopy().
+        Used to hand out cards, relics and potions from prototypes that are built once."""
+        new = copy(self)
+        if "uid" in vars(self):
+            new.uid = uuid4()
+        new.__dict__.pop("bus", None)
+        new.subscribed = False
+        for attribute, value in vars(self).items():
+            if isinstance(value, (list, dict, set)):
+                setattr(new, attribute, value.copy())
+        return new
+
 
 class Relic(Registerable):
     def __init__(self, name: str, info: str, flavor_text: str, rarity: Rarity, player_class: PlayerClass=PlayerClass.ANY):
@@ -164,5 +431,3 @@ class Potion(Registerable):
                 self.info = self.golden_info
                 for stat in self.golden_stats:
                     stat *= 2
-
-bus = MessageBus(debug=False)
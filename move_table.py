@@ -0,0 +1,151 @@
+'''Declarative enemy AI: what an enemy can do, how likely each move is and when it's allowed.
+
+    class FungiBeast(Enemy):
+        moves = move_table.MoveTable([
+            move_table.Move("Bite", 0.6, [("Attack", (6,))], max_repeat=3),
+            move_table.Move("Grow", 0.4, [("Buff", (effect_catalog.Strength, 3))], max_repeat=2),
+        ])
+
+Enemy.set_intent() picks from the table. A move can't be picked once it has been used [max_repeat] times in
+a row, or while its [when] condition is False. The rest keep their weights relative to each other, so the
+pick is one draw from the enemy's stream, with nothing rolled again.
+
+What's allowed only depends on the last move, how many times in a row it was used and the conditions, so
+the distribution for each of those is worked out the first time it comes up and reused after that.
+distribution() exposes it, for search and analytics.
+'''
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+from typing import TYPE_CHECKING, Callable
+
+import rng
+
+if TYPE_CHECKING:
+    from enemy import Enemy
+
+
+class MoveHistory():
+    '''The moves an enemy has made. Only the last [size] are kept, along with the last move and how many times in a
+    row it was used, so spam checks are O(1) and long fights don't grow without end.
+
+    `move in history` is true for any move the enemy has ever made, not just the ones still kept.
+    '''
+    SIZE = 8
+
+    def __init__(self, moves=(), size: int = SIZE):
+        self.recent = deque(maxlen=size)
+        self.used: set[str] = set()
+        self.last: str | None = None
+        self.repeats = 0
+        for move in moves:
+            self.append(move)
+
+    def append(self, move: str):
+        if move == self.last:
+            self.repeats += 1
+        else:
+            self.last, self.repeats = move, 1
+        self.recent.append(move)
+        self.used.add(move)
+
+    def repeated(self, move: str, times: int) -> bool:
+        '''Whether the last [times] moves were all [move].'''
+        return self.last == move and self.repeats >= times
+
+    def __getitem__(self, index):
+        return list(self.recent)[index] if isinstance(index, slice) else self.recent[index]
+
+    def __iter__(self):
+        return iter(self.recent)
+
+    def __reversed__(self):
+        return reversed(self.recent)
+
+    def __len__(self):
+        return len(self.recent)
+
+    def __contains__(self, move):
+        return move in self.used
+
+    def __copy__(self):
+        new = MoveHistory.__new__(MoveHistory)
+        new.recent = self.recent.copy()
+        new.used = self.used.copy()
+        new.last, new.repeats = self.last, self.repeats
+        return new
+
+    def __repr__(self):
+        return f"MoveHistory({list(self.recent)!r})"
+
+
+class Move():
+    '''One row of a move table.
+
+    [actions] are what the move does, in the form Enemy.execute_move() reads: ("Attack", (damage, hits)),
+    ("Buff", (effect, amount)), ("Block", (block,))... or a single name like ("Split",) for moves that don't
+    fit those. [actions] can be a function of the enemy, for numbers that are only known once the fight has started.
+    The intent shown to the player is worked out from the actions (see enemy.Intent).
+    '''
+    def __init__(self, name: str, weight: float, actions: list[tuple] | Callable[[Enemy], list[tuple]],
+                 max_repeat: int | None = None, when: Callable[[Enemy], bool] | None = None):
+        if weight <= 0:
+            raise ValueError(f"{name} needs a positive weight, not {weight}")
+        self.name = name
+        self.weight = weight
+        self.actions = actions
+        self.max_repeat = max_repeat
+        self.when = when
+
+    def next_move(self, enemy: Enemy) -> list[tuple]:
+        first, *rest = self.actions(enemy) if callable(self.actions) else self.actions
+        return [(self.name, *first), *rest]
+
+    def allowed(self, last_move: str, repeats: int) -> bool:
+        return self.max_repeat is None or last_move != self.name or repeats < self.max_repeat
+
+    def __repr__(self):
+        return f"Move({self.name!r}, {self.weight:g})"
+
+
+class MoveTable():
+    '''The moves an enemy picks from.'''
+    def __init__(self, moves: list[Move]):
+        self.moves = moves
+        self.conditional = [move for move in moves if move.when is not None]
+        self.longest_repeat = max((move.max_repeat for move in moves if move.max_repeat is not None), default=0)
+        self.cache: dict[tuple, tuple[list[Move], list[float]]] = {}
+
+    def history_state(self, enemy: Enemy) -> tuple:
+        '''Everything that decides which moves are allowed.'''
+        last_move, repeats = enemy.last_move_repeats(self.longest_repeat)
+        return (last_move, repeats, *(move.when(enemy) for move in self.conditional))
+
+    def options(self, enemy: Enemy) -> tuple[list[Move], list[float]]:
+        '''The moves [enemy] can pick now, with their cumulative weights.'''
+        state = self.history_state(enemy)
+        cached = self.cache.get(state)
+        if cached is None:
+            last_move, repeats, *conditions = state
+            passed = {id(move) for move, condition in zip(self.conditional, conditions, strict=True) if condition}
+            moves = [move for move in self.moves if move.allowed(last_move, repeats) and (move.when is None or id(move) in passed)]
+            if not moves:
+                raise RuntimeError(f"{enemy.name} has no move it can make after {repeats}x {last_move}")
+            cached = self.cache[state] = (moves, list(accumulate(move.weight for move in moves)))
+        return cached
+
+    def distribution(self, enemy: Enemy) -> dict[str, float]:
+        '''The chance of each move being picked next, by name.'''
+        moves, cumulative = self.options(enemy)
+        chances: dict[str, float] = {}
+        for move in moves:
+            chances[move.name] = chances.get(move.name, 0.0) + move.weight / cumulative[-1]
+        return chances
+
+    def pick(self, enemy: Enemy) -> Move:
+        '''One move, from a single draw from [enemy]'s stream.'''
+        moves, cumulative = self.options(enemy)
+        roll = rng.enemy_stream(enemy).random() * cumulative[-1]
+        return moves[min(bisect_right(cumulative, roll), len(moves) - 1)]
@@ -0,0 +1,90 @@
+'''How long the game's pauses really last.
+
+The game pauses all over the place so the player can follow what's happening: between enemy moves,
+after a card is played, before a screen is cleared. Every one of those goes through drivers.sleep(), and
+the terminal driver asks the active pacing how long to actually wait. That makes the whole game faster
+or slower in one place, for demos, replays of a seeded run or tests.
+
+    with use_pacing(Pacing.scaled(0.25)):  # Every pause is a quarter as long
+        Game(seed=7).start()
+
+Like the driver and the RNG, the active pacing is per thread.
+'''
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from enum import StrEnum
+
+
+class PacingMode(StrEnum):
+    REALTIME = 'realtime'  # Pauses last as long as the game asks
+    SCALED = 'scaled'  # Pauses are multiplied by a factor
+    ZERO = 'zero'  # No pauses at all
+
+
+class Pacing():
+    '''Turns the pauses the game asks for into real waits. [scale] multiplies every pause.'''
+    def __init__(self, scale: float = 1.0):
+        if scale < 0:
+            raise ValueError(f"Pauses can't be scaled by {scale}")
+        self.scale = scale
+        self.paused = 0.0  # Seconds actually spent pausing, for checking how much a run waited
+
+    @classmethod
+    def realtime(cls) -> Pacing:
+        return cls(1.0)
+
+    @classmethod
+    def scaled(cls, scale: float) -> Pacing:
+        return cls(scale)
+
+    @classmethod
+    def zero(cls) -> Pacing:
+        return cls(0.0)
+
+    @property
+    def mode(self) -> PacingMode:
+        if self.scale == 0:
+            return PacingMode.ZERO
+        return PacingMode.REALTIME if self.scale == 1 else PacingMode.SCALED
+
+    def duration(self, seconds: float) -> float:
+        '''How long a pause of [seconds] really lasts.'''
+        return seconds * self.scale
+
+    def pause(self, seconds: float) -> None:
+        seconds = seconds * self.scale
+        if seconds > 0:
+            time.sleep(seconds)
+            self.paused += seconds
+
+    def __repr__(self):
+        return f"Pacing({self.mode}{f', x{self.scale:g}' if self.mode == PacingMode.SCALED else ''})"
+
+
+class _ActivePacing(threading.local):
+    pacing: Pacing = Pacing.realtime()
+
+_active = _ActivePacing()
+
+def get_pacing() -> Pacing:
+    return _active.pacing
+
+def set_pacing(pacing: Pacing) -> Pacing:
+    '''Makes [pacing] the active pacing for this thread. Returns the pacing it replaced.'''
+    previous, _active.pacing = _active.pacing, pacing
+    return previous
+
+@contextmanager
+def use_pacing(pacing: Pacing):
+    '''Makes [pacing] the active pacing for this thread for the duration of the with block.'''
+    previous = set_pacing(pacing)
+    try:
+        yield pacing
+    finally:
+        set_pacing(previous)
+
+def pause(seconds: float) -> None:
+    _active.pacing.pause(seconds)
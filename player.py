@@ -1,18 +1,18 @@
 import math
-import random
-import sys
 from copy import deepcopy
-from time import sleep
 from uuid import uuid4
 
 import effect_catalog
 import items
-from ansi_tags import ansiprint
-from definitions import CardType, State, TargetType
-from message_bus_tools import Message, Potion, Registerable, Relic, bus
+from definitions import CardType, Rarity, State, TargetType
+from drivers import ansiprint, echo, prompt, sleep
+from message_bus_tools import Message, MessageBus, Potion, Registerable, Relic
+from rng import Stream, stream
 from card_catalog import Card
-from effect_catalog import Effect
+from effect_catalog import EffectContainer
 from entities import Action
+from card_pile import CardPile
+from zobrist import Hashed, Pile, Tracked
 import card_catalog
 import potion_catalog
 import relic_catalog
@@ -21,7 +21,7 @@ import displayer as view
 import effect_interface as ei
 
 
-class Player(Registerable):
+class Player(Hashed, Registerable):
     """
     Attributes:::
     health: The player's current health
@@ -34,12 +34,24 @@ class Player(Registerable):
     deck: All the cards the player has. Is shuffled into the player's draw pile at the start of combat.
     potions: Holds the potions the player gets.
     max_potions: The max amount of potions the player can have
+    bus: The message bus for the player's game. A fresh one is made if none is given.
     """
 
     registers = [Message.END_OF_COMBAT, Message.START_OF_COMBAT, Message.START_OF_TURN, Message.END_OF_TURN, Message.ON_RELIC_ADD]
+    # What the player's state_hash is made of, besides their effects
+    health = Tracked()
+    max_health = Tracked()
+    block = Tracked()
+    energy = Tracked()
+    state = Tracked()
+    hand = Pile(CardPile)
+    draw_pile = Pile(CardPile, ordered=True)  # Its order decides what gets drawn
+    discard_pile = Pile(CardPile)
+    exhaust_pile = Pile(CardPile)
 
-    def __init__(self, health: int, block: int, max_energy: int, deck: list[Card], powers: list = None):
+    def __init__(self, health: int, block: int, max_energy: int, deck: list[Card], powers: list = None, bus: MessageBus = None):
         self.uid = uuid4()
+        self.bus = bus if bus is not None else MessageBus(debug=False)
         if not powers:
             powers = []
         self.health: int = health
@@ -48,6 +60,7 @@ class Player(Registerable):
         self.player_class: str = "Ironclad"
         self.in_combat = False
         self.state = State.ALIVE
+        self.killed_by: str | None = None  # What killed the player, if they died
         self.floors = 1
         self.fresh_effects: list[str] = []  # Shows what effects were applied after the player's turn
         self.max_health: int = health
@@ -57,6 +70,7 @@ class Player(Registerable):
         self.deck: list[Card] = deck
         self.potions: list[Potion] = []
         self.relics: list[Relic] = []
+        self.relic_pool = None  # Relics the player can still find. Managed by generators.
         self.max_potions: int = 3
         self.hand: list[Card] = []
         self.draw_pile: list[Card] = []
@@ -68,8 +82,8 @@ class Player(Registerable):
         self.orbs = []
         self.orb_slots: int = 3
         self.gold: int = 100
-        self.debuffs: list[Effect] = []
-        self.buffs: list[Effect] = powers
+        self.debuffs = EffectContainer(owner=self)
+        self.buffs = EffectContainer(powers, owner=self)
         # Alternate debuff/buff effects
         self.the_bomb_countdown = 3
         self.deva_energy = 1
@@ -104,8 +118,8 @@ class Player(Registerable):
         self.choker_cards_played = 0  # Used for the Velvet Choker relic
 
     @classmethod
-    def create_player(cls):
-        player = cls(health=80, block=0, max_energy=3, deck=[
+    def create_player(cls, bus: MessageBus = None):
+        player = cls(health=80, block=0, max_energy=3, bus=bus, deck=[
             card_catalog.IroncladStrike(), card_catalog.IroncladStrike(), card_catalog.IroncladStrike(), card_catalog.IroncladStrike(), card_catalog.IroncladStrike(),
             card_catalog.IroncladDefend(), card_catalog.IroncladDefend(), card_catalog.IroncladDefend(), card_catalog.IroncladDefend(),
             card_catalog.Bash()
@@ -129,14 +143,18 @@ class Player(Registerable):
             else status + "\n"
         )
 
+    def snapshot_objects(self):
+        objects = [self, *self.deck, *self.hand, *self.draw_pile, *self.discard_pile, *self.exhaust_pile]
+        objects += [*self.relics, *self.potions, *self.buffs, *self.debuffs]
+        return objects
+
     def register(self, bus):
         # Register all relics, effects, and cards
         for relic in self.relics:
             relic.register(bus)
         for effect in self.buffs + self.debuffs:
             effect.register(bus)
-        for card in self.hand:
-            card.register(bus)
+        self.hand.listen(bus)
         return super().register(bus)
 
     def use_card(self, card, exhaust, pile, enemies, target: "Enemy"=None) -> None:
@@ -145,7 +163,7 @@ class Player(Registerable):
         Wow!
         """
         # determine exhaust
-        if card.type in (CardType.STATUS, CardType.CURSE) and card.name not in ("Slimed", "Pride"):
+        if not card.playable:
             if card.type == CardType.CURSE and relic_catalog.BlueCandle in self.relics:
                 exhaust = True
             else:
@@ -161,14 +179,14 @@ class Player(Registerable):
         else:
             raise ValueError(f"Invalid target type: {card.target}")
 
-        bus.publish(Message.ON_CARD_PLAY, (self, card, target, enemies))
+        self.bus.publish(Message.ON_CARD_PLAY, (self, card, target, enemies))
 
         # Move the card to the appropriate pile
         if pile is not None:
             if exhaust is True or getattr(card, "exhaust", False) is True:
                 ansiprint(f"{card.name} was <bold>Exhausted</bold>.")
                 self.move_card(card=card, move_to=self.exhaust_pile, from_location=pile, cost_energy=True)
-                bus.publish(Message.ON_EXHAUST, (self, card))
+                self.bus.publish(Message.ON_EXHAUST, (self, card))
             else:
                 self.move_card(card=card, move_to=self.discard_pile, from_location=pile, cost_energy=True)
         sleep(0.5)
@@ -179,33 +197,29 @@ class Player(Registerable):
         if cards is None:
             cards = self.draw_strength
         action = Action(self, self._draw_cards, cards)
-        bus.publish(Message.BEFORE_DRAW, (self, action))
+        self.bus.publish(Message.BEFORE_DRAW, (self, action))
         action.execute()
-        bus.publish(Message.AFTER_DRAW, (self, action))
+        self.bus.publish(Message.AFTER_DRAW, (self, action))
 
     def _draw_cards(self, num_cards: int):
         # Internal function to draw cards
-        self.discard_pile.extend(self.hand)
-        self.hand.clear()
-        if len(self.draw_pile) < num_cards:
-            self.draw_pile.extend(random.sample(self.discard_pile, len(self.discard_pile)))
-            self.discard_pile = []
+        drawn = self.draw_pile.draw(num_cards)
+        if len(drawn) < num_cards and self.discard_pile:
+            self.discard_pile.empty_into(self.draw_pile)
+            self.draw_pile.shuffle(stream(Stream.SHUFFLE))
             ansiprint("<bold>Discard pile shuffled into draw pile.</bold>")
-        self.hand.extend(self.draw_pile[-num_cards:])
-        # Removes those cards
-        self.draw_pile = self.draw_pile[:-num_cards]
-        for card in self.hand:
-            card.register(bus=bus)
-        print(f"Drew {num_cards} card{'s'[:num_cards^1]}.")  # Cool pluralize hack
+            drawn += self.draw_pile.draw(num_cards - len(drawn))
+        self.hand.extend(drawn)
+        echo(f"Drew {num_cards} card{'s'[:num_cards^1]}.")  # Cool pluralize hack
 
     def blocking(self, card: Card = None, block=0, context: str=None):
         """Gains [block] Block. Cards are affected by Dexterity and Frail."""
         block = getattr(card, 'block', None) if card else block
         block_affected_by = ', '.join(getattr(card, 'block_affected_by', []) if card else [context])
-        bus.publish(Message.BEFORE_BLOCK, (self, card))
+        self.bus.publish(Message.BEFORE_BLOCK, (self, card))
         self.block += block
         ansiprint(f"""{self.name} gained {block} <blue>Block</blue> from {block_affected_by}.""") # f-strings my beloved
-        bus.publish(Message.AFTER_BLOCK, (self, card))
+        self.bus.publish(Message.AFTER_BLOCK, (self, card))
 
     def health_actions(self, heal: int, heal_type: str):
         """If [heal_type] is 'Heal', you heal for [heal] HP. If [heal_type] is 'Max Health', increase your max health by [heal]."""
@@ -222,35 +236,25 @@ class Player(Registerable):
             self.health += heal
             ansiprint(f"Your Max HP is {'increased' if heal > 0 else 'decreased'} by <{'light-blue' if heal > 0 else 'red'}>{heal}</{'light-blue' if heal > 0 else 'red'}>")
 
-    def card_actions(self, subject_card: dict, action: str, card_pool: list[dict] = None):
+    def card_actions(self, subject_card: Card, action: str, card_pool: list[Card] = None):
         """[action] == 'Remove', remove [card] from your deck.
         [action] == 'Transform', transform a card into another random card.
         """
-        if card_pool is None:
-            card_pool = card_catalog.create_all_cards()
-        while True:
-            if action == "Remove":
-                del subject_card
-            elif action == "Transform":
-                # Curse cards can only be transformed into other Curses
-                ansiprint(f"{subject_card.name} was <bold>transformed</bold> into ", end="")
-                if subject_card.get("Type") == "Curse":
-                    options = [valid_card for valid_card in card_catalog.create_all_cards() if valid_card.get("Type") == "Curse" and valid_card.get("Rarity") != "Special"]
+        if action == "Remove":
+            del subject_card
+        elif action == "Transform":
+            # Curse cards can only be transformed into other Curses
+            if card_pool is None:
+                if subject_card.type == CardType.CURSE:
+                    card_pool = card_catalog.catalog.find(card_type=CardType.CURSE, exclude_rarities=(Rarity.SPECIAL,))
                 else:
-                    options = [
-                        valid_card
-                        for valid_card in card_catalog.create_all_cards()
-                        if valid_card.get("Class") == valid_card.get("Class")
-                        and valid_card.get("Type") not in ("Status", "Curse", "Special")
-                        and valid_card.get("Upgraded") is not True
-                        and valid_card.get("Rarity") != "Basic"
-                    ]
-                while True:
-                    new_card = random.choice(options)
-                    if new_card == subject_card:
-                        continue
-                    ansiprint(f"{new_card.name} | <yellow>{new_card.info}</yellow>")
-                    return new_card
+                    card_pool = card_catalog.catalog.find(player_class=subject_card.player_class, exclude_types=(CardType.STATUS, CardType.CURSE), exclude_rarities=(Rarity.BASIC, Rarity.SPECIAL))
+            options = [card for card in card_pool if card.name != subject_card.name]
+            if not options:
+                return subject_card
+            new_card = stream(Stream.EVENTS).choice(options).clone()
+            ansiprint(f"{subject_card.name} was <bold>transformed</bold> into {new_card.name} | <yellow>{new_card.info}</yellow>")
+            return new_card
 
     def move_card(self, card, move_to, from_location, cost_energy=False, shuffle=False):
         if cost_energy is True:
@@ -260,11 +264,11 @@ class Player(Registerable):
         else:
             ansiprint(f"WARNING: {card.name} was not found in `from_location` in `move_card()` function.")
         if shuffle is True:
-            move_to.insert(random.randint(0, len(move_to) - 1), card)
+            move_to.insert(stream(Stream.SHUFFLE).randint(0, len(move_to)), card)
         else:
             move_to.append(card)
-        if move_to == self.exhaust_pile:
-            bus.publish(Message.ON_EXHAUST, (card))
+        if move_to is self.exhaust_pile:
+            self.bus.publish(Message.ON_EXHAUST, (card))
 
     def attack(self, target: "Enemy", card: Card=None, dmg=-1):
         # Check if already dead and skip if so
@@ -272,7 +276,7 @@ class Player(Registerable):
         if target.health <= 0:
             return
         if card is not None and card.type not in (CardType.STATUS, CardType.CURSE):
-            bus.publish(Message.BEFORE_ATTACK, (self, target, card))
+            self.bus.publish(Message.BEFORE_ATTACK, (self, target, card))
             dmg = getattr(card, 'damage', dmg)
             if dmg <= target.block:
                 target.block -= dmg
@@ -284,10 +288,10 @@ class Player(Registerable):
                 target.health -= dmg
                 ansiprint(f"You dealt {dmg} damage(<light-blue>{target.block} Blocked</light-blue>) to {target.name} with {' | '.join(card.damage_affected_by)}")
                 target.block = 0
-                bus.publish(Message.AFTER_ATTACK, (self, target, dmg))
+                self.bus.publish(Message.AFTER_ATTACK, (self, target, dmg))
                 if target.health <= 0:
                     target.die()
-                bus.publish(Message.ON_ATTACKED, (target))
+                self.bus.publish(Message.ON_ATTACKED, (target))
 
     def gain_gold(self, gold, dialogue=True):
         self.gold += gold
@@ -299,7 +303,7 @@ class Player(Registerable):
         self.health -= dmg
         ansiprint(f"<light-red>You lost {dmg} health.</light-red>")
 
-    def die(self):
+    def die(self, killed_by: str | None = None):
         view.clear()
         self.health = max(self.health, 0)
         if potion_catalog.FairyInABottle() in self.potions:
@@ -307,16 +311,18 @@ class Player(Registerable):
                 potion_index = self.potions.index(potion_catalog.FairyInABottle())
             except ValueError:
                 potion_index = -1
-            self.player.health_actions(math.floor(self.player.max_health * self.potions[potion_index].hp_percent), "Heal")
+            self.health_actions(math.floor(self.max_health * self.potions[potion_index].hp_percent), "Heal")
             return
+        self.state = State.DEAD
+        self.killed_by = killed_by
         ansiprint("<red>You Died</red>")
-        input("Press enter > ")
-        sys.exit()
+        prompt("Press enter > ")
 
     def callback(self, message, data: tuple):
         if message == Message.START_OF_COMBAT:
             self.in_combat = True
-            self.draw_pile = random.sample(self.deck, len(self.deck))
+            self.draw_pile = self.deck
+            self.draw_pile.shuffle(stream(Stream.SHUFFLE))
         elif message == Message.END_OF_COMBAT:
             self.in_combat = False
             self.draw_pile.clear()
@@ -327,7 +333,7 @@ class Player(Registerable):
             # turn = data
             for effect in self.buffs + self.debuffs:
                 if effect.subscribed is False:
-                    effect.register(bus)
+                    effect.register(self.bus)
             ansiprint(f"<underline><bold>{self.name}</bold></underline>:")
             self.energy += self.energy_gain
             # INFO: Both Barricade and Calipers are not accounted for here and will be added later.
@@ -337,12 +343,10 @@ class Player(Registerable):
             ei.tick_effects(self)
             self.fresh_effects.clear()
         elif message == Message.END_OF_TURN:
-            self.discard_pile += self.hand
-            for card in self.hand:
-                card.unsubscribe()
+            self.hand.empty_into(self.discard_pile)
             sleep(1)
             view.clear()
         elif message == Message.ON_RELIC_ADD:
             relic, _ = data
-            relic.register(bus)
+            relic.register(self.bus)
 
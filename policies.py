@@ -0,0 +1,136 @@
+'''Policies play the game in place of a person, by answering its prompts.
+
+A policy is called with the Game it's about to play and the run's seed, and returns a responder for a
+HeadlessDriver: a function that takes the prompt and returns what the player would have typed. A responder
+can also have a stats() method, whose result the batch runner keeps with the run.
+'''
+from __future__ import annotations
+
+import importlib
+import random
+from typing import TYPE_CHECKING, Callable
+
+import definitions
+from definitions import CardType
+
+if TYPE_CHECKING:
+    from game import Game
+
+Responder = Callable[[str], str]
+Policy = Callable[["Game", int], Responder]
+
+# Every answer the autoplayers try. This is the only copy: tests and scripts import it from here.
+CHOICES = ('1', '2', '3', '4', '5', '6', '7', '8', '9', 'e',
+           'p', 'm', 'd', 'a', 's', 'x', 'f', 'y', 'n',
+           'rest', 'smith', 'view deck', 'leave', 'exit', 'lift', 'toke', 'dig')
+
+
+class PromptLimitReached(Exception):
+    '''Raised by limit_prompts() when a run asks for more input than it's allowed.'''
+
+
+def random_policy(_game: Game, seed: int) -> Responder:
+    '''Answers every prompt with a random choice, whatever the game and the prompt.
+    Uses its own Random so it doesn't disturb the game's rng.'''
+    rng = random.Random(seed)
+    def respond(_message):
+        return rng.choice(CHOICES)
+    return respond
+
+
+def repeat_check(repeat_catcher, last_return, current_return) -> tuple[int, bool]:
+    '''Check if the player is stuck in a loop
+    '''
+    if last_return == current_return:
+        repeat_catcher += 1
+    else:
+        repeat_catcher = 0
+    if repeat_catcher > 3:
+        return repeat_catcher, True
+    return repeat_catcher, False
+
+
+def autoplayer(game: Game, _seed: int | None = None, log: Callable[[str, str], None] | None = None) -> Responder:
+    '''Plays cards it can afford, picks targets and otherwise answers at random. Can play the game, maybe.
+
+    Takes a seed like every policy, but draws from the game's own rng, which the game has already seeded. [log] is called with every choice and the reason for it.
+    '''
+    repeat_catcher = 0
+    last_return = None
+    def respond(message=""):
+        nonlocal repeat_catcher
+        nonlocal last_return
+        choice = None
+        reason = ""
+        # Handle Start Node
+        if game.game_map.current.type == definitions.EncounterType.START:
+            choice, reason = str(random.choice(range(1, len(game.game_map.current.children)))), "Start node"
+
+        # Handle dead
+        player = game.player
+        if player.state == definitions.State.DEAD:
+            choice, reason = '\n', "Player is dead"
+
+        # Handle combat
+        if game.current_encounter:
+            possible_cards = [idx+1 for idx, card in enumerate(player.hand) if card.energy_cost <= player.energy and card.type != CardType.STATUS]
+            # Handle no energy
+            if player.energy == 0 and player.in_combat:
+                choice, reason = 'e', "No energy left"
+            # Handle enemy selection
+            elif message and "Choose" in message:
+                choice, reason = str(random.randint(1, len(game.current_encounter.active_enemies))), "Enemy selection"
+            # Handle card selection
+            elif len(possible_cards) > 0:
+                choice, reason = str(random.choice(possible_cards)), "Card selection"
+
+        # Default (all options)
+        if choice is None:
+            choice, reason = random.choice(CHOICES), "Default"
+
+        repeat_catcher, check = repeat_check(repeat_catcher, last_return, choice)
+        if check:
+            # Pick anything other than the last choice
+            others = [option for option in CHOICES if option != choice]
+            choice, reason = random.choice(others), "Player is stuck in a loop"
+
+        last_return = choice
+        if log is not None:
+            log(choice, reason)
+        return choice
+
+    return respond
+
+
+def limit_prompts(responder: Responder, max_prompts: int) -> Responder:
+    '''Wraps [responder] so a run that never ends gives up with PromptLimitReached after [max_prompts] prompts.'''
+    count = 0
+    def respond(message):
+        nonlocal count
+        count += 1
+        if count > max_prompts:
+            raise PromptLimitReached(message)
+        return responder(message)
+    return respond
+
+
+def mcts(game: Game, seed: int) -> Responder:
+    '''Monte Carlo tree search in fights and the autoplayer everywhere else. See mcts.py, which needs numpy (poetry install --extras agents).'''
+    from mcts import mcts_policy  # Imported here so the other policies don't need numpy
+    return mcts_policy(game, seed)
+
+
+POLICIES: dict[str, Policy] = {
+    'random': random_policy,
+    'autoplayer': autoplayer,
+    'mcts': mcts,
+}
+
+def load_policy(name: str) -> Policy:
+    '''Finds a policy by name, or imports one given as "module:function" (for agents that live outside the game).'''
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, function_name = name.partition(':')
+    if not function_name:
+        raise ValueError(f"Unknown policy {name!r}. Use one of {', '.join(POLICIES)} or module:function.")
+    return getattr(importlib.import_module(module_name), function_name)
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-import random
-from copy import deepcopy
 from typing import TYPE_CHECKING, Sequence
 
 import effect_catalog
 from ansi_tags import ansiprint
 from definitions import CardType, PlayerClass, Rarity, State, TargetType
 from message_bus_tools import Message, Potion, Relic
-from card_catalog import create_all_cards
+from rng import Stream, stream
+import card_catalog
 
 if TYPE_CHECKING:
     from enemy import Enemy
@@ -35,12 +34,11 @@ class AttackPotion(Potion):
         self.golden_info = "Add 2 copies of 1 of 3 random <keyword>Attack</keyword> cards to your hand. They cost 0 this turn."
 
     def apply(self, origin):
-        cards = create_all_cards()
-        valid_cards = random.choices([card for card in cards if card.type == CardType.ATTACK], k=3)
+        valid_cards = stream(Stream.COMBAT).choices(card_catalog.catalog.find(card_type=CardType.ATTACK), k=3)
         chosen_card = view.list_input("Choose a card", valid_cards, view.view_piles)
         if chosen_card is not None:
             for _ in range(self.copies):
-                origin.hand.append(deepcopy(valid_cards[chosen_card]))
+                origin.hand.append(valid_cards[chosen_card].clone())
 
 class SkillPotion(Potion):
     def __init__(self):
@@ -50,12 +48,11 @@ class SkillPotion(Potion):
         self.golden_info = "Add 2 copies of 1 of 3 random <keyword>Skill</keyword> cards to your hand. They cost 0 this turn."
 
     def apply(self, origin):
-        cards = create_all_cards()
-        valid_cards = random.choices([card for card in cards if card.type == CardType.SKILL], k=3)
+        valid_cards = stream(Stream.COMBAT).choices(card_catalog.catalog.find(card_type=CardType.SKILL), k=3)
         chosen_card = view.list_input("Choose a card", valid_cards, view.view_piles)
         if chosen_card is not None:
             for _ in range(self.copies):
-                origin.hand.append(deepcopy(valid_cards[chosen_card]))
+                origin.hand.append(valid_cards[chosen_card].clone())
 
 class PowerPotion(Potion):
     def __init__(self):
@@ -65,12 +62,11 @@ class PowerPotion(Potion):
         self.golden_info = "Add 2 copies of 1 of 3 random <keyword>Power</keyword> cards to your hand. They cost 0 this turn."
 
     def apply(self, origin):
-        cards = create_all_cards()
-        valid_cards = random.choices([card for card in cards if card.type == CardType.POWER], k=3)
+        valid_cards = stream(Stream.COMBAT).choices(card_catalog.catalog.find(card_type=CardType.POWER), k=3)
         chosen_card = view.list_input("Choose a card", valid_cards, view.view_piles)
         if chosen_card is not None:
             for _ in range(self.copies):
-                origin.hand.append(deepcopy(valid_cards[chosen_card]))
+                origin.hand.append(valid_cards[chosen_card].clone())
 
 class ColorlessPotion(Potion):
     def __init__(self):
@@ -80,13 +76,12 @@ class ColorlessPotion(Potion):
         self.golden_info = "Add 2 copies of 1 of 3 random <keyword>Colorless</keyword> cards to your hand. They cost 0 this turn."
 
     def apply(self, origin):
-        cards = create_all_cards()
-        colorless_cards = [card for card in cards if card.player_class == PlayerClass.COLORLESS]
-        valid_cards = random.choices(colorless_cards, k=min(len(colorless_cards), 3))
+        colorless_cards = card_catalog.catalog.find(player_class=PlayerClass.COLORLESS)
+        valid_cards = stream(Stream.COMBAT).choices(colorless_cards, k=min(len(colorless_cards), 3))
         chosen_card = view.list_input("Choose a card", valid_cards, view.view_piles)
         if chosen_card is not None:
             for _ in range(self.copies):
-                origin.hand.append(deepcopy(valid_cards[chosen_card]))
+                origin.hand.append(valid_cards[chosen_card].clone())
 
 class BlessingOfTheForge(Potion):
     def __init__(self):
@@ -149,14 +144,10 @@ class DistilledChaos(Potion):
 
     def apply(self, origin, enemies):
         # Literally Havoc but multiple cards
-        for i in range(-1, -self.cards, -1):
-            card = origin.draw_pile[i]
-            if card.target in (TargetType.SINGLE, TargetType.YOURSELF):
-                origin.use_card(card, True, origin.draw_pile, random.choice(enemies))
-            elif card.target in (TargetType.AREA, TargetType.ANY):
-                origin.use_card(card, True, origin.draw_pile, enemies)
-            else:
-                origin.use_card(card, True, origin.draw_pile, random.choice(enemies))
+        for _ in range(self.cards):
+            if not origin.draw_pile or not enemies:
+                return
+            origin.use_card(origin.draw_pile[-1], True, origin.draw_pile, enemies, target=stream(Stream.COMBAT).choice(enemies))
 
 class DuplicationPotion(Potion):
     def __init__(self):
@@ -222,7 +213,7 @@ class EntropicBrew(Potion):
     def apply(self, origin):
         potions = create_all_potions()
         for _ in range(origin.max_potions - len(origin.potions)):
-            origin.potions.append(random.choice(potion for potion in potions if potion.player_class == origin.player_class))
+            origin.potions.append(stream(Stream.COMBAT).choice([potion for potion in potions if potion.player_class in (PlayerClass.ANY, origin.player_class)]))
 
 class SmokeBomb(Potion):
     def __init__(self):
@@ -241,7 +232,7 @@ class SneckoOil(Potion):
     def apply(self, origin):
         origin.draw_cards(cards=self.cards)
         for card in origin.hand:
-            card.modify_energy_cost(random.randint(0, 3), "Set")
+            card.modify_energy_cost(stream(Stream.COMBAT).randint(0, 3), "Set")
 
 
 def create_all_potions() -> Sequence[Potion]:
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import random
 from copy import deepcopy
 from typing import TYPE_CHECKING, Sequence
 
 import effect_catalog
-from ansi_tags import ansiprint
 from definitions import CardType, PlayerClass, Rarity, State, TargetType
+from drivers import ansiprint
 from message_bus_tools import Message, Potion, Relic
-from card_catalog import create_all_cards
+from rng import Stream, stream
+import card_catalog
 
 if TYPE_CHECKING:
     from enemy import Enemy
@@ -179,9 +179,8 @@ class DeadBranch(Relic):
     def callback(self, message, data):
         if message == Message.ON_EXHAUST:
             player, _ = data
-            cards = create_all_cards()
-            valid_cards = [card for card in cards if card.player_class == player.player_class and card.type not in (CardType.CURSE, CardType.STATUS) and card.rarity != Rarity.SPECIAL]
-            player.hand.append(random.choice(valid_cards))
+            valid_cards = card_catalog.catalog.find(player_class=player.player_class, exclude_types=(CardType.CURSE, CardType.STATUS), exclude_rarities=(Rarity.SPECIAL,))
+            player.hand.append(stream(Stream.COMBAT).choice(valid_cards).clone())
 
 class DuVuDoll(Relic):
     registers = [Message.START_OF_COMBAT]
@@ -203,7 +202,7 @@ class WarpedTongs(Relic):
     def callback(self, message, data):
         if message == Message.START_OF_TURN:
             _, player = data
-            random_card = random.choice([card for card in player.hand if card.is_upgradeable()])
+            random_card = stream(Stream.COMBAT).choice([card for card in player.hand if card.is_upgradeable()])
             random_card.upgrade()
 
 
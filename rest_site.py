@@ -1,20 +1,19 @@
 import math
-from time import sleep
 
-import card_catalog
 import displayer as view
 import effect_interface as ei
 import generators as gen
-import relic_catalog
-from ansi_tags import ansiprint
 from definitions import CardType
-from message_bus_tools import Message, bus
+from drivers import ansiprint, driven, echo, prompt, sleep
+from message_bus_tools import Message
 
 
 class RestSite():
-    def __init__(self, player):
+    def __init__(self, player, driver=None):
         self.player = player
+        self.driver = driver
 
+    @driven
     def rest_site(self):
         """
         Actions:
@@ -31,7 +30,7 @@ class RestSite():
         while True:
             ansiprint(self.player)
             ansiprint("You come across a <green>Rest Site</green>")
-            bus.publish(Message.WHEN_ENTERING_CAMPFIRE, (self.player))
+            self.player.bus.publish(Message.WHEN_ENTERING_CAMPFIRE, (self.player))
             sleep(1)
             ansiprint(f"<bold>[Rest]</bold> <green>Heal for 30% of your <light-blue>Max HP</light-blue>({math.floor(self.player.max_health * 0.30)})</green> \n<bold>[Smith]</bold> <green><keyword>Upgrade</keyword> a card in your deck</green> ")
             ansiprint("+15 from <bold>Regal Pillow</bold>\n")
@@ -50,7 +49,7 @@ class RestSite():
                 if relic in self.player.relics:
                     valid_inputs.append(action)
                     ansiprint(message, end="")
-            action = input("> ").lower()
+            action = prompt("> ").lower()
             if action not in valid_inputs:
                 ansiprint("<red>Valid Inputs: " + str(valid_inputs) + "</red>")
                 sleep(1.5)
@@ -94,17 +93,17 @@ class RestSite():
                     lambda card: card.get("Removable") is False,
                     "That card is not removable.",
                 )
-                self.player.deck[option] = self.player.card_actions(self.player.deck[option], "Remove", card_catalog.create_all_cards())
+                self.player.deck[option] = self.player.card_actions(self.player.deck[option], "Remove")
                 break
             if action == "dig":
-                gen.claim_relics(False, self.player, 1, relic_catalog.create_all_relics(), None, False)
+                gen.claim_relics(False, self.player, 1, chance_based=False)
                 break
         while True:
             ansiprint("<bold>[View Deck]</bold> or <bold>[Leave]</bold>")
-            option = input("> ").lower()
+            option = prompt("> ").lower()
             if option == "view deck":
                 view.view_piles(self.player.deck)
-                input("Press enter to leave > ")
+                prompt("Press enter to leave > ")
                 sleep(0.5)
                 view.clear()
                 break
@@ -112,6 +111,6 @@ class RestSite():
                 sleep(1)
                 view.clear()
                 break
-            print("Invalid input")
+            echo("Invalid input")
             sleep(1.5)
             view.clear()
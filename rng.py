@@ -0,0 +1,106 @@
+'''Random numbers for a run, split into independent streams.
+
+Each part of the game draws from its own stream (see Stream), and every stream is seeded from the
+run's seed and its name. An extra roll in one part of the game (say, a card that picks a random
+target) leaves every other stream untouched, so the shop, the rewards and the enemies stay the same.
+
+Like the driver, the RNG is looked up rather than passed around: Game makes its RNG active while it
+runs and code deeper down calls stream(). When no run is active every stream is the random module
+itself, which is how the game worked before streams existed.
+'''
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+from contextlib import contextmanager
+from enum import StrEnum
+
+
+class Stream(StrEnum):
+    '''The streams the game draws from.'''
+    MAP = 'map'  # Which room an unknown room turns out to be
+    ENCOUNTERS = 'encounters'  # Which enemies are fought
+    COMBAT = 'combat'  # Enemy health, random targets, cards and potions made during a fight
+    SHUFFLE = 'shuffle'  # Shuffling and random places in the draw pile
+    REWARDS = 'rewards'  # Gold, potions, relics and cards after fights and from events
+    EVENTS = 'events'  # Which event happens and what happens in it
+    SHOP = 'shop'  # Shop stock and prices
+    ENEMY_AI = 'enemy_ai'  # Moves. Every kind of enemy has its own stream, see enemy_stream().
+    DISPLAY = 'display'  # Cosmetic only, like the order the draw pile is shown in
+
+
+def derive_seed(seed: int, name: str) -> int:
+    '''A seed for [name] that depends only on [seed] and [name], in every process (unlike hash()).'''
+    digest = hashlib.sha256(f"{seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class RNG():
+    '''The random number streams for one run.'''
+    def __init__(self, seed: int | None = None):
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.streams: dict[str, random.Random] = {}  # Made the first time they're asked for
+
+    def stream(self, name: str) -> random.Random:
+        generator = self.streams.get(name)
+        if generator is None:
+            generator = self.streams[name] = random.Random(derive_seed(self.seed, name))
+        return generator
+
+    def getstate(self) -> dict:
+        return {name: generator.getstate() for name, generator in self.streams.items()}
+
+    def setstate(self, state: dict):
+        '''Puts every stream back. Streams made after getstate() are dropped, so they start over if they're used again.'''
+        for name in self.streams.keys() - state.keys():
+            del self.streams[name]
+        for name, generator_state in state.items():
+            self.stream(name).setstate(generator_state)
+
+    def fork(self) -> RNG:
+        '''A copy that carries on exactly where this one is, without affecting it.'''
+        forked = RNG(self.seed)
+        forked.setstate(self.getstate())
+        return forked
+
+    def spawn(self, name: str) -> RNG:
+        '''A new, independent RNG seeded from this one's seed and [name]. For handing runs out to workers.'''
+        return RNG(derive_seed(self.seed, name))
+
+
+class GlobalRNG():
+    '''Every stream is the random module. Active when no run has made its own RNG active.'''
+    def stream(self, _name: str):
+        return random
+
+    def getstate(self):
+        return random.getstate()
+
+    def setstate(self, state):
+        random.setstate(state)
+
+
+class _ActiveRNG(threading.local):
+    rng: RNG | GlobalRNG = GlobalRNG()
+
+_active = _ActiveRNG()
+
+def get_rng() -> RNG | GlobalRNG:
+    return _active.rng
+
+@contextmanager
+def use_rng(rng: RNG | GlobalRNG):
+    '''Makes [rng] the active RNG for this thread for the duration of the with block.'''
+    previous, _active.rng = _active.rng, rng
+    try:
+        yield rng
+    finally:
+        _active.rng = previous
+
+def stream(name: Stream | str) -> random.Random:
+    return _active.rng.stream(name)
+
+def enemy_stream(enemy) -> random.Random:
+    '''The stream an enemy picks its moves from. Enemies of the same kind share one.'''
+    return _active.rng.stream(f"{Stream.ENEMY_AI}:{enemy.name}")
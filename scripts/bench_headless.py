@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+'''Plays seeded games headlessly with random inputs and reports how many runs per second we get.
+
+Run this from the root of the project:
+    python scripts/bench_headless.py --runs 50
+'''
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from drivers import HeadlessDriver  # noqa: E402
+from game import Game  # noqa: E402
+from message_bus_tools import BusProfiler  # noqa: E402
+from policies import PromptLimitReached, limit_prompts, random_policy  # noqa: E402
+
+
+def run(seed: int, max_prompts: int, profiler: BusProfiler | None = None) -> tuple[str, int]:
+    driver = HeadlessDriver(None)
+    with Game(seed=seed, driver=driver) as game:
+        driver.responder = limit_prompts(random_policy(game, seed), max_prompts)
+        if profiler is not None:
+            game.bus.enable_profiling(profiler)
+        try:
+            game.start()
+            outcome = "finished"
+        except PromptLimitReached:
+            outcome = "prompt limit"
+        except Exception as e:
+            outcome = f"error ({type(e).__name__}: {e})"
+    return outcome, driver.prompts
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark headless runs")
+    parser.add_argument('-n', '--runs', type=int, default=20, help="Number of runs")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="First seed. Runs use seed, seed+1, ...")
+    parser.add_argument('--max-prompts', type=int, default=5000, help="Abandon a run after this many prompts")
+    parser.add_argument('--profile', metavar='PATH', help="Profile the message bus and write the results to PATH as JSON")
+    args = parser.parse_args()
+    profiler = BusProfiler() if args.profile else None
+
+    outcomes = {}
+    total_prompts = 0
+    start = time.perf_counter()
+    for seed in range(args.seed, args.seed + args.runs):
+        outcome, prompts = run(seed, args.max_prompts, profiler)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        total_prompts += prompts
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.runs} runs in {elapsed:.2f}s: {args.runs / elapsed:.2f} runs/sec, {total_prompts / elapsed:.0f} prompts/sec")
+    for outcome, count in sorted(outcomes.items(), key=lambda item: -item[1]):
+        print(f"  {count:>5}  {outcome}")
+    if profiler is not None:
+        profiler.dump_json(args.profile)
+        print(f"\nSlowest subscribers (full numbers in {args.profile}):")
+        print(profiler.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+'''Solves the worst kind of turn for the solver, a full hand of 0 cost cards against two enemies, and reports nodes per second.
+
+Run this from the root of the project:
+    python scripts/bench_solver.py --seed 0
+'''
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import card_catalog as cc  # noqa: E402
+import enemy_catalog  # noqa: E402
+from combat_env import CombatEnv  # noqa: E402
+from solver import TurnSolver  # noqa: E402
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the turn solver")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="Seed for the fight")
+    parser.add_argument('--max-nodes', type=int, default=200_000, help="Node budget for the search")
+    args = parser.parse_args()
+
+    env = CombatEnv(encounter=lambda: [enemy_catalog.JawWorm(), enemy_catalog.Cultist()])
+    env.reset(seed=args.seed)
+    env.combat.player.hand[:] = [cc.Anger(), cc.Flex(), cc.Anger(), cc.Flex(), cc.Clash(),
+                                 cc.Anger(), cc.Flex(), cc.Anger(), cc.Flex(), cc.Anger()]
+    for enemy in env.combat.all_enemies:
+        enemy.health = enemy.max_health = 200  # So the search can't stop early on a win
+    print(TurnSolver(env.combat, max_nodes=args.max_nodes, rng=env.rng).solve())
+
+
+if __name__ == '__main__':
+    main()
@@ -23,17 +23,16 @@
 # Costs 75 Gold initially, increases cost by 25 Gold every time it is used at any shop.
 # Woo.... lots of stuff to do here.
 
-import random
-from time import sleep
 
 import displayer
-from ansi_tags import ansiprint
 from definitions import CardCategory, Rarity
+from drivers import ansiprint, driven, prompt, sleep
 from effect_catalog import get_attribute
-from card_catalog import create_all_cards
+from card_catalog import catalog as card_catalog
 from potion_catalog import create_all_potions
 from relic_catalog import create_all_relics
 from message_bus_tools import Potion, Relic
+from rng import Stream, stream
 from card_catalog import Card
 
 
@@ -72,10 +71,9 @@ def determine_item_category(item):
     name = get_attribute(item, 'Name')
   except KeyError as e:
     raise KeyError(f'The following item has no Name: {item}') from e
-  card_names = [c.name for c in create_all_cards()]
   potion_names = [p.name for p in create_all_potions()]
   relic_names = [r.name for r in create_all_relics()]
-  if name in card_names:
+  if name in card_catalog:
     return CardCategory.CARD
   elif name in potion_names:
     return CardCategory.POTION
@@ -122,11 +120,11 @@ class SellableItem():
         assert self.get_rarity(self.item), f"Item {self.item} has no rarity."
         rarity = self.get_rarity(self.item)
         if rarity in (Rarity.BASIC, Rarity.COMMON, Rarity.STARTER):
-            return random.randint(45, 55)
+            return stream(Stream.SHOP).randint(45, 55)
         elif rarity == Rarity.UNCOMMON:
-            return random.randint(68, 82)
+            return stream(Stream.SHOP).randint(68, 82)
         elif rarity == Rarity.RARE:
-            return random.randint(135, 165)
+            return stream(Stream.SHOP).randint(135, 165)
         elif rarity in (Rarity.CURSE, Rarity.SHOP, Rarity.SPECIAL, Rarity.EVENT, Rarity.BOSS):
             # Unsure what to do with these. We'll set to some high bogus value for now.
             return 999
@@ -134,8 +132,9 @@ class SellableItem():
             raise ValueError("Item rarity broken")
 
 class Shop():
-    def __init__(self, player, items=None):
+    def __init__(self, player, items=None, driver=None):
       self.player = player
+      self.driver = driver
       if items is None:
         self.items = self.initialize_items()
       else:
@@ -144,26 +143,27 @@ class Shop():
     def initialize_items(self) -> list[SellableItem]:
       # TODO: Make this class-specific and include relics and potions
       items = []
-      all_cards:list[Card] = create_all_cards()
+      all_cards: tuple[Card, ...] = card_catalog.cards
       attack_cards = [c for c in all_cards if c.type == "Attack" and c.player_class != "Colorless"]
       skill_cards = [c for c in all_cards if c.type == "Skill" and c.player_class != "Colorless"]
       power_cards = [c for c in all_cards if c.type == "Power" and c.player_class != "Colorless"]
       if len(attack_cards) >= 2:
-        items.extend(random.sample(attack_cards, 2))
+        items.extend(stream(Stream.SHOP).sample(attack_cards, 2))
       if len(skill_cards) >= 2:
-        items.extend(random.sample(skill_cards, 2))
+        items.extend(stream(Stream.SHOP).sample(skill_cards, 2))
       if len(power_cards) >= 1:
-        items.extend(random.sample(power_cards, 1))
+        items.extend(stream(Stream.SHOP).sample(power_cards, 1))
 
       colorless_cards = [c for c in all_cards if c.player_class == "Colorless"]
       colorless_uncommon = [c for c in colorless_cards if c.rarity == Rarity.UNCOMMON]
       colorless_rare = [c for c in colorless_cards if c.rarity == Rarity.RARE]
       if len(colorless_uncommon) >= 1:
-        items.extend(random.sample(colorless_uncommon, 1))
+        items.extend(stream(Stream.SHOP).sample(colorless_uncommon, 1))
       if len(colorless_rare) >= 1:
-        items.extend(random.sample(colorless_rare, 1))
-      return [SellableItem(item) for item in items]
+        items.extend(stream(Stream.SHOP).sample(colorless_rare, 1))
+      return [SellableItem(item.clone()) for item in items]
 
+    @driven
     def loop(self):
       while True:
         ansiprint(f"Welcome to the shop! You have {self.player.gold} gold.")
@@ -184,7 +184,7 @@ class Shop():
       price = self.items[choice].price
       ansiprint(f"<bold>You bought {name} for {price} gold</bold>.")
       sleep(0.5)
-      input("Press Enter to continue...")
+      prompt("Press Enter to continue...")
 
     def validator(self, item):
       return item.price <= self.player.gold
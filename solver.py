@@ -0,0 +1,156 @@
+'''Finds the best way to play out the current turn of a fight, for analysis.
+
+    plan = TurnSolver(combat).solve()
+    print(plan)  # The cards to play, in order, its score and how fast the search went
+
+Every order of the playable cards in hand, at every target, is tried by playing it for real and rolling
+it back with a snapshot. Each line is scored by ending the turn and letting the enemies carry out their
+intents (see end_of_turn_score()). Orders that reach the same state (Strike then Defend, Defend then
+Strike) are looked up in a transposition table instead of being searched again. The table is keyed on
+the fight's state_hash, which is kept up to date as the fight changes (see zobrist), so looking a state
+up costs the same however big the fight is.
+
+Choices cards ask for while being played (which card to upgrade...) are always answered with the first
+option, and anything random plays out the way the run's streams say it will.
+'''
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from combat import Combat
+from definitions import State, TargetType
+from drivers import HeadlessDriver, use_driver
+from rng import get_rng, use_rng
+from zobrist import card_key
+
+WIN_SCORE = 1000
+NO_TARGET = -1
+
+
+def end_of_turn_score(combat: Combat) -> float:
+    '''The player's health once the enemies have acted, less the health the enemies have left.
+    Winning beats everything and dying loses to everything.'''
+    player = combat.player
+    if not combat.active_enemies:
+        return WIN_SCORE + player.health
+    health_left = sum(enemy.health for enemy in combat.active_enemies)
+    combat.end_turn()
+    if player.state == State.DEAD:
+        return -WIN_SCORE - health_left
+    return player.health - health_left
+
+
+class Play():
+    '''One card to play. [target] is the enemy's index in Combat.all_enemies, or NO_TARGET.'''
+    def __init__(self, card_name: str, upgraded: bool, target: int):
+        self.card_name = card_name
+        self.upgraded = upgraded
+        self.target = target
+
+    def __repr__(self):
+        name = self.card_name + ("+" if self.upgraded else "")
+        return name if self.target == NO_TARGET else f"{name} -> enemy {self.target + 1}"
+
+    def find_card(self, hand):
+        '''The card in [hand] to play.'''
+        return next(card for card in hand if card.name == self.card_name and card.upgraded == self.upgraded)
+
+
+class TurnPlan():
+    '''The best line the search found and what finding it took.'''
+    def __init__(self, plays: list[Play], score: float, nodes: int, table_hits: int, seconds: float, complete: bool):
+        self.plays = plays
+        self.score = score
+        self.nodes = nodes  # States searched
+        self.table_hits = table_hits  # States found in the transposition table instead
+        self.seconds = seconds
+        self.complete = complete  # False if the node budget ran out first
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else float("inf")
+
+    def __repr__(self):
+        plays = ", ".join(map(repr, self.plays)) or "nothing"
+        return (f"Play {plays} (score {self.score:g}). {self.nodes} nodes, {self.table_hits} table hits in {self.seconds:.3f}s "
+                f"({self.nodes_per_second:.0f} nodes/sec){'' if self.complete else ', stopped early'}")
+
+
+class TurnSolver():
+    '''Searches every way to play out [combat]'s current turn. The combat is left exactly as it was.
+
+    The search stops expanding once it has looked at [max_nodes] states and returns the best line so far.
+    [evaluate] scores a state where the player ends their turn, and is free to change the combat.
+    [rng] is the fight's RNG, for fights (like a CombatEnv's) whose RNG isn't the active one.
+    '''
+    def __init__(self, combat: Combat, max_nodes: int = 200_000, evaluate: Callable[[Combat], float] = end_of_turn_score,
+                 responder=None, rng=None):
+        self.combat = combat
+        self.rng = rng
+        self.max_nodes = max_nodes
+        self.evaluate = evaluate
+        self.driver = HeadlessDriver(responder if responder is not None else lambda _message: "1")
+        self.table: dict[int, tuple[float, list[Play]]] = {}  # state_hash -> the best score from there and how
+        self.nodes = 0
+        self.table_hits = 0
+        self.cut_off = False
+
+    def plays(self) -> list[tuple[Play, object]]:
+        '''Every different play that can be made now, with the card to make it with. Identical cards are only tried once.'''
+        combat = self.combat
+        plays = []
+        seen = set()
+        alive = [i for i, enemy in enumerate(combat.all_enemies) if enemy.state == State.ALIVE]
+        for card in combat.player.hand:
+            key = card_key(card)
+            if key in seen:
+                continue
+            seen.add(key)
+            if not card.playable or combat.unplayable_reason(card) is not None:
+                continue
+            if card.target == TargetType.SINGLE:
+                plays += [(Play(card.name, card.upgraded, target), card) for target in alive]
+            else:
+                plays.append((Play(card.name, card.upgraded, NO_TARGET), card))
+        return plays
+
+    def search(self) -> tuple[float, list[Play]]:
+        '''The best score reachable from here and the plays that reach it.'''
+        combat = self.combat
+        key = combat.state_hash
+        if key in self.table:
+            self.table_hits += 1
+            return self.table[key]
+        self.nodes += 1
+
+        snapshot = combat.snapshot()
+        best = (self.evaluate(combat), [])  # Ending the turn now
+        combat.restore(snapshot)
+        if not combat.active_enemies or combat.player.state != State.ALIVE:
+            pass
+        elif self.nodes >= self.max_nodes:
+            self.cut_off = True
+        else:
+            for play, card in self.plays():
+                target = combat.all_enemies[play.target] if play.target != NO_TARGET else None
+                combat.play_card(card, target)
+                combat.on_player_move()
+                if combat.check_player_death():
+                    score, line = -WIN_SCORE, []
+                else:
+                    score, line = self.search()
+                combat.restore(snapshot)
+                if score > best[0]:
+                    best = (score, [play] + line)
+        self.table[key] = best
+        return best
+
+    def solve(self) -> TurnPlan:
+        self.table.clear()
+        self.nodes = self.table_hits = 0
+        self.cut_off = False
+        start = time.perf_counter()
+        with use_driver(self.driver), use_rng(self.rng if self.rng is not None else get_rng()):
+            score, plays = self.search()
+        return TurnPlan(plays, score, self.nodes, self.table_hits, time.perf_counter() - start, not self.cut_off)
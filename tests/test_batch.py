@@ -0,0 +1,15 @@
+import batch
+
+
+def test_parse_seeds():
+    assert batch.parse_seeds("3") == range(3)
+    assert batch.parse_seeds("10:12") == range(10, 12)
+
+
+def test_results_do_not_depend_on_worker_count():
+    seeds = range(3)
+    in_process = list(batch.run_batch(seeds, "random", workers=1, max_prompts=300))
+    pooled = list(batch.run_batch(seeds, "random", workers=2, max_prompts=300, chunksize=1))
+    assert [result["seed"] for result in pooled] == list(seeds)
+    assert in_process == pooled
+    assert all(result["outcome"] != "error" for result in pooled)
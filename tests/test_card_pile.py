@@ -0,0 +1,70 @@
+import copy
+import pickle
+import random
+
+import pytest
+
+import card_catalog
+from card_pile import CardPile
+from message_bus_tools import Message, MessageBus
+
+
+def strikes(amount):
+    return [card_catalog.IroncladStrike() for _ in range(amount)]
+
+
+def test_membership_and_removal_are_by_identity():
+    first, second = strikes(2)
+    pile = CardPile("hand", [first, second])
+    pile.remove(second)
+    assert list(pile) == [first]
+    assert second not in pile and first in pile
+    with pytest.raises(ValueError):
+        pile.remove(second)
+    assert pile.state_hash == pile.full_hash()
+
+
+def test_draw_takes_the_top_and_reshuffles_in_place():
+    cards = strikes(3) + [card_catalog.Bash()]
+    pile = CardPile("draw_pile", cards)
+    assert pile.draw(2) == [cards[3], cards[2]]
+    assert pile.draw(5) == [cards[1], cards[0]]
+    assert pile.draw(1) == [] and pile.state_hash == 0 and not pile.members
+
+    pile.extend(cards)
+    expected = list(cards)
+    random.Random(3).shuffle(expected)
+    pile.shuffle(random.Random(3))
+    assert list(pile) == expected
+    assert pile.state_hash == pile.full_hash()
+
+
+def test_empty_into_copies_and_pickles():
+    hand = CardPile("hand", strikes(2))
+    discard = CardPile("discard_pile", strikes(1))
+    saved = copy.copy(hand)
+    hand.empty_into(discard)
+    assert not hand and not hand.members and len(discard) == 3
+    assert all(card in discard for card in saved)
+    assert len(saved) == 2 and saved.members == {id(card): 1 for card in saved}
+    restored = pickle.loads(pickle.dumps(discard))
+    assert type(restored) is CardPile and restored.state_hash == discard.state_hash and len(restored.members) == 3
+
+
+def test_hand_cards_listen_only_while_in_hand():
+    bus = MessageBus(debug=False)
+    hand, discard = CardPile("hand"), CardPile("discard_pile")
+    card = card_catalog.BloodForBlood()
+    hand.listen(bus)
+    hand.append(card)
+    assert card.uid in bus.subscribers[Message.ON_PLAYER_HEALTH_LOSS]
+    bus.publish(Message.ON_PLAYER_HEALTH_LOSS, None)
+    assert card.energy_cost == 3
+    hand.remove(card)
+    discard.append(card)
+    assert not bus.subscribers[Message.ON_PLAYER_HEALTH_LOSS]
+    bus.publish(Message.ON_PLAYER_HEALTH_LOSS, None)
+    assert card.energy_cost == 3
+    hand.extend([card])
+    hand.empty_into(discard)
+    assert not bus.subscribers[Message.ON_PLAYER_HEALTH_LOSS] and not card.subscribed
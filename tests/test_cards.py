@@ -2,8 +2,13 @@ from copy import deepcopy
 
 import pytest
 import card_catalog
+import enemy_catalog
 import items
+import player
+import potion_catalog
 from ansi_tags import ansiprint
+from drivers import ScriptedDriver, use_driver
+from tests.fixtures import sleepless
 
 
 local_copy_of_cards = card_catalog.create_all_cards()
@@ -18,4 +23,67 @@ def test_all_cards_can_upgrade(card):
     ansiprint(f"  - Preview: {card.upgrade_preview}")
     card.upgrade()
     ansiprint(f"  - After  : {card.pretty_print()}")
-    assert card.upgraded, "Card should have upgraded property set to True"
\ No newline at end of file
+    assert card.upgraded, "Card should have upgraded property set to True"
+
+def test_catalog_clones_are_independent():
+    prototype = card_catalog.catalog.get("Strike")
+    card = card_catalog.catalog.create("Strike")
+    assert card is not prototype and card.uid != prototype.uid
+    card.upgrade()
+    card.damage_affected_by.append("Strength")
+    assert not prototype.upgraded
+    assert "Strength" not in prototype.damage_affected_by
+
+
+def test_catalog_queries_are_cached():
+    catalog = card_catalog.catalog
+    attacks = catalog.find(card_type=card_catalog.CardType.ATTACK)
+    assert attacks is catalog.find(card_type=card_catalog.CardType.ATTACK)
+    assert all(card.type == card_catalog.CardType.ATTACK for card in attacks)
+    assert set(catalog.by_rarity) >= {card_catalog.Rarity.COMMON, card_catalog.Rarity.UNCOMMON, card_catalog.Rarity.RARE}
+
+
+def test_havoc_plays_the_top_card_once_and_exhausts_it(sleepless):
+    origin = player.Player(health=80, block=0, max_energy=3, deck=[])
+    defend, havoc = card_catalog.IroncladDefend(), card_catalog.Havoc()
+    origin.draw_pile.extend([defend, havoc])
+    card_catalog.Havoc().apply(origin, [])
+    # The Havoc on top played the Defend under it, and both were exhausted
+    assert origin.block == defend.block
+    assert list(origin.exhaust_pile) == [defend, havoc]
+    assert not origin.draw_pile
+
+
+def test_dual_wield_copies_are_new_cards():
+    origin = player.Player(health=80, block=0, max_energy=3, deck=[])
+    defend, strike = card_catalog.IroncladDefend(), card_catalog.IroncladStrike()
+    origin.hand.extend([defend, strike])
+    dual_wield = card_catalog.DualWield()
+    dual_wield.upgrade()
+    with use_driver(ScriptedDriver(['2'])):
+        dual_wield.apply(origin)
+    copies = [card for card in origin.hand if card.name == strike.name and card is not strike]
+    assert len(copies) == 2 and copies[0] is not copies[1]
+
+
+def test_dual_wield_without_attacks_or_powers_does_nothing():
+    origin = player.Player(health=80, block=0, max_energy=3, deck=[])
+    origin.hand.append(card_catalog.IroncladDefend())
+    with use_driver(ScriptedDriver([])):
+        card_catalog.DualWield().apply(origin)
+    assert len(origin.hand) == 1
+
+
+def test_distilled_chaos_plays_the_top_three_cards(sleepless):
+    origin = player.Player(health=80, block=0, max_energy=3, deck=[])
+    defends = [card_catalog.IroncladDefend() for _ in range(4)]
+    origin.draw_pile.extend(defends)
+    potion_catalog.DistilledChaos().apply(origin, [enemy_catalog.Cultist()])
+    assert list(origin.draw_pile) == defends[:1]
+    assert origin.block == 3 * defends[0].block
+
+
+def test_wild_strike_shuffles_a_wound_into_an_empty_draw_pile(sleepless):
+    origin = player.Player(health=80, block=0, max_energy=3, deck=[])
+    card_catalog.WildStrike().apply(origin, enemy_catalog.Cultist())
+    assert [card.name for card in origin.draw_pile] == ["Wound"]
@@ -5,6 +5,7 @@ import pytest
 
 import displayer
 import effect_catalog
+import encounters
 import enemy_catalog
 import entities
 import game
@@ -12,6 +13,9 @@ import combat
 import player
 from ansi_tags import ansiprint
 from definitions import CombatTier
+from drivers import HeadlessDriver, use_driver
+from message_bus_tools import Message
+from rng import RNG, Stream, stream, use_rng
 from tests.fixtures import sleepless
 
 
@@ -36,10 +40,61 @@ def test_new_combat_basic(monkeypatch, sleepless):
 
 
     # Patch the input
-    responses = iter("11112e111e21e233e12e12") # Fight sequence for Acid Slime (S) and Jaw Worm
+    responses = iter("11112e111e21e233e12e12e111e111") # Fight sequence for Acid Slime (S) and Jaw Worm
     with monkeypatch.context() as m:
         m.setattr('builtins.input', lambda *a, **kw: next(responses))
         displayer.clear = replacement_clear_screen
 
         # Run combat
-        combat_obj.combat()
\ No newline at end of file
+        combat_obj.combat()
+
+def test_encounter_schedule_creates_enemies_only_when_asked():
+    created = []
+    def fake_encounter():
+        created.append(1)
+        return [enemy_catalog.Cultist()]
+    schedule = encounters.EncounterSchedule()
+    schedule.normal[0] = fake_encounter
+    assert created == [], "Building the schedule shouldn't create any enemies"
+    enemies = schedule.create_enemies(CombatTier.NORMAL)
+    assert created == [1] and enemies[0].name == "Cultist"
+    assert schedule.fought[CombatTier.NORMAL] == 1
+
+
+def test_gremlin_gang_shield_watches_its_own_gang():
+    gang = enemy_catalog.gremlin_gang()
+    assert gang[-1].enemies is gang
+
+def test_snapshot_restore_rewinds_the_fight():
+    run_rng = RNG(7)
+    with use_rng(run_rng):
+        test_player = player.Player.create_player()
+        combat_obj = combat.Combat(player=test_player, tier=CombatTier.NORMAL, all_enemies=[enemy_catalog.JawWorm(), enemy_catalog.Cultist()],
+                                   game_map=Mock(), driver=HeadlessDriver(lambda _message: '1'))
+
+    def describe():
+        return (
+            test_player.health, test_player.block, test_player.energy,
+            [card.name for card in test_player.hand], [card.name for card in test_player.draw_pile],
+            [card.name for card in test_player.discard_pile],
+            [(effect.name, effect.amount) for effect in test_player.buffs + test_player.debuffs],
+            [(enemy.health, enemy.block, enemy.state, [(effect.name, effect.amount) for effect in enemy.buffs + enemy.debuffs])
+             for enemy in combat_obj.all_enemies],
+            {message: len(callbacks) for message, callbacks in combat_obj.bus.dispatch.items()},
+        )
+
+    with use_rng(run_rng), use_driver(combat_obj.driver):
+        combat_obj.start_combat()
+        combat_obj.bus.publish(Message.START_OF_TURN, (1, test_player))
+        before = describe()
+        snapshot = combat_obj.snapshot()
+        expected_roll = stream(Stream.COMBAT).random()
+        for _ in range(2):
+            combat_obj.restore(snapshot)
+            while test_player.hand and test_player.hand[0].energy_cost <= test_player.energy:
+                combat_obj.play_new_card(test_player.hand[0])
+            combat_obj.bus.publish(Message.END_OF_TURN, (test_player, combat_obj.all_enemies))
+            assert describe() != before
+        combat_obj.restore(snapshot)
+        assert describe() == before
+        assert stream(Stream.COMBAT).random() == expected_roll
@@ -0,0 +1,125 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import effect_catalog
+import enemy_catalog
+from combat_env import (
+    END_TURN,
+    MAX_ENEMIES,
+    N_ACTIONS,
+    OBSERVATION_SIZE,
+    CombatEnv,
+    ObservationEncoder,
+)
+from definitions import CardType
+
+
+def play(env, seed, pick):
+    observation, _ = env.reset(seed=seed)
+    return play_from(env, pick, observation)
+
+
+def play_from(env, pick, observation=None):
+    observations, rewards = [observation], []
+    for _ in range(500):
+        legal = np.flatnonzero(env.legal_action_mask())
+        observation, reward, terminated, truncated, _ = env.step(int(pick(legal)))
+        observations.append(observation)
+        rewards.append(reward)
+        if terminated or truncated:
+            return observations, rewards
+    raise AssertionError("The fight never ended")
+
+
+def test_reset_and_mask():
+    env = CombatEnv(encounter=lambda: [enemy_catalog.JawWorm()])
+    observation, info = env.reset(seed=3)
+    assert observation.shape == (OBSERVATION_SIZE,)
+    mask = env.legal_action_mask()
+    assert mask.shape == (N_ACTIONS,) and mask[END_TURN]
+    assert mask[1:].any(), "The opening hand should have something playable"
+    with pytest.raises(ValueError):
+        env.step(int(np.flatnonzero(~mask)[0]))
+
+
+def test_reset_and_close_empty_the_last_fights_bus():
+    env = CombatEnv()
+    env.reset(seed=1)
+    first = env.combat.bus
+    assert any(first.subscribers.values())
+    env.reset(seed=2)
+    assert not any(first.subscribers.values())
+    second = env.combat.bus
+    env.close()
+    assert not any(second.subscribers.values())
+
+
+def test_same_seed_same_fight():
+    first = play(CombatEnv(), 11, lambda legal: legal[-1])
+    second = play(CombatEnv(), 11, lambda legal: legal[-1])
+    assert first[1] == second[1]
+    assert all((a == b).all() for a, b in zip(first[0], second[0], strict=True))
+
+
+def test_incremental_encoding_matches_a_fresh_one():
+    env = CombatEnv()
+    env.reset(seed=5)
+    for _ in range(30):
+        legal = np.flatnonzero(env.legal_action_mask())
+        observation, _, terminated, truncated, _ = env.step(int(legal[len(legal) // 2]))
+        assert (observation == ObservationEncoder().encode(env.combat)).all()
+        if terminated or truncated:
+            break
+
+
+def test_encoding_keeps_up_with_snapshots_being_restored():
+    env = CombatEnv()
+    env.reset(seed=6)
+    snapshot = env.snapshot()
+    for _ in range(3):
+        for action in np.flatnonzero(env.legal_action_mask()):
+            observation = env.step(int(action))[0]  # Not encoded since the last restore, like a search would
+            assert (observation == ObservationEncoder().encode(env.combat)).all()
+            env.restore(snapshot)
+        assert (env.encoder.encode(env.combat) == ObservationEncoder().encode(env.combat)).all()
+        env.step(END_TURN)
+        snapshot = env.snapshot()
+
+
+def test_every_gremlin_in_the_gang_can_be_targeted():
+    env = CombatEnv(encounter=enemy_catalog.gremlin_gang)
+    env.reset(seed=2)
+    combat = env.combat
+    for gremlin in combat.all_enemies[:5]:
+        gremlin.health = 0
+        gremlin.die()
+    combat.player.max_health = combat.player.health = 10_000  # Outlasts the gang, whatever it rolls
+    env.mask = None
+    legal = np.flatnonzero(env.legal_action_mask())
+    assert {(action - 1) % MAX_ENEMIES for action in legal if action != END_TURN} >= {5, 6, 7}
+    _, rewards = play_from(env, lambda legal: legal[-1])
+    assert not combat.active_enemies and rewards[-1] > 0
+
+
+def test_fights_too_big_for_the_env_fail_loudly():
+    with pytest.raises(ValueError):
+        CombatEnv(encounter=lambda: [enemy_catalog.Cultist() for _ in range(MAX_ENEMIES + 1)]).reset(seed=0)
+
+
+def test_red_slaver_fights_go_on_past_entangle():
+    entangled_turns = 0
+    for seed in range(6):
+        env = CombatEnv(encounter=lambda: [enemy_catalog.RedSlaver()])
+        env.reset(seed=seed)
+        player = env.combat.player
+
+        def pick(legal, player=player):
+            nonlocal entangled_turns
+            if player.debuffs.get(effect_catalog.Entangled) is not None:
+                entangled_turns += 1
+                assert not any(player.hand[(action - 1) // MAX_ENEMIES].type == CardType.ATTACK for action in legal if action != END_TURN)
+            return legal[-1]
+
+        play_from(env, pick)
+    assert entangled_turns > 0
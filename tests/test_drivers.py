@@ -0,0 +1,125 @@
+import pytest
+
+import drivers
+from drivers import HeadlessDriver, ScriptedDriver, ScriptExhausted, use_driver
+
+
+def test_scripted_driver_answers_in_order():
+    driver = ScriptedDriver(['1', 'e'])
+    assert driver.prompt("First?") == '1'
+    assert driver.prompt("Second?") == 'e'
+    assert driver.prompts == 2
+    with pytest.raises(ScriptExhausted):
+        driver.prompt("Third?")
+
+
+def test_use_driver_restores_previous():
+    previous = drivers.get_driver()
+    headless = HeadlessDriver(lambda _message: 'x')
+    with use_driver(headless):
+        assert drivers.get_driver() is headless
+        assert drivers.prompt("Anything?") == 'x'
+    assert drivers.get_driver() is previous
+
+
+def test_headless_driver_is_silent(capsys):
+    with use_driver(HeadlessDriver(lambda _message: '')):
+        drivers.echo("hello")
+        drivers.ansiprint("<red>hello</red>")
+        drivers.sleep(100)
+    assert capsys.readouterr().out == ""
+
+
+def test_terminal_driver_writes_one_frame_per_wait(monkeypatch):
+    import io
+    import subprocess
+    def no_subprocesses(*_args, **_kwargs):
+        raise AssertionError("The terminal driver started a subprocess")
+    monkeypatch.setattr(subprocess.Popen, "__init__", no_subprocesses)
+    monkeypatch.setattr("os.system", no_subprocesses)
+    monkeypatch.setattr("builtins.input", lambda _message="": "1")
+    out = io.StringIO()
+    driver = drivers.TerminalDriver(out)
+    driver.echo("thrown away")
+    driver.clear()
+    driver.echo("hello")
+    driver.ansiprint("<red>world</red>")
+    assert out.getvalue() == ""  # Nothing is written until the game waits
+    assert driver.prompt("> ") == "1"
+    assert out.getvalue() == drivers.CLEAR_SCREEN + "hello\n\x1b[31mworld\x1b[0m\n"
+    assert driver.frames == 1
+    driver.sleep(0)
+    assert driver.frames == 1  # Nothing new to write
+
+
+def test_terminal_driver_rewrites_only_changed_lines(monkeypatch):
+    import io
+    monkeypatch.setattr("shutil.get_terminal_size", lambda: (80, 24))
+    monkeypatch.setattr("builtins.input", lambda _message="": "1")
+    out = io.StringIO()
+    driver = drivers.TerminalDriver(out)
+    for health in (80, 74):
+        driver.clear()
+        driver.echo("Relics: Burning Blood")
+        driver.echo(f"Ironclad ({health} / 80)")
+        driver.echo("Jaw Worm (40 / 40)")
+        driver.prompt("> ")
+        if health == 80:
+            out.seek(0)
+            out.truncate()
+    # The second screen only rewrites the health line, then the empty line under the prompt and clears what's below it
+    assert out.getvalue() == "\x1b[2;1HIronclad (74 / 80)\x1b[K\x1b[4;1H\x1b[J"
+
+
+def test_screen_redraws_in_full_when_it_loses_track(monkeypatch):
+    monkeypatch.setattr("shutil.get_terminal_size", lambda: (80, 24))
+    screen = drivers.Screen()
+    assert screen.redraw("first\n").startswith(drivers.CLEAR_SCREEN)
+    assert screen.redraw("first\n") == "\x1b[2;1H\x1b[J"
+    screen.write("\x1b[1AOverwritten\n")  # Moved the cursor by hand
+    assert screen.redraw("first\n").startswith(drivers.CLEAR_SCREEN)
+    screen.write("line\n" * 30)  # Scrolled
+    assert screen.redraw("first\n").startswith(drivers.CLEAR_SCREEN)
+
+
+def test_terminal_driver_pauses_follow_the_pacing(monkeypatch):
+    import io
+
+    from pacing import Pacing, PacingMode, use_pacing
+    slept = []
+    monkeypatch.setattr("time.sleep", slept.append)
+    driver = drivers.TerminalDriver(io.StringIO())
+    with use_pacing(Pacing.scaled(0.25)) as pacing:
+        assert pacing.mode == PacingMode.SCALED
+        driver.sleep(2)
+    with use_pacing(Pacing.zero()):
+        driver.sleep(2)
+    assert slept == [0.5]
+    assert pacing.paused == 0.5
+
+
+def test_terminal_drivers_are_flushed_without_an_exit_handler_each(monkeypatch):
+    import io
+    registered = []
+    monkeypatch.setattr("atexit.register", registered.append)
+    out = io.StringIO()
+    driver = drivers.TerminalDriver(out)
+    assert registered == []
+    with use_driver(driver):
+        drivers.echo("last words")
+    assert out.getvalue() == "last words\n"  # Flushed when it stopped being active
+
+
+def test_screen_reads_the_terminal_size_once_per_frame(monkeypatch):
+    import io
+    sizes = []
+    monkeypatch.setattr("shutil.get_terminal_size", lambda: sizes.append((80, 24)) or (80, 24))
+    driver = drivers.TerminalDriver(io.StringIO())
+    sizes.clear()
+    driver.clear()
+    for row in range(10):
+        driver.echo(f"line {row}")
+    driver.flush()
+    driver.echo("more")
+    driver.flush()
+    assert len(sizes) == 2
@@ -5,6 +5,9 @@ import pytest
 import enemy_catalog
 import entities
 import effect_catalog
+import effect_interface
+from message_bus_tools import Message
+from player import Player
 
 from unittest.mock import Mock
 
@@ -30,6 +33,37 @@ def test_helper_effect_amount_multiple():
   assert effect_catalog.effect_amount(effect_catalog.Strength, test_effects) == 5
   assert effect_catalog.effect_amount(effect_catalog.Vulnerable, test_effects) == 5
 
+def test_effect_container_stacks_in_place():
+  host = Mock()
+  effects = effect_catalog.EffectContainer([effect_catalog.Strength(host, 2)])
+  first = effects.get(effect_catalog.Strength)
+  assert effects.add(effect_catalog.Strength(host, 3)) is first
+  assert len(effects) == 1
+  assert effects.amount("Strength") == 5
+  assert effect_catalog.effect_amount(effect_catalog.Strength, effects) == 5
+  assert effect_catalog.effect_amount(effect_catalog.Weak, effects) == 0
+
+def test_effect_container_prunes_expired():
+  host = Mock()
+  effects = effect_catalog.EffectContainer([effect_catalog.Vulnerable(host, 1), effect_catalog.Strength(host, 2)])
+  for effect in effects:
+    effect.tick()
+  expired = []
+  effects.prune(expired.append)
+  assert [effect.name for effect in expired] == ["Vulnerable"]
+  assert [effect.name for effect in effects] == ["Strength"]
+  assert "Vulnerable" not in effects
+
+def test_stacked_effect_stays_subscribed():
+  test_player = Player.create_player()
+  effect_interface.apply_effect(test_player, None, effect_catalog.Strength, 2)
+  strength = test_player.buffs.get("Strength")
+  effect_interface.apply_effect(test_player, None, effect_catalog.Strength, 3)
+  assert test_player.buffs.get("Strength") is strength
+  assert strength.amount == 5
+  callbacks = test_player.bus.dispatch[Message.BEFORE_ATTACK]
+  assert sum(callback.__self__ is strength for callback in callbacks) == 1
+
 
 @pytest.mark.skip("init_effects was removed.")
 class TestApplyEffects():
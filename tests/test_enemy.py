@@ -3,8 +3,10 @@ from typing import Type
 
 import pytest
 
+import effect_catalog
 import enemy_catalog
 import player
+from enemy import Intent
 from enemy_catalog import Enemy
 from tests.fixtures import sleepless
 
@@ -29,3 +31,24 @@ def test_most_enemies_default_move(sleepless, name_and_class):
   enemy = cls()
   enemy.set_intent()
   enemy.execute_move(player=test_player, enemies=[enemy])
+
+def test_intent_is_read_once_from_the_move():
+  worm = enemy_catalog.JawWorm()
+  worm.set_intent()
+  assert worm.intent.name == "Chomp"
+  assert (worm.intent.damage, worm.intent.hits, worm.intent.blocks) == (11, 1, False)
+  assert worm.intent.pretty_print() == "<aggresive>Attack</aggresive> 11"
+  worm.next_move = [("Thrash", "Attack", (7, 2)), ("Block", (5,))]
+  worm.intent = Intent.from_next_move(worm.next_move)
+  assert worm.intent.blocks and worm.intent.block == 5
+  assert worm.intent.pretty_print() == "<aggresive>Attack</aggresive> 7x2 / <light-blue>Block</light-blue>"
+
+
+def test_debuffs_land_on_the_player(sleepless):
+  test_player = player.Player.create_player()
+  slime = enemy_catalog.AcidSlimeS()
+  slime.next_move = [("Lick", "Debuff", (effect_catalog.Weak, 1))]
+  slime.intent = Intent.from_next_move(slime.next_move)
+  slime.execute_move(player=test_player, enemies=[slime])
+  assert any(isinstance(debuff, effect_catalog.Weak) for debuff in test_player.debuffs)
+  assert not slime.debuffs
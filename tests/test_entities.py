@@ -16,4 +16,14 @@ def test_move_spam_check_small_list():
     assert enemy.move_spam_check('move1', 3) is True
     assert enemy.move_spam_check('move1', 2) is True
     assert enemy.move_spam_check('move2', 1) is True
-    assert enemy.move_spam_check('move1', 1) is False
\ No newline at end of file
+    assert enemy.move_spam_check('move1', 1) is False
+
+def test_move_history_is_bounded():
+    enemy = Enemy([100,100],8,"enemy")
+    for turn in range(1000):
+        enemy.past_moves.append('Bite' if turn < 990 else 'Grow')
+    assert len(enemy.past_moves) == enemy.past_moves.SIZE
+    assert enemy.past_moves[-1] == 'Grow'
+    assert enemy.last_move_repeats(3) == ('Grow', 3)
+    assert enemy.move_spam_check('Grow', 10) is False
+    assert 'place' in enemy.past_moves  # Still remembered as used
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
-import random
 import time
 
 import pytest
 
-import definitions
 import displayer
 import game
+import policies
 from ansi_tags import ansiprint
-from definitions import CardType
+from drivers import HeadlessDriver
 from tests.fixtures import sleepless
 
 
@@ -18,81 +17,17 @@ def replacement_clear_screen():
     print("\n--------------------------\n")
 
 
-def repeat_check(repeat_catcher, last_return, current_return) -> tuple[int, bool]:
-    '''Check if the player is stuck in a loop
-    '''
-    if last_return == current_return:
-        repeat_catcher += 1
-    else:
-        repeat_catcher = 0
-    if repeat_catcher > 3:
-        print("Player is stuck in a loop")
-        return repeat_catcher, True
-    return repeat_catcher, False
-
 def autoplayer(game: game.Game):
-    '''Returns a patched input function that can play the game, maybe.
+    '''Returns a patched input function that can play the game, maybe. See policies.autoplayer().
 
     Usage: 
         with monkeypatch.context() as m:
             m.setattr('builtins.input', autoplayer(game))
     '''
     print("Autoplayer starting...")
-    mygame = game
-    repeat_catcher = 0
-    last_return = None
+    respond = policies.autoplayer(game, log=lambda choice, reason: print(f"AutoPlayer: {choice} ({reason})"))
     def patched_input(*args, **kwargs):
-        nonlocal mygame
-        nonlocal repeat_catcher
-        nonlocal last_return
-        choice = None
-        reason = ""
-        all_possible_choices = ['1', '2', '3', '4', '5', '6', '7', '8', '9', 'e',
-                'p', 'm', 'd', 'a', 's', 'x', 'f', 'y', 'n',
-                'rest', 'smith', 'view deck', 'leave', 'exit', 'lift', 'toke', 'dig']
-        # Handle Start Node
-        if mygame.game_map.current.type == definitions.EncounterType.START:
-            choice, reason = str(random.choice(range(1, len(mygame.game_map.current.children)))), "Start node"
-        
-        # Handle dead
-        player = mygame.player
-        if player.state == definitions.State.DEAD:
-            choice, reason = '\n', "Player is dead"
-
-        # Handle shop
-        if mygame.game_map.current.type == definitions.EncounterType.SHOP:
-            # print("Player is in a shop")
-            #tbd
-            pass
-
-        # Handle combat
-        if mygame.current_encounter:
-            possible_cards = [idx+1 for idx,card in enumerate(player.hand) if card.energy_cost <= player.energy and card.type != CardType.STATUS]
-            # Handle no energy
-            if player.energy == 0 and player.in_combat:
-                choice, reason = 'e', "No energy left"
-            # Handle enemy selection
-            elif args and "Choose" in args[0]:
-                choice, reason = str(random.randint(1, len(mygame.current_encounter.active_enemies))), "Enemy selection"
-            # Handle card selection
-            elif len(possible_cards) > 0:
-                choice, reason = str(random.choice(possible_cards)), "Card selection"
-
-        # Default (all options)
-        if choice is None:
-            choice, reason = random.choice(all_possible_choices), "Default"
-
-        repeat_catcher, check = repeat_check(repeat_catcher, last_return, choice)
-        if check:
-            # Pick anything other than the last choice
-            tmp = all_possible_choices.copy()
-            tmp.remove(choice)
-            choice, reason = random.choice(tmp), "Player is stuck in a loop"
-            
-        last_return = choice
-        print(f"AutoPlayer: {choice} ({reason})")
-        return choice
-
+        return respond(args[0] if args else "")
     return patched_input
 
 
@@ -119,3 +54,10 @@ def test_e2e(seed, monkeypatch, sleepless):
             end = time.time()
             ansiprint(f"\n\n<green><bold>Game took {end - start:.2f} seconds</bold></green>")
 
+
+
+def test_closing_a_game_empties_its_bus():
+    with game.Game(seed=0, driver=HeadlessDriver(lambda _message: "1")) as run:
+        run.player.register(run.bus)
+        assert any(run.bus.subscribers.values())
+    assert not any(run.bus.subscribers.values())
@@ -0,0 +1,45 @@
+import random
+
+import generators
+import player
+import relic_catalog
+from message_bus_tools import Snapshot
+
+
+def test_weighted_pools_match_random_choices():
+    pools = [list(range(0, 10)), list(range(10, 20)), list(range(20, 30))]
+    weights = [0.6, 0.37, 0.03]
+    random.seed(42)
+    expected = [random.choice(random.choices(pools, weights, k=1)[0]) for _ in range(200)]
+    random.seed(42)
+    sampler = generators.WeightedPools(pools, weights)
+    assert [sampler.sample() for _ in range(200)] == expected
+
+
+def test_relic_pool_drops_claimed_relics():
+    test_player = player.Player.create_player()
+    pool = generators.relic_pool_for(test_player)
+    assert "Burning Blood" in pool.claimed
+    akabeko = relic_catalog.Akabeko()
+    test_player.relics.append(akabeko)
+    generators.relic_pool_for(test_player)
+    assert all(relic.name != "Akabeko" for relics in pool.pools for relic in relics)
+
+
+def test_relic_pool_is_part_of_a_snapshot():
+    test_player = player.Player.create_player()
+    generators.relic_pool_for(test_player)
+    snapshot = Snapshot(test_player.snapshot_objects())
+    test_player.relics.append(relic_catalog.Akabeko())
+    generators.relic_pool_for(test_player).claim("Anchor")
+    snapshot.restore()
+    pool = test_player.relic_pool
+    assert not {"Akabeko", "Anchor"} & pool.claimed
+    assert {"Akabeko", "Anchor"} <= {relic.name for relics in pool.pools for relic in relics}
+
+
+def test_rewards_are_copies():
+    test_player = player.Player.create_player()
+    first = generators.generate_card_rewards("Normal", 3, test_player)
+    second = generators.generate_card_rewards("Normal", 3, test_player)
+    assert not {id(card) for card in first} & {id(card) for card in second}
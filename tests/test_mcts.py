@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import enemy_catalog
+from combat_env import CombatEnv
+from mcts import MCTS
+
+
+def test_choice_is_legal_and_the_fight_is_left_alone():
+    env = CombatEnv(encounter=lambda: [enemy_catalog.JawWorm()])
+    observation, _ = env.reset(seed=2)
+    before = env.combat.state_hash
+    agent = MCTS(iterations=30, seed=0)
+    action = agent.choose(env)
+    assert env.legal_action_mask()[action]
+    assert env.combat.state_hash == before
+    assert (env.encoder.encode(env.combat) == observation).all()
+    assert agent.stats()["simulations"] == 30
+
+
+def test_same_seed_same_choices():
+    def choices():
+        env = CombatEnv()
+        env.reset(seed=5)
+        agent = MCTS(iterations=15, rollout='random', seed=1)
+        actions = []
+        for _ in range(5):
+            actions.append(agent.choose(env))
+            if env.step(actions[-1])[2]:
+                break
+        return actions
+    assert choices() == choices()
+
+
+def test_root_parallel_search_adds_up_the_workers():
+    env = CombatEnv()
+    env.reset(seed=3)
+    agent = MCTS(iterations=10, workers=2, seed=0)
+    assert env.legal_action_mask()[agent.choose(env)]
+    assert agent.stats()["simulations"] == 20
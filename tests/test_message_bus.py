@@ -161,4 +161,72 @@ class TestMessageBus:
 
       # No additional calls should be made (i.e. unsubscribe was successful)
       callbackA.assert_called_once() 
-      callbackB.assert_called_once()
\ No newline at end of file
+      callbackB.assert_called_once()
+
+  def test_buses_do_not_share_subscribers(self):
+      busA = MessageBus(debug=False)
+      busB = MessageBus(debug=False)
+      callback = MagicMock(__qualname__="callback")
+      busA.subscribe(Message.START_OF_COMBAT, callback, 1)
+
+      busB.publish(Message.START_OF_COMBAT, "other game")
+      callback.assert_not_called()
+      busA.publish(Message.START_OF_COMBAT, "this game")
+      callback.assert_called_once_with(Message.START_OF_COMBAT, "this game")
+
+  def test_deepcopy_keeps_the_same_bus(self):
+      from copy import deepcopy
+      bus = MessageBus(debug=False)
+      holder = {"bus": bus}
+      assert deepcopy(holder)["bus"] is bus
+
+  def test_compiled_dispatch_defers_changes_until_publish_ends(self):
+      bus = MessageBus(debug=False)
+      callbackB = MagicMock(__qualname__="callbackB")
+      def side_effect_A(*_args, **_kwargs):
+        bus.subscribe(Message.BEFORE_ATTACK, callbackB, 2)
+        bus.unsubscribe(Message.BEFORE_ATTACK, 1)
+      callbackA = MagicMock(__qualname__="callbackA", side_effect=side_effect_A)
+      bus.subscribe(Message.BEFORE_ATTACK, callbackA, 1)
+
+      bus.publish(Message.BEFORE_ATTACK, "first")
+      callbackB.assert_not_called()
+      assert bus.dispatch[Message.BEFORE_ATTACK] == (callbackB,)
+
+      bus.publish(Message.BEFORE_ATTACK, "second")
+      callbackA.assert_called_once_with(Message.BEFORE_ATTACK, "first")
+      callbackB.assert_called_once_with(Message.BEFORE_ATTACK, "second")
+
+  def test_compiled_dispatch_drops_empty_messages(self):
+      bus = MessageBus(debug=False)
+      bus.subscribe(Message.START_OF_TURN, MagicMock(__qualname__="callback"), 1)
+      bus.unsubscribe(Message.START_OF_TURN, 1)
+      assert Message.START_OF_TURN not in bus.dispatch
+      assert bus.publish(Message.START_OF_TURN, "data") == "data"
+      assert bus.lock_count == 0
+
+  def test_profiler_records_counts_and_timings(self, tmp_path):
+      bus = MessageBus(debug=False)
+      callback = MagicMock(__qualname__="Relic.callback")
+      bus.subscribe(Message.BEFORE_ATTACK, callback, 1)
+      profiler = bus.enable_profiling()
+
+      bus.publish(Message.BEFORE_ATTACK, "data")
+      bus.publish(Message.BEFORE_ATTACK, "data")
+      bus.publish(Message.START_OF_TURN, "no subscribers")
+
+      assert profiler.publishes == {Message.BEFORE_ATTACK: 2, Message.START_OF_TURN: 1}
+      stats = profiler.callbacks[(Message.BEFORE_ATTACK, "Relic.callback")]
+      assert stats.calls == 2
+      assert sum(stats.histogram.values()) == 2
+      assert profiler.slowest(1)[0][1] == "Relic.callback"
+
+      profiler.dump_json(tmp_path / "profile.json")
+      assert "Relic.callback" in (tmp_path / "profile.json").read_text()
+
+  def test_disabling_profiler_restores_plain_publish(self):
+      bus = MessageBus(debug=False)
+      bus.enable_profiling()
+      assert bus.disable_profiling() is not None
+      assert "publish" not in vars(bus)
+      assert bus.profiler is None
@@ -0,0 +1,40 @@
+import pytest
+
+import enemy_catalog
+import rng
+
+
+def test_distribution_drops_moves_used_too_often():
+  jaw_worm = enemy_catalog.JawWorm()
+  assert jaw_worm.intent_probabilities() == {"Chomp": 1.0}
+  jaw_worm.active_turns = 2
+  jaw_worm.past_moves = ["Chomp", "Bellow", "Bellow"]  # Bellow can't be used three times in a row
+  chances = jaw_worm.intent_probabilities()
+  assert set(chances) == {"Thrash", "Chomp"}
+  assert chances["Thrash"] == pytest.approx(0.3 / 0.55)
+  assert jaw_worm.moves.distribution(jaw_worm) is not jaw_worm.moves.distribution(jaw_worm)  # Fresh dicts from one cached table
+
+
+def test_pick_is_one_draw_even_when_the_roll_lands_on_a_banned_move():
+  slime = enemy_catalog.AcidSlimeL()
+  slime.past_moves = ["Tackle", "Tackle"]
+  with rng.use_rng(rng.RNG(5)):
+    moves = rng.enemy_stream(slime)
+    for _ in range(200):
+      expected = moves.getstate()
+      slime.set_intent()
+      assert slime.next_move[0][0] != "Tackle"
+      after = moves.getstate()
+      moves.setstate(expected)
+      moves.random()
+      assert moves.getstate() == after
+
+
+def test_picks_follow_the_distribution():
+  beast = enemy_catalog.FungiBeast()
+  counts = {"Bite": 0, "Grow": 0}
+  with rng.use_rng(rng.RNG(1)):
+    for _ in range(2000):
+      beast.set_intent()
+      counts[beast.next_move[0][0]] += 1
+  assert counts["Bite"] / 2000 == pytest.approx(0.6, abs=0.05)
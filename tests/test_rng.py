@@ -0,0 +1,32 @@
+import random
+
+from rng import RNG, GlobalRNG, Stream, stream, use_rng
+
+
+def test_streams_are_independent():
+    rng = RNG(42)
+    expected = RNG(42).stream(Stream.SHOP).random()
+    for _ in range(100):
+        rng.stream(Stream.COMBAT).random()
+    assert rng.stream(Stream.SHOP).random() == expected
+    assert RNG(42).stream(Stream.COMBAT).random() != RNG(42).stream(Stream.SHOP).random()
+
+
+def test_fork_and_setstate():
+    rng = RNG(7)
+    rng.stream(Stream.REWARDS).random()
+    state = rng.getstate()
+    forked = rng.fork()
+    rolls = [rng.stream(Stream.REWARDS).random(), rng.stream(Stream.EVENTS).random()]
+    assert [forked.stream(Stream.REWARDS).random(), forked.stream(Stream.EVENTS).random()] == rolls
+    rng.setstate(state)
+    assert Stream.EVENTS not in rng.streams
+    assert [rng.stream(Stream.REWARDS).random(), rng.stream(Stream.EVENTS).random()] == rolls
+
+
+def test_active_rng():
+    rng = RNG(1)
+    with use_rng(rng):
+        assert stream(Stream.MAP) is rng.stream(Stream.MAP)
+    assert isinstance(stream(Stream.MAP), type(random))  # No run active, so it's the random module
+    assert isinstance(GlobalRNG().stream(Stream.MAP), type(random))
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("numpy")  # For CombatEnv
+
+import card_catalog as cc
+import enemy_catalog
+from combat_env import CombatEnv
+from solver import WIN_SCORE, TurnSolver
+
+
+def fight(seed, *cards):
+    env = CombatEnv(encounter=lambda: [enemy_catalog.JawWorm()])
+    env.reset(seed=seed)
+    if cards:
+        env.combat.player.hand[:] = list(cards)
+    return env
+
+
+def test_finds_lethal_and_leaves_the_fight_alone():
+    env = fight(0, cc.IroncladDefend(), cc.IroncladStrike(), cc.Bash())
+    combat = env.combat
+    combat.all_enemies[0].health = 8
+    before = combat.state_hash
+    plan = TurnSolver(combat, rng=env.rng).solve()
+    assert plan.score > WIN_SCORE
+    assert "Bash" in [play.card_name for play in plan.plays]  # A Strike alone doesn't kill it
+    assert plan.complete and plan.nodes_per_second > 0
+    assert combat.state_hash == before
+    assert plan.plays[-1].find_card(combat.player.hand) in combat.player.hand
+
+
+def test_transpositions_are_searched_once():
+    env = fight(1, cc.Flex(), cc.IroncladDefend(), cc.IroncladDefend(), cc.IroncladStrike())
+    plan = TurnSolver(env.combat, rng=env.rng).solve()
+    assert plan.table_hits > 0
+    assert len(plan.plays) == 4  # Flex is free, so there's always energy for all three others
+    names = [play.card_name for play in plan.plays]
+    assert names.index("Flex") < names.index("Strike")
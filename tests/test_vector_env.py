@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from combat_env import N_ACTIONS, OBSERVATION_SIZE
+from vector_env import VectorEnv
+
+
+def play(envs, steps):
+    '''Always plays the last legal action, so the fights are decided by the seeds alone.'''
+    observations, _ = envs.reset()
+    history = [observations.copy()]
+    finished = []
+    for _ in range(steps):
+        actions = [np.flatnonzero(mask)[-1] for mask in envs.legal_action_mask()]
+        observations, rewards, terminated, truncated, infos = envs.step(actions)
+        history.append((observations.copy(), rewards.copy()))
+        finished += [(i, info["final_observation"]) for i, info in enumerate(infos) if terminated[i] or truncated[i]]
+    return history, finished
+
+
+def test_shapes_and_auto_reset():
+    with VectorEnv(3, seed=7) as envs:
+        observations, infos = envs.reset()
+        assert observations.shape == (3, OBSERVATION_SIZE)
+        assert envs.legal_action_mask().shape == (3, N_ACTIONS)
+        assert [info["seed"] for info in infos] == [7, 8, 9]
+        _, finished = play(envs, 150)
+    assert finished, "Some fight should have ended and been restarted"
+
+
+def test_workers_match_one_process():
+    with VectorEnv(3, seed=2) as envs:
+        expected, expected_finished = play(envs, 60)
+    with VectorEnv(3, workers=2, seed=2) as envs:
+        history, finished = play(envs, 60)
+    assert (history[0] == expected[0]).all()
+    for (observations, rewards), (expected_observations, expected_rewards) in zip(history[1:], expected[1:], strict=True):
+        assert (observations == expected_observations).all()
+        assert (rewards == expected_rewards).all()
+    assert [i for i, _ in finished] == [i for i, _ in expected_finished]
@@ -3,9 +3,10 @@ import effect_catalog
 import items
 import player
 import card_catalog
+from pacing import Pacing, use_pacing
 
 
-def test_view_piles_on_all_cards(monkeypatch):
+def test_view_piles_on_all_cards():
   all_cards = card_catalog.create_all_cards()
   entity = player.Player.create_player()
   entity.energy = 3
@@ -15,9 +16,8 @@ def test_view_piles_on_all_cards(monkeypatch):
                     (lambda card: card.type == 'Attack', "Attack"), (lambda card: card.type == 'Power', "Power"),
                     (lambda card: card.energy_cost <= entity.energy, "Playable")]
 
-  with monkeypatch.context() as m:
-    # Patch sleeps so it's faster
-    m.setattr(displayer, 'sleep', lambda x: None)
+  # No pauses so it's faster
+  with use_pacing(Pacing.zero()):
 
     for function, condition_name in all_conditions:
       print(f"===== Condition: {condition_name} ======")
@@ -27,3 +27,23 @@ def test_view_piles_on_all_cards(monkeypatch):
     print(f"===== Condition: Default ======")
     displayer.view_piles(pile=all_cards, end=False)
 
+
+
+def test_card_rendering_is_cached_until_the_card_changes():
+  from ansi_tags import render, render_plain
+  card = card_catalog.IroncladStrike()
+  first = render(card)
+  assert render(card) is first
+  assert render_plain(card) == "Strike | Attack | 1 Energy | Deal 6 damage."
+  card.upgrade()
+  assert "Deal 9 damage." in render(card)
+  card.energy_cost = 0
+  assert "0 Energy" in render_plain(card)
+
+
+def test_listing_piles_and_relics_never_pauses():
+  entity = player.Player.create_player()
+  with use_pacing(Pacing.realtime()) as pacing:
+    displayer.view_piles(pile=entity.deck, end=False)
+    displayer.view_relics(entity.relics)
+  assert pacing.paused == 0
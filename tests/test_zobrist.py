@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")  # For CombatEnv
+
+import card_catalog
+import zobrist
+from combat_env import CombatEnv
+from definitions import CombatTier
+
+
+@pytest.fixture
+def debug(monkeypatch):
+    monkeypatch.setattr(zobrist, "DEBUG", True)
+
+
+def test_pile_counts_duplicates():
+    pile = zobrist.HashedPile("hand")
+    pile.append(card_catalog.IroncladStrike())
+    one = pile.state_hash
+    pile.append(card_catalog.IroncladStrike())
+    assert pile.state_hash not in (0, one)
+    pile[0:1] = [card_catalog.Bash()]
+    del pile[1]
+    pile += [card_catalog.IroncladStrike()]
+    assert pile.state_hash == pile.full_hash()
+
+
+@pytest.mark.usefixtures("debug")
+def test_upgrading_or_repricing_a_card_in_place_changes_the_hash():
+    env = CombatEnv()
+    env.reset(seed=3)
+    combat, player = env.combat, env.combat.player
+    before = combat.state_hash
+    snapshot = combat.snapshot()
+    card = next(card for card in player.hand if card.is_upgradeable())
+    card.upgrade()
+    upgraded = combat.state_hash
+    assert upgraded != before
+    player.draw_pile[0].modify_energy_cost(0, 'Set')
+    assert combat.state_hash != upgraded
+    combat.restore(snapshot)
+    assert combat.state_hash == before
+    card.upgrade()  # The card is in the restored hand, not the one the snapshot replaced
+    assert combat.state_hash == upgraded
+
+
+def test_only_the_draw_pile_hashes_its_order():
+    strike, bash = card_catalog.IroncladStrike(), card_catalog.Bash()
+    ordered = [zobrist.HashedPile("draw_pile", cards, ordered=True) for cards in ([strike, bash], [bash, strike])]
+    unordered = [zobrist.HashedPile("hand", cards) for cards in ([strike, bash], [bash, strike])]
+    assert ordered[0].state_hash != ordered[1].state_hash
+    assert unordered[0].state_hash == unordered[1].state_hash
+    pile = ordered[0]
+    pile.insert(0, card_catalog.IroncladDefend())
+    pile.pop(1)
+    pile.append(pile.pop(0))
+    assert pile.state_hash == pile.full_hash()
+
+
+@pytest.mark.usefixtures("debug")
+@pytest.mark.parametrize("tier", [CombatTier.NORMAL, CombatTier.ELITE, CombatTier.BOSS])
+def test_incremental_hash_matches_a_fresh_one(tier):
+    '''DEBUG makes every read of a hash check it against one worked out from scratch.'''
+    for seed in range(5):
+        env = CombatEnv(tier=tier)
+        env.reset(seed=seed)
+        rng = random.Random(seed)
+        for _ in range(300):
+            assert isinstance(env.combat.state_hash, int)  # Reading it is the check
+            legal = [action for action, legal in enumerate(env.legal_action_mask()) if legal]
+            _, _, terminated, truncated, _ = env.step(rng.choice(legal))
+            if terminated or truncated:
+                break
+
+
+@pytest.mark.usefixtures("debug")
+def test_same_state_same_hash_and_snapshots_restore_it():
+    first, second = CombatEnv(), CombatEnv()
+    first.reset(seed=4)
+    second.reset(seed=4)
+    assert first.combat.state_hash == second.combat.state_hash
+    before = first.combat.state_hash
+    snapshot = first.combat.snapshot()
+    first.step(0)
+    assert first.combat.state_hash != before
+    first.combat.restore(snapshot)
+    assert first.combat.state_hash == before
@@ -0,0 +1,177 @@
+'''Many CombatEnvs stepped together, for agents that pick their actions in batches. Needs numpy.
+
+    envs = VectorEnv(256, workers=4, seed=0)
+    observations, infos = envs.reset()
+    while training:
+        actions = agent(observations, envs.legal_action_mask())
+        observations, rewards, terminated, truncated, infos = envs.step(actions)
+    envs.close()
+
+Every fight that ends is started again straight away with its next seed, so every row always holds a fight
+in progress. The last observation of the fight that ended is in infos[i]["final_observation"].
+
+Environment i plays seeds seed + i, seed + i + num_envs, seed + i + 2 * num_envs... so the same seed gives
+the same fights no matter how many workers there are. With workers, the environments are split between
+that many processes, which write their observations and action masks straight into shared memory.
+'''
+from __future__ import annotations
+
+import multiprocessing
+from itertools import pairwise
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from combat_env import N_ACTIONS, OBSERVATION_SIZE, CombatEnv
+
+
+class EnvShard():
+    '''Some of a VectorEnv's environments, each writing into its row of [observations] and [masks].'''
+    def __init__(self, observations: np.ndarray, masks: np.ndarray, seeds: list[int], seed_stride: int, env_kwargs: dict):
+        self.masks = masks
+        self.seeds = list(seeds)
+        self.seed_stride = seed_stride
+        self.envs = [CombatEnv(out=observations[i], **env_kwargs) for i in range(len(seeds))]
+
+    def reset(self) -> list[dict]:
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, info = env.reset(seed=self.seeds[i])
+            self.masks[i] = env.legal_action_mask()
+            infos.append(info)
+        return infos
+
+    def step(self, actions) -> tuple[list[float], list[bool], list[bool], list[dict]]:
+        rewards, terminated, truncated, infos = [], [], [], []
+        for i, (env, action) in enumerate(zip(self.envs, actions, strict=True)):
+            observation, reward, ended, cut_short, info = env.step(int(action))
+            if ended or cut_short:
+                info["final_observation"] = observation
+                self.seeds[i] += self.seed_stride
+                _, reset_info = env.reset(seed=self.seeds[i])
+                info["seed"] = reset_info["seed"]
+            self.masks[i] = env.legal_action_mask()
+            rewards.append(reward)
+            terminated.append(ended)
+            truncated.append(cut_short)
+            infos.append(info)
+        return rewards, terminated, truncated, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+def shard_worker(connection, observations_name: str, masks_name: str, num_envs: int, start: int, stop: int,
+                 seeds: list[int], env_kwargs: dict):
+    '''Runs an EnvShard in a worker process until it's told to close.'''
+    observations_memory = SharedMemory(name=observations_name)
+    masks_memory = SharedMemory(name=masks_name)
+    observations = np.ndarray((num_envs, OBSERVATION_SIZE), dtype=np.float32, buffer=observations_memory.buf)
+    masks = np.ndarray((num_envs, N_ACTIONS), dtype=np.bool_, buffer=masks_memory.buf)
+    shard = EnvShard(observations[start:stop], masks[start:stop], seeds, num_envs, env_kwargs)
+    try:
+        while True:
+            command, data = connection.recv()
+            if command == "step":
+                connection.send(shard.step(data))
+            elif command == "reset":
+                connection.send(shard.reset())
+            elif command == "close":
+                break
+    finally:
+        shard.close()
+        del shard, observations, masks  # The shared memory can't close while arrays still point into it
+        observations_memory.close()
+        masks_memory.close()
+        connection.close()
+
+
+class VectorEnv():
+    '''[num_envs] CombatEnvs, made with [env_kwargs], stepped in lockstep.
+
+    The observations and masks returned are the env's own buffers and change on the next step. Copy them to keep them.
+    '''
+    def __init__(self, num_envs: int, workers: int = 0, seed: int = 0, **env_kwargs):
+        self.num_envs = num_envs
+        self.workers = min(workers, num_envs)
+        seeds = [seed + i for i in range(num_envs)]
+        observations_size = num_envs * OBSERVATION_SIZE * np.dtype(np.float32).itemsize
+        masks_size = num_envs * N_ACTIONS
+        self.shared = []
+        self.connections = []
+        self.processes = []
+        if self.workers == 0:
+            self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+            self.masks = np.zeros((num_envs, N_ACTIONS), dtype=np.bool_)
+            self.shard = EnvShard(self.observations, self.masks, seeds, num_envs, env_kwargs)
+            return
+        self.shared = [SharedMemory(create=True, size=observations_size), SharedMemory(create=True, size=masks_size)]
+        self.observations = np.ndarray((num_envs, OBSERVATION_SIZE), dtype=np.float32, buffer=self.shared[0].buf)
+        self.masks = np.ndarray((num_envs, N_ACTIONS), dtype=np.bool_, buffer=self.shared[1].buf)
+        self.observations[:] = 0
+        self.masks[:] = False
+        # Split as evenly as possible, the first shards getting one more when it doesn't divide
+        bounds = [num_envs * i // self.workers for i in range(self.workers + 1)]
+        self.bounds = list(pairwise(bounds))
+        context = multiprocessing.get_context()
+        for start, stop in self.bounds:
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=shard_worker, daemon=True, args=(
+                worker_connection, self.shared[0].name, self.shared[1].name, num_envs, start, stop, seeds[start:stop], env_kwargs))
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def reset(self) -> tuple[np.ndarray, list[dict]]:
+        if self.workers == 0:
+            return self.observations, self.shard.reset()
+        for connection in self.connections:
+            connection.send(("reset", None))
+        infos = []
+        for connection in self.connections:
+            infos += connection.recv()
+        return self.observations, infos
+
+    def legal_action_mask(self) -> np.ndarray:
+        return self.masks
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list[dict]]:
+        if self.workers == 0:
+            rewards, terminated, truncated, infos = self.shard.step(actions)
+        else:
+            actions = np.asarray(actions)
+            for connection, (start, stop) in zip(self.connections, self.bounds, strict=True):
+                connection.send(("step", actions[start:stop]))
+            rewards, terminated, truncated, infos = [], [], [], []
+            for connection in self.connections:
+                shard_rewards, shard_terminated, shard_truncated, shard_infos = connection.recv()
+                rewards += shard_rewards
+                terminated += shard_terminated
+                truncated += shard_truncated
+                infos += shard_infos
+        return (self.observations, np.array(rewards, dtype=np.float32),
+                np.array(terminated), np.array(truncated), infos)
+
+    def close(self):
+        if self.workers == 0:
+            self.shard.close()
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.processes = [], []
+        self.observations = self.masks = None
+        for memory in self.shared:
+            memory.close()
+            memory.unlink()
+        self.shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,309 @@
+'''Zobrist-style hashes of the player and the enemies, kept up to date as they change.
+
+Every feature of an entity (its health being 50, a Strike in its hand, 2 Vulnerable) has a fixed random
+64-bit key. An entity's hash is the sum of the keys of its features, mod 2**64, so a change to one feature
+costs one subtraction and one addition however big the state is. Sums are used rather than XOR so that two
+identical cards in a pile don't cancel each other out.
+
+Attributes declared with Tracked() and piles declared with Pile() keep the hash up to date wherever they're
+changed from. So do effects, once an EffectContainer holds them. A card counts by its card_key(), and the
+attributes that make up the key are declared with CardKey(), so upgrading a card or changing its cost where
+it lies updates the hash of the pile it's in. An ordered pile (the draw pile) also hashes where each card is,
+since the order decides what gets drawn.
+
+Piles and the effects an entity holds also carry a version: a number that's new every time they change, so
+code that mirrors them (like CombatEnv's observations) can tell whether they did without looking at them. The
+numbers come from one counter and are never reused, so a pile or an entity's effects put back by a snapshot
+have the version they had then, and anything changed since has a version that hasn't been seen before.
+
+Set DEBUG to True (or ZOBRIST_DEBUG=1 in the environment) to have every read of a hash recompute it from
+scratch and check that the two agree.
+'''
+from __future__ import annotations
+
+import hashlib
+import itertools
+import os
+
+MASK = 2**64 - 1
+DEBUG = os.environ.get("ZOBRIST_DEBUG") == "1"
+
+_keys: dict[tuple, int] = {}
+versions = itertools.count(1)  # See the module docstring. 0 is never given out.
+
+def key(*feature) -> int:
+    '''The random key for [feature]. The same in every process and every run.'''
+    k = _keys.get(feature)
+    if k is None:
+        k = _keys[feature] = int.from_bytes(hashlib.blake2b(repr(feature).encode(), digest_size=8).digest(), "big")
+    return k
+
+def add(obj, *feature):
+    '''Adds an effect [obj] holds to its hash, and gives its effects a new version.'''
+    if isinstance(obj, Hashed):
+        attributes = obj.__dict__
+        attributes["_hash"] = (attributes.get("_hash", 0) + key(*feature)) & MASK
+        attributes["effects_version"] = next(versions)
+
+def remove(obj, *feature):
+    if isinstance(obj, Hashed):
+        attributes = obj.__dict__
+        attributes["_hash"] = (attributes.get("_hash", 0) - key(*feature)) & MASK
+        attributes["effects_version"] = next(versions)
+
+def combine(hashes) -> int:
+    '''One hash for an ordered group of hashes, like the player followed by each enemy in its slot.'''
+    combined = 0
+    for part in hashes:
+        combined = (combined * 1099511628211 + part) & MASK
+    return combined
+
+
+class Tracked():
+    '''An attribute that's part of its owner's hash.
+
+    The value is kept in the instance's __dict__ under the same name. There's no __get__, so reading the attribute
+    finds it there directly and only setting it goes through here.'''
+    def __set_name__(self, owner, name):
+        self.name = name
+        owner.tracked_attributes = (*owner.tracked_attributes, name)
+
+    def __set__(self, obj, value):
+        attributes = obj.__dict__
+        hashed = attributes.get("_hash", 0) + key(self.name, value)
+        if self.name in attributes:
+            hashed -= key(self.name, attributes[self.name])
+        attributes["_hash"] = hashed & MASK
+        attributes[self.name] = value
+
+
+class HeldAmount():
+    '''An effect's amount, which is part of the hash of whatever holds the effect (see Effect.hold()). Set-only, like Tracked.'''
+    def __set__(self, effect, amount):
+        attributes = effect.__dict__
+        holder = attributes.get("holder")
+        if holder is not None:
+            remove(holder, "effect", attributes["name"], attributes["amount"])
+            add(holder, "effect", attributes["name"], amount)
+        attributes["amount"] = amount
+
+
+def card_key(card) -> tuple:
+    '''What a card is hashed by. Cards with the same key do the same thing when played.'''
+    return (card.name, card.upgraded, card.energy_cost)
+
+
+class HashedPile(list):
+    '''A list of cards that keeps a hash of which cards are in it, and of their order too if it's [ordered].
+
+    [owner] is the Hashed object the pile belongs to, if any. Each card remembers the pile it's in through the
+    owner and the pile's name, since a snapshot swaps the pile for a copy when it's restored (see holding_pile()).
+    Changes at the top of an ordered pile cost as little as in any other pile, but changes below the top move
+    the cards above them and hash the whole pile again.'''
+    def __init__(self, name: str, cards=(), owner: Hashed | None = None, ordered: bool = False):
+        super().__init__(cards)
+        self.name = name
+        self.owner = owner
+        self.ordered = ordered
+        self.where = (owner, name) if owner is not None else (self, None)
+        self.state_hash = self.full_hash()
+        self.version = next(versions)
+        for card in self:
+            card.__dict__["_pile"] = self.where
+
+    def card_hash(self, card, position: int) -> int:
+        if self.ordered:
+            return key(self.name, position, *card_key(card))
+        return key(self.name, *card_key(card))
+
+    def full_hash(self) -> int:
+        return sum(self.card_hash(card, position) for position, card in enumerate(self)) & MASK
+
+    def _added(self, cards, start: int):
+        '''[cards] were put in the pile, the first of them at [start].'''
+        hashed, where = self.state_hash, self.where
+        for position, card in enumerate(cards, start):
+            hashed += self.card_hash(card, position)
+            card.__dict__["_pile"] = where
+        self.state_hash = hashed & MASK
+        self.version = next(versions)
+
+    def _removed(self, cards, start: int):
+        '''[cards] were taken out of the pile, the first of them from [start].'''
+        hashed = self.state_hash
+        for position, card in enumerate(cards, start):
+            hashed -= self.card_hash(card, position)
+        self.state_hash = hashed & MASK
+        self.version = next(versions)
+
+    def _moved(self):
+        '''Cards were moved around in the pile, or added or taken out below the top, so an ordered pile's cards
+        above them have moved.'''
+        if self.ordered:
+            self.state_hash = self.full_hash()
+        self.version = next(versions)
+
+    def _position(self, index: int) -> int:
+        return max(index + len(self), 0) if index < 0 else min(index, len(self))
+
+    def append(self, card):
+        super().append(card)
+        self._added((card,), len(self) - 1)
+
+    def insert(self, index, card):
+        position = self._position(index)
+        super().insert(index, card)
+        self._added((card,), position)
+        if position < len(self) - 1:
+            self._moved()
+
+    def extend(self, cards):
+        cards = list(cards)
+        start = len(self)
+        super().extend(cards)
+        self._added(cards, start)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def pop(self, index=-1):
+        position = index + len(self) if index < 0 else index
+        card = super().pop(index)
+        self._removed((card,), position)
+        if position < len(self):
+            self._moved()
+        return card
+
+    def remove(self, card):
+        del self[self.index(card)]
+
+    def clear(self):
+        super().clear()
+        self.state_hash = 0
+        self.version = next(versions)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            start = index.indices(len(self))[0]
+            self._removed(self[index], start)
+            super().__setitem__(index, value)
+            self._added(value, start)
+            self._moved()
+        else:
+            position = index + len(self) if index < 0 else index
+            self._removed([self[index]], position)
+            super().__setitem__(index, value)
+            self._added([value], position)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            self._removed(self[index], start)
+            super().__delitem__(index)
+            if step != 1 or start < len(self):
+                self._moved()
+        else:
+            position = index + len(self) if index < 0 else index
+            self._removed([self[index]], position)
+            super().__delitem__(index)
+            if position < len(self):
+                self._moved()
+
+    def __imul__(self, times):
+        raise TypeError("Repeating a pile in place isn't supported")
+
+    def __copy__(self):
+        new = type(self).__new__(type(self))
+        list.extend(new, self)
+        new.name = self.name
+        new.owner = self.owner
+        new.ordered = self.ordered
+        new.where = self.where if self.owner is not None else (new, None)
+        new.state_hash = self.state_hash
+        new.version = self.version
+        return new
+
+    def __reduce__(self):
+        # The cards are added once the pile exists, since they point back at it
+        return type(self), (self.name, (), self.owner, self.ordered), None, iter(list(self))
+
+
+def holding_pile(card) -> HashedPile | None:
+    '''The pile [card] is in, if it's in one.'''
+    where = card.__dict__.get("_pile")
+    if where is None:
+        return None
+    holder, name = where
+    pile = holder if name is None else holder.__dict__.get(name)
+    return pile if pile is not None and card in pile else None
+
+
+class CardKey():
+    '''An attribute that's part of a card's card_key(). Setting it updates the hash of the pile the card is in.
+    Set-only, like Tracked. [attribute] is the descriptor the attribute would otherwise have, if any.'''
+    def __init__(self, attribute=None):
+        self.attribute = attribute
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        if self.attribute is not None:
+            self.attribute.__set_name__(owner, name)
+
+    def __set__(self, card, value):
+        pile = holding_pile(card)
+        if pile is not None and not pile.ordered:
+            pile.state_hash -= pile.card_hash(card, 0)
+        if self.attribute is not None:
+            self.attribute.__set__(card, value)
+        else:
+            card.__dict__[self.name] = value
+        if pile is not None:
+            if pile.ordered:
+                pile.state_hash = pile.full_hash()
+            else:
+                pile.state_hash = (pile.state_hash + pile.card_hash(card, 0)) & MASK
+            pile.version = next(versions)
+
+
+class Pile():
+    '''A pile of cards that's part of its owner's hash. Any list assigned to it is copied into a [kind] of HashedPile.'''
+    def __init__(self, kind: type[HashedPile] = HashedPile, ordered: bool = False):
+        self.kind = kind
+        self.ordered = ordered
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        owner.hashed_piles = (*owner.hashed_piles, name)
+
+    def __set__(self, obj, cards):
+        if not (type(cards) is self.kind and cards.name == self.name and cards.owner is obj):
+            cards = self.kind(self.name, cards, obj, self.ordered)
+        obj.__dict__[self.name] = cards
+
+
+class Hashed():
+    '''Something with a state_hash, made of its Tracked attributes, its Piles and the effects it holds.'''
+    tracked_attributes: tuple[str, ...] = ()
+    hashed_piles: tuple[str, ...] = ()
+
+    @property
+    def state_hash(self) -> int:
+        attributes = self.__dict__
+        hashed = attributes.get("_hash", 0)
+        for name in self.hashed_piles:
+            hashed += attributes[name].state_hash
+        hashed &= MASK
+        if DEBUG:
+            full = self.full_hash()
+            assert hashed == full, f"{self!r}'s hash is {hashed:#x} but should be {full:#x}"
+        return hashed
+
+    def full_hash(self) -> int:
+        '''The hash worked out from scratch.'''
+        attributes = self.__dict__
+        hashed = sum(key(name, attributes[name]) for name in self.tracked_attributes if name in attributes)
+        hashed += sum(attributes[name].full_hash() for name in self.hashed_piles)
+        hashed += sum(key("effect", effect.name, effect.amount) for effect in [*self.buffs, *self.debuffs])
+        return hashed & MASK